@@ -0,0 +1,63 @@
+from logging import Logger
+from pathlib import Path
+
+from PIL import Image, ImageDraw
+
+from leaf_focus.ocr.recognise.page_items import PageItems
+
+
+class Component:
+    """Draw the recognised text boxes over an image."""
+
+    box_colour = (255, 0, 0)
+    text_colour = (0, 0, 255)
+
+    def __init__(self, logger: Logger):
+        self._logger = logger
+
+    def annotate(
+        self, image_file: Path, predictions_file: Path, annotation_file: Path
+    ) -> None:
+        """Create the annotation image from an image and its predictions file."""
+
+        if not image_file:
+            raise ValueError("Must supply image file.")
+        if not predictions_file:
+            raise ValueError("Must supply predictions file.")
+        if not annotation_file:
+            raise ValueError("Must supply annotation file.")
+        if not image_file.exists():
+            raise FileNotFoundError(f"Image file does not exist '{image_file}'.")
+        if not predictions_file.exists():
+            raise FileNotFoundError(
+                f"Predictions file does not exist '{predictions_file}'."
+            )
+
+        with Image.open(image_file) as image:
+            items = PageItems.load(predictions_file)
+            self.save(annotation_file, image, items)
+
+    def save(self, annotation_file: Path, image: Image.Image, items: PageItems) -> None:
+        """Save the annotated image."""
+
+        self._logger.info(f"Saving OCR image to '{annotation_file}'.")
+
+        annotation_file.parent.mkdir(exist_ok=True, parents=True)
+        annotated = self.draw(image, items)
+        annotated.save(annotation_file)
+
+    def draw(self, image: Image.Image, items: PageItems) -> Image.Image:
+        """Draw the outline and text of each item on a copy of the image."""
+
+        result = image.convert("RGB")
+        draw = ImageDraw.Draw(result)
+        for text, box in zip(items.text, items.boxes.tolist()):
+            points = [tuple(point) for point in box]
+            draw.line(points + [points[0]], fill=self.box_colour, width=2)
+
+            # put the text just above the box
+            (top_left_x, top_left_y), (_, top_right_y) = points[0], points[1]
+            text_y = max(0, min(top_left_y, top_right_y) - 12)
+            draw.text((top_left_x, text_y), text, fill=self.text_colour)
+
+        return result
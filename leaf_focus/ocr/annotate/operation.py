@@ -0,0 +1,99 @@
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from logging import Logger
+from pathlib import Path
+from typing import Iterable, Optional
+
+from leaf_focus.ocr.annotate.component import Component
+from leaf_focus.pdf.images.image_format import ImageFormat
+from leaf_focus.pdf.images.item import Item as ImageItem
+from leaf_focus.support.location import Location
+
+
+def _annotate_page(
+    base_path: Path,
+    image_format: Optional[ImageFormat],
+    file_hash: str,
+    page: int,
+    threshold: int,
+):
+    """Create the annotation image for one page in a worker process."""
+    o = Operation(logging.getLogger(), base_path, image_format)
+    return o.run(file_hash, page, threshold)
+
+
+class Operation:
+    """A building block that creates the ocr annotation images when requested."""
+
+    def __init__(
+        self,
+        logger: Logger,
+        base_path: Path,
+        image_format: Optional[ImageFormat] = None,
+    ):
+        self._logger = logger
+        self._base_path = base_path
+        self._image_format = image_format
+        self._location = Location(logger, image_format)
+        self._component = Component(logger)
+
+    def run(self, file_hash: str, page: int, threshold: int) -> Path:
+        """Run the operation."""
+
+        loc = self._location
+        bd = self._base_path
+        image_file = loc.pdf_page_prepared_file(bd, file_hash, page, threshold)
+        predictions_file = loc.pdf_page_text_file(bd, file_hash, page, threshold)
+        annotation_file = loc.pdf_page_ocr_file(bd, file_hash, page, threshold)
+
+        # create the annotation file
+        self._component.annotate(image_file, predictions_file, annotation_file)
+
+        # result
+        return annotation_file
+
+    def run_many(
+        self, pages: Iterable[tuple[str, int, int]], workers: Optional[int] = None
+    ) -> list[Path]:
+        """Create the annotation images for the pages using multiple processes."""
+
+        pages = list(pages)
+        if not pages:
+            return []
+
+        file_hashes, page_nums, thresholds = zip(*pages)
+        base_paths = [self._base_path] * len(pages)
+        image_formats = [self._image_format] * len(pages)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(
+                _annotate_page,
+                base_paths,
+                image_formats,
+                file_hashes,
+                page_nums,
+                thresholds,
+            )
+            return list(results)
+
+    def find_pages(
+        self,
+        file_hash: str,
+        pages: Optional[Iterable[int]] = None,
+        threshold: Optional[int] = None,
+    ) -> list[tuple[str, int, int]]:
+        """
+        Find the (file hash, page, threshold) of the pages that have predictions.
+        Optionally only include the given page numbers and threshold.
+        """
+        page_nums = set(pages or [])
+        store_dir = self._location.store_dir(self._base_path, file_hash)
+        result = []
+        for item in ImageItem.load(store_dir, suffix=".csv"):
+            if item.variety != "text" or item.threshold is None:
+                continue
+            if page_nums and item.page not in page_nums:
+                continue
+            if threshold is not None and item.threshold != threshold:
+                continue
+            result.append((file_hash, item.page, item.threshold))
+        return sorted(result)
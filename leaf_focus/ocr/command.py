@@ -1,10 +1,12 @@
 import logging
 from pathlib import Path
+from typing import Optional
 
 import click
 
 from leaf_focus.pipeline.prefect_flow.construct import Construct
 from leaf_focus.support.config import Config
+from leaf_focus.support.location import Location
 
 
 def validate_threshold(ctx, param, value):
@@ -15,12 +17,143 @@ def validate_threshold(ctx, param, value):
     )
 
 
+def validate_resolution(ctx, param, value):
+    if value is None or 0 < value <= 1:
+        return value
+    raise click.BadParameter("must be greater than 0 and less than or equal to 1")
+
+
 @click.group()
 def ocr():
     """Run Optical Character Recognition."""
     pass
 
 
+@ocr.command(name="plan")
+@click.option(
+    "-c",
+    "--config-file",
+    "config_file",
+    type=Path,
+    help="Path to the config file.",
+)
+def ocr_plan(config_file: Path):
+    """Find the pdf pages that need OCR using the embedded text."""
+
+    if not config_file:
+        raise click.UsageError("Must provide config file.")
+
+    from leaf_focus.ocr.plan.operation import Operation
+
+    click.secho("Starting ocr plan.", bold=True)
+
+    config = Config.load(config_file)
+    logger = logging.getLogger()
+    o = Operation(logger, config.processing_dir)
+    plans = o.run_many()
+
+    ocr_count = sum([p.ocr_count for p in plans])
+    page_count = sum([len(p.pages) for p in plans])
+    click.secho(
+        f"Planned OCR for {ocr_count} of {page_count} pages in {len(plans)} pdfs.",
+        fg="bright_blue",
+    )
+    click.secho("Finished ocr plan.", bold=True)
+
+
+@ocr.command(name="plan-thresholds")
+@click.option(
+    "-c",
+    "--config-file",
+    "config_file",
+    type=Path,
+    help="Path to the config file.",
+)
+@click.option(
+    "-t",
+    "--candidate",
+    "candidates",
+    type=click.IntRange(min=0, max=255),
+    multiple=True,
+    help="A threshold to try, as well as the threshold in the config file "
+    "and the Otsu estimate. Can be given more than once.",
+)
+@click.option(
+    "-n",
+    "--sample-size",
+    "sample_size",
+    type=click.IntRange(min=1),
+    default=3,
+    help="The number of pages to try in each pdf. Default is 3.",
+)
+@click.option(
+    "--otsu-only",
+    "otsu_only",
+    is_flag=True,
+    default=False,
+    help="Use the Otsu estimate from the page histograms, without running OCR.",
+)
+@click.option(
+    "--rescan",
+    "rescan",
+    is_flag=True,
+    default=False,
+    help="Choose the threshold again for pdfs that already have one.",
+)
+def ocr_plan_thresholds(
+    config_file: Path,
+    candidates: tuple[int, ...],
+    sample_size: int,
+    otsu_only: bool,
+    rescan: bool,
+):
+    """
+    Choose the threshold for preparing the pages of each pdf.
+    A few pages are prepared using each candidate threshold,
+    and the threshold that recognises the most words is used for the pdf.
+    """
+
+    if not config_file:
+        raise click.UsageError("Must provide config file.")
+
+    from leaf_focus.ocr.threshold.operation import Operation
+
+    click.secho("Starting ocr plan thresholds.", bold=True)
+
+    config = Config.load(config_file)
+    logger = logging.getLogger()
+
+    if otsu_only:
+        recognise = None
+    else:
+        from leaf_focus.ocr.recognise.component import Component
+        from leaf_focus.ocr.recognise.operation import Operation as RecogniseOperation
+
+        ro = RecogniseOperation(
+            logger, config.processing_dir, models_dir=config.models_dir
+        )
+        recognise = Component(
+            logger,
+            backend=RecogniseOperation.build_backend(
+                logger, ro.model_store, config.ocr_backend, config.ocr_quantisation
+            ),
+            model_store=ro.model_store,
+        )
+
+    o = Operation(logger, config.processing_dir, recognise)
+    items = o.run_many(
+        config.prepare_image_threshold, candidates, sample_size, rescan=rescan
+    )
+
+    for item in items:
+        click.secho(
+            f"Pdf '{item.file_hash[0:15]}' uses threshold {item.threshold}.",
+            fg="bright_blue",
+        )
+    click.secho(f"Chose the threshold for {len(items)} pdfs.", fg="bright_blue")
+    click.secho("Finished ocr plan thresholds.", bold=True)
+
+
 @ocr.command(name="prepare")
 @click.option(
     "-i",
@@ -36,7 +169,8 @@ def ocr():
     "output_file",
     required=True,
     type=Path,
-    help="Path to the output prepared image file.",
+    help="Path to the output prepared image file. "
+    "The image format is chosen using the suffix: .png, .pgm, .pbm or .tif.",
 )
 @click.option(
     "-t",
@@ -69,7 +203,27 @@ def ocr_prepare(input_file: Path, output_file: Path, threshold: int):
     type=Path,
     help="Path to a config file containing domains and urls.",
 )
-def ocr_prepare_many(config_file: Path):
+@click.option(
+    "-s",
+    "--service",
+    "use_service",
+    is_flag=True,
+    default=False,
+    help="Send the prepared images to a running OCR service.",
+)
+@click.option(
+    "-t",
+    "--threshold",
+    "thresholds",
+    type=click.IntRange(min=0, max=255),
+    multiple=True,
+    help="A threshold to prepare the images with, instead of the config file. "
+    "Can be given more than once to prepare an image for each threshold, "
+    "reading each page image only once. "
+    "Given thresholds are used instead of the threshold chosen for each pdf. "
+    "The OCR service only recognises the images for the first threshold.",
+)
+def ocr_prepare_many(config_file: Path, use_service: bool, thresholds: tuple[int]):
     """Prepare multiple images for OCR."""
 
     if not config_file:
@@ -79,18 +233,130 @@ def ocr_prepare_many(config_file: Path):
 
     config = Config.load(config_file)
     processing_dir = config.processing_dir
-    threshold = config.prepare_image_threshold
+    threshold = thresholds[0] if thresholds else config.prepare_image_threshold
 
     logger = logging.getLogger()
-    log_data = {"base_dir": str(processing_dir), "threshold": threshold}
+    if use_service:
+        ocr_address = Location(logger).ocr_service_address(processing_dir)
+    else:
+        ocr_address = None
+
+    log_data = {
+        "base_dir": str(processing_dir),
+        "threshold": threshold,
+        "thresholds": list(thresholds),
+        "ocr_address": ocr_address,
+        "image_format": str(config.image_format),
+    }
     log_msg = ", ".join([f"{k}={v}" for k, v in log_data.items()])
     logger.info(f"Running ocr prepare many using {log_msg}.")
 
     c = Construct()
-    c.run_ocr(base_dir=processing_dir, threshold=threshold)
+    c.run_ocr(
+        base_dir=processing_dir,
+        threshold=threshold,
+        ocr_address=ocr_address,
+        thresholds=list(thresholds) or None,
+        image_format=config.image_format,
+    )
     click.secho("Finished ocr prepare many.", bold=True)
 
 
+@ocr.command(name="prepare-bench")
+@click.option(
+    "-c",
+    "--config-file",
+    "config_file",
+    type=Path,
+    help="Path to the config file.",
+)
+@click.option(
+    "-n",
+    "--pages",
+    "pages",
+    type=click.IntRange(min=1),
+    default=20,
+    help="The number of rendered pages to use. Default is 20.",
+)
+@click.option(
+    "--seed",
+    "seed",
+    type=int,
+    default=0,
+    help="The seed used to choose the sample of pages. Default is 0.",
+)
+@click.option(
+    "--rendered",
+    "rendered",
+    is_flag=True,
+    default=False,
+    help="Measure the greyscale rendered page images "
+    "instead of the prepared threshold images.",
+)
+@click.option(
+    "-o",
+    "--output",
+    "output_file",
+    type=Path,
+    default=None,
+    help="Path to a json file for the benchmark report.",
+)
+def ocr_prepare_bench(
+    config_file: Path,
+    pages: int,
+    seed: int,
+    rendered: bool,
+    output_file: Optional[Path],
+):
+    """Measure the time to save and read the page images in each image format."""
+
+    if not config_file:
+        raise click.UsageError("Must provide config file.")
+
+    import json
+
+    from leaf_focus.ocr.plan.operation import Operation as PlanOperation
+    from leaf_focus.ocr.prepare.bench import Bench
+    from leaf_focus.ocr.prepare.component import Component
+    from leaf_focus.pdf.identify.item import Item as PdfIdentifyItem
+    from leaf_focus.pdf.images.item import Item as ImageItem
+
+    click.secho("Starting ocr prepare bench.", bold=True)
+
+    config = Config.load(config_file)
+    logger = logging.getLogger()
+    plan = PlanOperation(logger, config.processing_dir)
+    threshold = config.prepare_image_threshold
+
+    found = []
+    for json_path in config.processing_dir.rglob("pdf-identify.json"):
+        file_hash = PdfIdentifyItem.read(json_path).file_hash
+        for item in ImageItem.load(json_path.parent):
+            if item.variety is None and plan.needs_ocr(file_hash, item.page):
+                found.append((file_hash, item.page, threshold))
+
+    b = Bench(logger, Component(logger))
+    sample = b.sample(found, pages, seed)
+    if not sample:
+        raise click.UsageError("Must have rendered pages to benchmark.")
+
+    loc = Location(logger, config.image_format)
+    image_files = [
+        loc.pdf_page_image_file(config.processing_dir, file_hash, page)
+        for file_hash, page, _ in sample
+    ]
+
+    report = b.run(image_files, threshold, rendered)
+    report["image_format"] = str(config.image_format)
+    if output_file:
+        with open(output_file, "wt", encoding="utf8") as f:
+            json.dump(report, f, indent=2)
+
+    for line in b.table(report):
+        click.secho(line, fg="bright_blue")
+    click.secho("Finished ocr prepare bench.", bold=True)
+
+
 @ocr.command(name="recognise")
 @click.option(
     "-i",
@@ -104,9 +370,10 @@ def ocr_prepare_many(config_file: Path):
     "-a",
     "--annotations",
     "annotations_file",
-    required=True,
     type=Path,
-    help="Path to the output annotations file.",
+    default=None,
+    help="Path to the output annotations file. "
+    "The annotations are only created if this is provided.",
 )
 @click.option(
     "-p",
@@ -116,7 +383,9 @@ def ocr_prepare_many(config_file: Path):
     type=Path,
     help="Path to the output predictions file.",
 )
-def ocr_recognise(image_file: Path, annotation_file: Path, predictions_file: Path):
+def ocr_recognise(
+    input_file: Path, annotations_file: Optional[Path], predictions_file: Path
+):
     """Recognise the text in an image."""
 
     from leaf_focus.ocr.recognise.component import Component
@@ -124,8 +393,8 @@ def ocr_recognise(image_file: Path, annotation_file: Path, predictions_file: Pat
     click.secho("Starting ocr recognise.", bold=True)
 
     logger = logging.getLogger()
-    c = Component(logger)
-    c.recognise_text(image_file, annotation_file, predictions_file)
+    c = Component(logger, annotate=annotations_file is not None)
+    c.recognise_text(input_file, annotations_file, predictions_file)
 
     click.secho("Finished ocr recognise.", bold=True)
 
@@ -138,22 +407,869 @@ def ocr_recognise(image_file: Path, annotation_file: Path, predictions_file: Pat
     type=Path,
     help="Path to the config file.",
 )
-def ocr_recognise_many(config_file: Path):
-    """Recognise the text in multiple images."""
+@click.option(
+    "-b",
+    "--batch-size",
+    "batch_size",
+    type=click.IntRange(min=1),
+    default=4,
+    help="The number of images to recognise in each OCR call. Default is 4.",
+)
+@click.option(
+    "-w",
+    "--workers",
+    "workers",
+    type=click.IntRange(min=1),
+    default=1,
+    help="The number of OCR worker processes. Default is 1.",
+)
+@click.option(
+    "--intra-op-threads",
+    "intra_op_threads",
+    type=click.IntRange(min=1),
+    default=None,
+    help="The tensorflow threads used within an operation in each worker. "
+    "Default is the number of cores divided by the number of workers.",
+)
+@click.option(
+    "--inter-op-threads",
+    "inter_op_threads",
+    type=click.IntRange(min=1),
+    default=1,
+    help="The tensorflow threads used between operations in each worker. "
+    "Default is 1.",
+)
+@click.option(
+    "--cpu-affinity",
+    "cpu_affinity",
+    is_flag=True,
+    default=False,
+    help="Pin each worker to its own cpu cores.",
+)
+@click.option(
+    "--annotate",
+    "annotate",
+    is_flag=True,
+    default=False,
+    help="Also create the annotation images. "
+    "These can be created later using 'ocr annotate'.",
+)
+@click.option(
+    "--recognise-only",
+    "recognise_only",
+    is_flag=True,
+    default=False,
+    help="Run the text recognition again for the pages with cached text boxes, "
+    "without running the text detection.",
+)
+@click.option(
+    "--reorder-only",
+    "reorder_only",
+    is_flag=True,
+    default=False,
+    help="Arrange the existing predictions into lines again, without running OCR.",
+)
+@click.option(
+    "--perceptual-hash",
+    "perceptual_hash",
+    is_flag=True,
+    default=False,
+    help="Match cached predictions using a perceptual hash of the page image, "
+    "so near-identical pages also use the cached predictions.",
+)
+@click.option(
+    "--detection-resolution",
+    "detection_resolution",
+    type=float,
+    default=None,
+    callback=validate_resolution,
+    help="Find the text boxes using a smaller copy of each page image, "
+    "for example 0.5 for half the width and height. "
+    "The text is still recognised using the full size image. Default is 1.",
+)
+@click.option(
+    "--crop-margins",
+    "crop_margins",
+    is_flag=True,
+    default=False,
+    help="Skip blank pages and crop the empty margins before running the OCR.",
+)
+@click.option(
+    "--min-ink-coverage",
+    "min_ink_coverage",
+    type=click.FloatRange(min=0, max=1),
+    default=None,
+    help="The smallest fraction of dark pixels in a page that is not blank, "
+    "when cropping the margins. Default is 0.002.",
+)
+@click.option(
+    "--prefetch",
+    "prefetch",
+    type=click.IntRange(min=0),
+    default=0,
+    help="The number of batches to read ahead in other threads, "
+    "while the OCR runs. Default is 0, which reads each batch when it is needed.",
+)
+@click.option(
+    "--write-queue",
+    "write_queue",
+    type=click.IntRange(min=1),
+    default=2,
+    help="The most batches waiting to be saved in other threads, "
+    "when reading ahead. Default is 2.",
+)
+@click.option(
+    "--io-threads",
+    "io_threads",
+    type=click.IntRange(min=1),
+    default=2,
+    help="The number of threads for reading and for saving, "
+    "when reading ahead. Default is 2.",
+)
+@click.option(
+    "--rescan",
+    "rescan",
+    is_flag=True,
+    default=False,
+    help="Find the pages that need OCR again, "
+    "instead of continuing the interrupted run in the checkpoint file.",
+)
+@click.option(
+    "--fused",
+    "fused",
+    is_flag=True,
+    default=False,
+    help="Prepare the rendered page images in memory and give them straight "
+    "to the OCR, instead of reading the prepared image files. "
+    "This does not need 'ocr prepare-many' to be run first.",
+)
+@click.option(
+    "--keep-intermediates",
+    "keep_intermediates",
+    is_flag=True,
+    default=False,
+    help="Also save the prepared image files when using '--fused'.",
+)
+@click.option(
+    "--page-slots",
+    "page_slots",
+    type=click.IntRange(min=1),
+    default=None,
+    help="The number of page images shared with the worker processes at once, "
+    "when using '--fused' with more than one worker. "
+    "Default is two for each worker.",
+)
+def ocr_recognise_many(
+    config_file: Path,
+    batch_size: int,
+    workers: int,
+    intra_op_threads: Optional[int],
+    inter_op_threads: int,
+    cpu_affinity: bool,
+    annotate: bool,
+    recognise_only: bool,
+    reorder_only: bool,
+    perceptual_hash: bool,
+    detection_resolution: Optional[float],
+    crop_margins: bool,
+    min_ink_coverage: Optional[float],
+    prefetch: int,
+    write_queue: int,
+    io_threads: int,
+    rescan: bool,
+    fused: bool,
+    keep_intermediates: bool,
+    page_slots: Optional[int],
+):
+    """
+    Recognise the text in multiple images.
+    The pages that need OCR are saved to a checkpoint file,
+    so an interrupted run continues where it stopped.
+    """
 
     if not config_file:
         raise click.UsageError("Must provide config file.")
+    if recognise_only and reorder_only:
+        raise click.UsageError(
+            "Must provide only one of recognise only or reorder only."
+        )
+    if (recognise_only or reorder_only) and workers > 1:
+        raise click.UsageError("Must use one worker to recognise only or reorder only.")
+    if fused and (recognise_only or reorder_only):
+        raise click.UsageError("Must not use recognise only or reorder only for fused.")
+    if keep_intermediates and not fused:
+        raise click.UsageError("Must use fused to keep intermediates.")
 
+    from leaf_focus.ocr.recognise.checkpoint import Checkpoint
     from leaf_focus.ocr.recognise.operation import Operation
+    from leaf_focus.ocr.recognise.pool import Pool
+    from leaf_focus.ocr.recognise.progress import Progress
 
     click.secho("Starting ocr recognise many.", bold=True)
 
     config = Config.load(config_file)
     logger = logging.getLogger()
-    o = Operation(logger, config.processing_dir)
+    o = Operation(
+        logger,
+        config.processing_dir,
+        intra_op_threads=intra_op_threads,
+        inter_op_threads=inter_op_threads,
+        annotate=annotate,
+        perceptual_hash=perceptual_hash,
+        detection_resolution=detection_resolution,
+        crop_margins=crop_margins,
+        min_ink_coverage=min_ink_coverage,
+        backend=config.ocr_backend,
+        quantisation=config.ocr_quantisation,
+        models_dir=config.models_dir,
+        prefetch=prefetch,
+        write_queue=write_queue,
+        io_threads=io_threads,
+        image_format=config.image_format,
+    )
+
+    if reorder_only:
+        count = o.reorder_many()
+        click.secho(f"Arranged text into lines in {count} pages.", fg="bright_blue")
+        click.secho("Finished ocr recognise many.", bold=True)
+        return
+
+    if recognise_only:
+        count = o.run_many(batch_size=batch_size, recognise_only=True)
+        click.secho(f"Recognised text in {count} images.", fg="bright_blue")
+        click.secho("Finished ocr recognise many.", bold=True)
+        return
+
+    # the work list is saved, so an interrupted run does not need to find it again
+    checkpoint = Checkpoint(
+        logger, Location(logger).ocr_checkpoint_file(config.processing_dir)
+    )
+    # the pages are found differently for the fused mode,
+    # so a checkpoint is only used with the same options
+    rendered_threshold = config.prepare_image_threshold if fused else None
+    options = {"fused": fused, "rendered_threshold": rendered_threshold}
+    if checkpoint.exists() and not rescan and checkpoint.options() != options:
+        click.secho(
+            f"Finding the pages again, as '{checkpoint.path}' "
+            f"was created using other options.",
+            fg="bright_blue",
+        )
+        rescan = True
+    if checkpoint.exists() and not rescan:
+        pending, done_count = checkpoint.load()
+        click.secho(f"Continuing from '{checkpoint.path}'.", fg="bright_blue")
+    else:
+        pending, done_count = o.find_pending(rendered_threshold)
+        checkpoint.start(pending, done_count, options)
+
+    click.secho(
+        f"Found {len(pending)} pages that need OCR "
+        f"and {done_count} pages that are done.",
+        fg="bright_blue",
+    )
+
+    progress = Progress(
+        pending, done_count, lambda msg: click.secho(msg, fg="bright_blue")
+    )
+
+    def on_done(items: list[tuple[str, int, int]]) -> None:
+        checkpoint.mark_done(items)
+        progress.update(items)
 
-    o.run_many()
+    if workers > 1 and pending:
+        # each worker process recognises one page at a time
+        p = Pool(
+            logger,
+            config.processing_dir,
+            workers=workers,
+            intra_op_threads=intra_op_threads,
+            inter_op_threads=inter_op_threads,
+            cpu_affinity=cpu_affinity,
+            annotate=annotate,
+            perceptual_hash=perceptual_hash,
+            detection_resolution=detection_resolution,
+            crop_margins=crop_margins,
+            min_ink_coverage=min_ink_coverage,
+            backend=config.ocr_backend,
+            quantisation=config.ocr_quantisation,
+            models_dir=config.models_dir,
+            fused=fused,
+            keep_intermediates=keep_intermediates,
+            page_slots=page_slots,
+            image_format=config.image_format,
+        )
+        for file_hash, page, threshold, _, _ in p.run(pending):
+            on_done([(file_hash, page, threshold)])
+    elif pending:
+        o.run_pages(
+            pending,
+            batch_size=batch_size,
+            on_done=on_done,
+            fused=fused,
+            keep_intermediates=keep_intermediates,
+        )
 
+    checkpoint.finish()
+
+    if workers == 1:
+        # each worker process has its own cache counts
+        click.secho(progress.summary(o.result_cache.hits), fg="bright_blue")
+        click.secho(o.result_cache.summary(), fg="bright_blue")
+    else:
+        click.secho(progress.summary(), fg="bright_blue")
     click.secho("Finished ocr recognise many.", bold=True)
 
-    raise NotImplementedError()
+
+@ocr.command(name="retry-pages")
+@click.option(
+    "-c",
+    "--config-file",
+    "config_file",
+    type=Path,
+    help="Path to the config file.",
+)
+@click.option(
+    "-i",
+    "--input",
+    "input_file",
+    type=Path,
+    default=None,
+    help="Path to the poor pages csv file created by the report. "
+    "Default is 'poor-pages.csv' in the report directory.",
+)
+@click.option(
+    "-t",
+    "--threshold",
+    "threshold",
+    type=int,
+    required=True,
+    callback=validate_threshold,
+    help="The threshold to use for preparing the pages again.",
+)
+@click.option(
+    "-b",
+    "--batch-size",
+    "batch_size",
+    type=click.IntRange(min=1),
+    default=4,
+    help="The number of images to recognise in each OCR call. Default is 4.",
+)
+@click.option(
+    "--detection-resolution",
+    "detection_resolution",
+    type=float,
+    default=None,
+    callback=validate_resolution,
+    help="Find the text boxes using a smaller copy of each page image. "
+    "Default is 1.",
+)
+@click.option(
+    "--crop-margins",
+    "crop_margins",
+    is_flag=True,
+    default=False,
+    help="Skip blank pages and crop the empty margins before running the OCR.",
+)
+def ocr_retry_pages(
+    config_file: Path,
+    input_file: Optional[Path],
+    threshold: int,
+    batch_size: int,
+    detection_resolution: Optional[float],
+    crop_margins: bool,
+):
+    """
+    Recognise the text again for the pages the report could not parse well,
+    using other OCR settings.
+    """
+
+    if not config_file:
+        raise click.UsageError("Must provide config file.")
+
+    from leaf_focus.ocr.recognise.operation import Operation
+    from leaf_focus.report.item.poor_page import PoorPage
+
+    click.secho("Starting ocr retry pages.", bold=True)
+
+    config = Config.load(config_file)
+    input_file = input_file or config.report_dir / "poor-pages.csv"
+    if not input_file.exists():
+        raise click.UsageError(f"Poor pages file does not exist '{input_file}'.")
+
+    pages = sorted(
+        {(item.pdf_hash_value, item.pdf_page) for item in PoorPage.load(input_file)}
+    )
+    click.secho(f"Found {len(pages)} pages to recognise again.", fg="bright_blue")
+
+    logger = logging.getLogger()
+    o = Operation(
+        logger,
+        config.processing_dir,
+        detection_resolution=detection_resolution,
+        crop_margins=crop_margins,
+        backend=config.ocr_backend,
+        quantisation=config.ocr_quantisation,
+        models_dir=config.models_dir,
+        image_format=config.image_format,
+    )
+    outputs = o.retry_pages(pages, threshold, batch_size)
+
+    click.secho(
+        f"Recognised {len(outputs)} pages using threshold {threshold}.",
+        fg="bright_blue",
+    )
+    click.secho("Finished ocr retry pages.", bold=True)
+
+
+@ocr.command(name="compare-backends")
+@click.option(
+    "-c",
+    "--config-file",
+    "config_file",
+    type=Path,
+    help="Path to the config file.",
+)
+@click.option(
+    "-i",
+    "--image",
+    "image_files",
+    required=True,
+    multiple=True,
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="A prepared image to recognise. Can be given more than once.",
+)
+@click.option(
+    "-q",
+    "--quantisation",
+    "quantisations",
+    multiple=True,
+    type=click.Choice(["none", "float16", "int8"]),
+    help="The TFLite quantisation to compare. Can be given more than once. "
+    "Default is all quantisations.",
+)
+@click.option(
+    "-o",
+    "--output",
+    "output_file",
+    type=Path,
+    default=None,
+    help="Path to a csv file for the result of each image.",
+)
+def ocr_compare_backends(
+    config_file: Path,
+    image_files: tuple[Path],
+    quantisations: tuple[str],
+    output_file: Optional[Path],
+):
+    """Compare the accuracy and speed of the TFLite backend to keras-ocr."""
+
+    if not config_file:
+        raise click.UsageError("Must provide config file.")
+
+    from leaf_focus.ocr.recognise.compare import BackendComparison
+    from leaf_focus.ocr.recognise.component import Component
+    from leaf_focus.ocr.recognise.model_store import ModelStore
+    from leaf_focus.ocr.recognise.operation import Operation
+
+    click.secho("Starting ocr compare backends.", bold=True)
+
+    config = Config.load(config_file)
+    logger = logging.getLogger()
+    store = ModelStore(
+        logger,
+        config.models_dir or Location(logger).ocr_models_dir(config.processing_dir),
+    )
+
+    # the keras-ocr pipeline is the reference for the accuracy
+    backends = {"keras": Component(logger, model_store=store)}
+    for quantisation in quantisations or ["none", "float16", "int8"]:
+        backend = Operation.build_backend(logger, store, "tflite", quantisation)
+        backends[backend.name] = Component(logger, backend=backend)
+
+    c = BackendComparison(logger)
+    results = c.run(list(image_files), backends)
+    if output_file:
+        c.save(output_file, results)
+
+    for summary in c.summary(results):
+        click.secho(
+            f"{summary['backend']:>14}: {summary['seconds']:.3f} s/image, "
+            f"speedup {summary['speedup']}x, "
+            f"word match {summary['word_match']:.1%}, "
+            f"text similarity {summary['text_similarity']:.1%}",
+            fg="bright_blue",
+        )
+    click.secho("Finished ocr compare backends.", bold=True)
+
+
+@ocr.command(name="bench")
+@click.option(
+    "-c",
+    "--config-file",
+    "config_file",
+    type=Path,
+    help="Path to the config file.",
+)
+@click.option(
+    "-n",
+    "--pages",
+    "pages",
+    type=click.IntRange(min=1),
+    default=20,
+    help="The number of prepared pages to recognise. Default is 20.",
+)
+@click.option(
+    "--seed",
+    "seed",
+    type=int,
+    default=0,
+    help="The seed used to choose the sample of pages. Default is 0.",
+)
+@click.option(
+    "-b",
+    "--batch-size",
+    "batch_size",
+    type=click.IntRange(min=1),
+    default=1,
+    help="The number of images to recognise in each OCR call. Default is 1.",
+)
+@click.option(
+    "--intra-op-threads",
+    "intra_op_threads",
+    type=click.IntRange(min=1),
+    default=None,
+    help="The tensorflow threads used within an operation. "
+    "Default is the tensorflow default.",
+)
+@click.option(
+    "--inter-op-threads",
+    "inter_op_threads",
+    type=click.IntRange(min=1),
+    default=None,
+    help="The tensorflow threads used between operations. "
+    "Default is the tensorflow default.",
+)
+@click.option(
+    "--annotate",
+    "annotate",
+    is_flag=True,
+    default=False,
+    help="Also create the annotation images.",
+)
+@click.option(
+    "-o",
+    "--output",
+    "output_file",
+    type=Path,
+    default=None,
+    help="Path to a json file for the benchmark report.",
+)
+def ocr_bench(
+    config_file: Path,
+    pages: int,
+    seed: int,
+    batch_size: int,
+    intra_op_threads: Optional[int],
+    inter_op_threads: Optional[int],
+    annotate: bool,
+    output_file: Optional[Path],
+):
+    """Measure the time taken by each phase of the OCR."""
+
+    if not config_file:
+        raise click.UsageError("Must provide config file.")
+
+    import json
+
+    from leaf_focus.ocr.recognise.bench import Bench
+    from leaf_focus.ocr.recognise.component import Component
+    from leaf_focus.ocr.recognise.operation import Operation
+    from leaf_focus.ocr.recognise.phase_timer import PhaseTimer
+
+    click.secho("Starting ocr bench.", bold=True)
+
+    config = Config.load(config_file)
+    logger = logging.getLogger()
+    o = Operation(
+        logger,
+        config.processing_dir,
+        models_dir=config.models_dir,
+        image_format=config.image_format,
+    )
+
+    # the caches are not used, so every page runs through the OCR
+    timer = PhaseTimer()
+    c = Component(
+        logger,
+        intra_op_threads,
+        inter_op_threads,
+        annotate,
+        backend=Operation.build_backend(
+            logger,
+            o.model_store,
+            config.ocr_backend,
+            config.ocr_quantisation,
+            intra_op_threads,
+        ),
+        model_store=o.model_store,
+        timer=timer,
+    )
+    b = Bench(logger, c, timer)
+
+    sample = b.sample(list(o.find_prepared()), pages, seed)
+    if not sample:
+        raise click.UsageError("Must have prepared pages to benchmark.")
+    image_files = [o.job(*item)[0] for item in sample]
+
+    report = b.run(image_files, batch_size)
+    report["backend"] = config.ocr_backend
+    report["quantisation"] = config.ocr_quantisation
+    if output_file:
+        with open(output_file, "wt", encoding="utf8") as f:
+            json.dump(report, f, indent=2)
+
+    for line in b.table(report):
+        click.secho(line, fg="bright_blue")
+    click.secho("Finished ocr bench.", bold=True)
+
+
+@ocr.command(name="fetch-models")
+@click.option(
+    "-c",
+    "--config-file",
+    "config_file",
+    type=Path,
+    help="Path to the config file.",
+)
+def ocr_fetch_models(config_file: Path):
+    """Download the OCR model weights to the model store."""
+
+    if not config_file:
+        raise click.UsageError("Must provide config file.")
+
+    from leaf_focus.ocr.recognise.model_store import ModelStore
+
+    click.secho("Starting ocr fetch models.", bold=True)
+
+    config = Config.load(config_file)
+    logger = logging.getLogger()
+    store = ModelStore(
+        logger,
+        config.models_dir or Location(logger).ocr_models_dir(config.processing_dir),
+    )
+    store.fetch()
+
+    click.secho(f"Saved the OCR models to '{store.models_dir}'.", fg="bright_blue")
+    click.secho("Finished ocr fetch models.", bold=True)
+
+
+@ocr.command(name="import-models")
+@click.option(
+    "-c",
+    "--config-file",
+    "config_file",
+    type=Path,
+    help="Path to the config file.",
+)
+@click.option(
+    "-i",
+    "--input",
+    "source_dir",
+    required=True,
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    help="Path to a model store created by 'ocr fetch-models'.",
+)
+def ocr_import_models(config_file: Path, source_dir: Path):
+    """Copy the OCR model weights from another model store."""
+
+    if not config_file:
+        raise click.UsageError("Must provide config file.")
+
+    from leaf_focus.ocr.recognise.model_store import ModelStore
+
+    click.secho("Starting ocr import models.", bold=True)
+
+    config = Config.load(config_file)
+    logger = logging.getLogger()
+    store = ModelStore(
+        logger,
+        config.models_dir or Location(logger).ocr_models_dir(config.processing_dir),
+    )
+    store.import_models(source_dir)
+
+    click.secho(f"Imported the OCR models to '{store.models_dir}'.", fg="bright_blue")
+    click.secho("Finished ocr import models.", bold=True)
+
+
+@ocr.command(name="convert-predictions")
+@click.option(
+    "-c",
+    "--config-file",
+    "config_file",
+    type=Path,
+    help="Path to the config file.",
+)
+@click.option(
+    "--force",
+    "force",
+    is_flag=True,
+    default=False,
+    help="Convert all predictions files, even if they are already converted.",
+)
+def ocr_convert_predictions(config_file: Path, force: bool):
+    """Create the binary predictions files from the csv predictions files."""
+
+    if not config_file:
+        raise click.UsageError("Must provide config file.")
+
+    from leaf_focus.ocr.recognise.operation import Operation
+
+    click.secho("Starting ocr convert predictions.", bold=True)
+
+    config = Config.load(config_file)
+    logger = logging.getLogger()
+    o = Operation(logger, config.processing_dir)
+    converted, done = o.convert_predictions(force)
+
+    click.secho(
+        f"Converted {converted} predictions files, {done} were already converted.",
+        fg="bright_blue",
+    )
+    click.secho("Finished ocr convert predictions.", bold=True)
+
+
+@ocr.command(name="serve")
+@click.option(
+    "-c",
+    "--config-file",
+    "config_file",
+    type=Path,
+    help="Path to the config file.",
+)
+@click.option(
+    "-b",
+    "--batch-size",
+    "batch_size",
+    type=click.IntRange(min=1),
+    default=4,
+    help="The most images to recognise in each OCR call. Default is 4.",
+)
+@click.option(
+    "--annotate",
+    "annotate",
+    is_flag=True,
+    default=False,
+    help="Also create the annotation images.",
+)
+@click.option(
+    "--stop",
+    "stop",
+    is_flag=True,
+    default=False,
+    help="Stop the running OCR service.",
+)
+def ocr_serve(config_file: Path, batch_size: int, annotate: bool, stop: bool):
+    """Run a local OCR service that recognises pages sent to it."""
+
+    if not config_file:
+        raise click.UsageError("Must provide config file.")
+
+    from leaf_focus.ocr.recognise.operation import Operation
+    from leaf_focus.ocr.recognise.service import Client, Service
+
+    config = Config.load(config_file)
+    logger = logging.getLogger()
+    address = Location(logger).ocr_service_address(config.processing_dir)
+    key_file = Location(logger).ocr_service_key_file(config.processing_dir)
+
+    if stop:
+        click.secho("Stopping ocr service.", bold=True)
+        Client(address, key_file).stop()
+        click.secho("Stopped ocr service.", bold=True)
+        return
+
+    click.secho("Starting ocr service.", bold=True)
+
+    o = Operation(
+        logger,
+        config.processing_dir,
+        annotate=annotate,
+        backend=config.ocr_backend,
+        quantisation=config.ocr_quantisation,
+        models_dir=config.models_dir,
+        image_format=config.image_format,
+    )
+    s = Service(logger, o, address, key_file, batch_size=batch_size)
+    s.serve()
+
+    click.secho("Finished ocr service.", bold=True)
+
+
+@ocr.command(name="annotate")
+@click.option(
+    "-c",
+    "--config-file",
+    "config_file",
+    type=Path,
+    help="Path to the config file.",
+)
+@click.option(
+    "-f",
+    "--file-hash",
+    "file_hash",
+    required=True,
+    help="The hash of the pdf file (at least the first 15 characters).",
+)
+@click.option(
+    "-p",
+    "--page",
+    "pages",
+    type=click.IntRange(min=1),
+    multiple=True,
+    help="The page number to annotate. Can be given more than once. "
+    "Default is all pages with predictions.",
+)
+@click.option(
+    "-t",
+    "--threshold",
+    "threshold",
+    type=int,
+    default=None,
+    help="Only annotate the pages prepared using this threshold.",
+)
+@click.option(
+    "-w",
+    "--workers",
+    "workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="The number of processes used to draw the annotations. "
+    "Default is the number of cores.",
+)
+def ocr_annotate(
+    config_file: Path,
+    file_hash: str,
+    pages: tuple[int],
+    threshold: Optional[int],
+    workers: Optional[int],
+):
+    """Draw the recognised text over the page images."""
+
+    if not config_file:
+        raise click.UsageError("Must provide config file.")
+    if len(file_hash) < 15:
+        raise click.BadParameter("must be at least 15 characters")
+
+    from leaf_focus.ocr.annotate.operation import Operation
+
+    click.secho("Starting ocr annotate.", bold=True)
+
+    config = Config.load(config_file)
+    logger = logging.getLogger()
+    o = Operation(logger, config.processing_dir, config.image_format)
+
+    found = o.find_pages(file_hash, pages, threshold)
+    result = o.run_many(found, workers)
+
+    click.secho(f"Created {len(result)} annotation images.", fg="bright_blue")
+    click.secho("Finished ocr annotate.", bold=True)
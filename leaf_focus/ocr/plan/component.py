@@ -0,0 +1,69 @@
+import re
+import string
+from importlib import resources
+from logging import Logger
+from typing import Iterable, Optional
+
+from leaf_focus.ocr.plan.item import PagePlan
+
+
+class Component:
+    """Decide which pdf pages need OCR from the quality of the embedded text."""
+
+    min_chars = 50
+    """The fewest characters in a usable text layer without a known header."""
+
+    min_printable_ratio = 0.9
+    """The smallest fraction of expected characters in a usable text layer."""
+
+    _extra_chars = set("–—‘’“”•£€°§©®")
+    _whitespace_re = re.compile(r"\s+")
+
+    def __init__(self, logger: Logger, headers: Optional[Iterable[str]] = None):
+        self._logger = logger
+        if headers is None:
+            headers = self._load_headers()
+        self._headers = [self._normalise(h) for h in headers if h and h.strip()]
+
+    def classify(self, page: int, lines: Iterable[str]) -> PagePlan:
+        """Check the embedded text of a page to decide if the page needs OCR."""
+        text = "\n".join(lines or [])
+        chars = self._whitespace_re.sub("", text)
+        char_count = len(chars)
+
+        printable_count = len([c for c in chars if self._is_expected(c)])
+        printable_ratio = printable_count / char_count if char_count > 0 else 0.0
+
+        normalised = self._normalise(text)
+        header_hits = len([h for h in self._headers if h in normalised])
+
+        if char_count < 1:
+            needs_ocr, reason = True, "no text"
+        elif printable_ratio < self.min_printable_ratio:
+            needs_ocr, reason = True, "garbled text"
+        elif char_count < self.min_chars and header_hits < 1:
+            needs_ocr, reason = True, "little text"
+        else:
+            needs_ocr, reason = False, "usable text"
+
+        return PagePlan(
+            page=page,
+            char_count=char_count,
+            printable_ratio=round(printable_ratio, 4),
+            header_hits=header_hits,
+            needs_ocr=needs_ocr,
+            reason=reason,
+        )
+
+    def _is_expected(self, char: str) -> bool:
+        return char.isalnum() or char in string.punctuation or char in self._extra_chars
+
+    def _normalise(self, value: str) -> str:
+        return self._whitespace_re.sub(" ", value).strip().casefold()
+
+    def _load_headers(self) -> list[str]:
+        from leaf_focus.report.item.section import Section
+
+        with resources.path("leaf_focus.resources", "sections.yml") as p:
+            sections = list(Section.load(p))
+        return [name for section in sections for name in section.names]
@@ -0,0 +1,66 @@
+import dataclasses
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from leaf_focus.support.serialise import LeafFocusJsonEncoder, LeafFocusJsonDecoder
+
+
+@dataclass
+class PagePlan:
+    """The text layer quality of one pdf page."""
+
+    page: int
+    """The page number, starting at 1."""
+
+    char_count: int
+    """The number of characters that are not whitespace."""
+
+    printable_ratio: float
+    """The fraction of the characters that are expected in readable text."""
+
+    header_hits: int
+    """The number of known section headers found in the page."""
+
+    needs_ocr: bool
+    """Whether the page needs OCR."""
+
+    reason: str
+    """Why the page does or does not need OCR."""
+
+
+@dataclass
+class Item:
+    """The pages of a pdf that need OCR."""
+
+    file_hash: str
+    pages: list[PagePlan] = field(default_factory=list)
+
+    def needs_ocr(self, page: int) -> bool:
+        """
+        Check if a page needs OCR.
+        Pages that are not in the plan always need OCR.
+        """
+        for page_plan in self.pages:
+            if page_plan.page == page:
+                return page_plan.needs_ocr
+        return True
+
+    @property
+    def ocr_count(self) -> int:
+        """The number of pages that need OCR."""
+        return len([p for p in self.pages if p.needs_ocr])
+
+    def write(self, path: Path) -> None:
+        with open(path, "wt") as f:
+            item_dict = dataclasses.asdict(self)
+            json.dump(item_dict, f, indent=2, cls=LeafFocusJsonEncoder)
+
+    @classmethod
+    def read(cls, path: Path) -> "Item":
+        with open(path, "rt") as f:
+            item_dict = json.load(f, cls=LeafFocusJsonDecoder)
+            return Item(
+                file_hash=item_dict["file_hash"],
+                pages=[PagePlan(**p) for p in item_dict.get("pages") or []],
+            )
@@ -0,0 +1,81 @@
+from logging import Logger
+from pathlib import Path
+from typing import Iterable, Optional
+
+from leaf_focus.ocr.plan.component import Component
+from leaf_focus.ocr.plan.item import Item
+from leaf_focus.pdf.identify.item import Item as PdfIdentifyItem
+from leaf_focus.pdf.text.component import Component as PdfTextComponent
+from leaf_focus.support.location import Location
+
+
+class Operation:
+    """A pipeline building block that creates and reads the ocr plan files."""
+
+    def __init__(self, logger: Logger, base_path: Path):
+        self._logger = logger
+        self._base_path = base_path
+        self._location = Location(logger)
+        self._component = None  # type: Optional[Component]
+        self._plans = {}  # type: dict[str, Optional[Item]]
+
+    def run(self, file_hash: str) -> Optional[Path]:
+        """Create the ocr plan for a pdf from its embedded text."""
+        loc = self._location
+        bd = self._base_path
+        text_file = loc.pdf_text_file(bd, file_hash)
+        plan_file = loc.ocr_plan_file(bd, file_hash)
+
+        if not text_file.exists():
+            self._logger.warning(
+                f"Cannot create ocr plan without pdf text file '{text_file}'."
+            )
+            return None
+
+        # the headers are only loaded when a plan is created
+        if self._component is None:
+            self._component = Component(self._logger)
+
+        pages = [
+            self._component.classify(index + 1, lines)
+            for index, lines in enumerate(PdfTextComponent.read(text_file))
+        ]
+        plan = Item(file_hash=file_hash, pages=pages)
+        plan.write(plan_file)
+        self._plans[file_hash] = plan
+
+        self._logger.info(
+            f"Planned OCR for {plan.ocr_count} of {len(pages)} pages "
+            f"in '{file_hash[0:15]}'."
+        )
+        return plan_file
+
+    def run_many(self) -> list[Item]:
+        """Create the ocr plan for all the pdfs."""
+        result = []
+        for file_hash in self.find_identified():
+            if self.run(file_hash):
+                result.append(self._plans[file_hash])
+        return result
+
+    def find_identified(self) -> Iterable[str]:
+        """Find the hash of all the identified pdfs."""
+        for json_path in self._base_path.rglob("pdf-identify.json"):
+            yield PdfIdentifyItem.read(json_path).file_hash
+
+    def read(self, file_hash: str) -> Optional[Item]:
+        """Read the ocr plan for a pdf, if there is one."""
+        if file_hash not in self._plans:
+            plan_file = self._location.ocr_plan_file(self._base_path, file_hash)
+            self._plans[file_hash] = (
+                Item.read(plan_file) if plan_file.exists() else None
+            )
+        return self._plans[file_hash]
+
+    def needs_ocr(self, file_hash: str, page: int) -> bool:
+        """
+        Check if a page needs OCR.
+        All pages need OCR when the pdf does not have a plan.
+        """
+        plan = self.read(file_hash)
+        return plan is None or plan.needs_ocr(page)
@@ -0,0 +1,162 @@
+import platform
+import random
+import tempfile
+import time
+from importlib import metadata
+from logging import Logger
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from PIL import Image
+
+from leaf_focus.ocr.prepare.component import Component
+from leaf_focus.pdf.images.image_format import ImageFormat
+
+
+class Bench:
+    """Measure the time to save and read the page images in each image format."""
+
+    formats = [
+        ImageFormat("png", 9),
+        ImageFormat("png", 6),
+        ImageFormat("png", 1),
+        ImageFormat("png", 0),
+        ImageFormat("pgm"),
+        ImageFormat("pbm"),
+        ImageFormat("tiff"),
+    ]
+    """The image formats to compare."""
+
+    bilevel = ["pbm", "tiff"]
+    """The formats that store one bit per pixel, which can't store rendered pages."""
+
+    packages = ["pillow", "numpy"]
+    """The packages that affect the speed of saving and reading images."""
+
+    def __init__(self, logger: Logger, component: Component):
+        self._logger = logger
+        self._component = component
+
+    def sample(
+        self, pages: list[tuple[str, int, int]], count: int, seed: int = 0
+    ) -> list[tuple[str, int, int]]:
+        """Choose the same random sample of pages each time for the same seed."""
+        if count < 1:
+            raise ValueError(f"Sample size must be 1 or more, not {count}.")
+        pages = sorted(pages)
+        if count >= len(pages):
+            return pages
+        return sorted(random.Random(seed).sample(pages, count))
+
+    def run(
+        self,
+        image_files: list[Path],
+        threshold: int,
+        rendered: bool = False,
+        formats: Optional[list[ImageFormat]] = None,
+    ) -> dict:
+        """
+        Save and read the threshold image of each page image in each format.
+        When rendered is set, the greyscale page images are used instead.
+        The files are saved to a temporary directory, so existing files are kept.
+        """
+        if not image_files:
+            raise ValueError("Must supply image files.")
+        if threshold < 0 or threshold > 255:
+            raise ValueError(f"Threshold must between 0 and 255, not {threshold}.")
+
+        images = []
+        for image_file in image_files:
+            greyscale = self._component.read_greyscale(image_file)
+            if rendered:
+                images.append(greyscale)
+            else:
+                images.append(self._component.binarise(greyscale, threshold))
+
+        formats = formats or self.formats
+        if rendered:
+            formats = [i for i in formats if i.name not in self.bilevel]
+
+        results = {}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for image_format in formats:
+                self._logger.info(f"Measuring image format '{image_format}'.")
+                output_dir = Path(temp_dir, str(image_format))
+                output_dir.mkdir()
+                results[str(image_format)] = self._measure(
+                    output_dir, image_format, images
+                )
+
+        return {
+            "pages": len(images),
+            "threshold": None if rendered else threshold,
+            "rendered": rendered,
+            "formats": results,
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "packages": self.package_versions(),
+        }
+
+    def package_versions(self) -> dict[str, Optional[str]]:
+        result = {}
+        for name in self.packages:
+            try:
+                result[name] = metadata.version(name)
+            except metadata.PackageNotFoundError:
+                result[name] = None
+        return result
+
+    def table(self, report: dict) -> list[str]:
+        """Format the benchmark report as a table."""
+        if report["rendered"]:
+            source = "rendered pages"
+        else:
+            source = f"pages prepared with threshold {report['threshold']}"
+        lines = [
+            f"{report['pages']} {source}",
+            f"{'format':<8} {'encode ms':>10} {'decode ms':>10} "
+            f"{'KB/page':>9} {'lossless':>9}",
+        ]
+        for name, values in report["formats"].items():
+            lines.append(
+                f"{name:<8} {values['encode_ms']:>10.1f} {values['decode_ms']:>10.1f} "
+                f"{values['bytes_per_page'] / 1024:>9.1f} {str(values['lossless']):>9}"
+            )
+        return lines
+
+    def _measure(
+        self, output_dir: Path, image_format: ImageFormat, images: list[np.ndarray]
+    ) -> dict:
+        encode_seconds = 0.0
+        decode_seconds = 0.0
+        total_bytes = 0
+        lossless = True
+        for index, image in enumerate(images):
+            path = output_dir / f"{index:06}{image_format.suffix}"
+
+            start = time.perf_counter()
+            image_format.save(Image.fromarray(image), path)
+            encode_seconds += time.perf_counter() - start
+
+            # the OCR reads the images as RGB
+            start = time.perf_counter()
+            with Image.open(path) as img:
+                decoded = np.asarray(img.convert("RGB"))
+            decode_seconds += time.perf_counter() - start
+
+            total_bytes += path.stat().st_size
+            if image.dtype == bool:
+                expected = np.where(image, np.uint8(255), np.uint8(0))
+            else:
+                expected = image
+            lossless = lossless and np.array_equal(decoded[:, :, 0], expected)
+
+        count = len(images)
+        return {
+            "encode_ms": round(encode_seconds / count * 1000, 3),
+            "decode_ms": round(decode_seconds / count * 1000, 3),
+            "bytes": total_bytes,
+            "bytes_per_page": round(total_bytes / count),
+            "lossless": lossless,
+        }
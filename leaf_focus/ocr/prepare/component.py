@@ -1,43 +1,120 @@
 from logging import Logger
 from pathlib import Path
+from typing import Optional
+
+import numpy as np
 from PIL import Image
 
+from leaf_focus.pdf.images.image_format import ImageFormat
+
 
 class Component:
     """Create the image file ready for OCR."""
 
-    def __init__(self, logger: Logger):
+    def __init__(self, logger: Logger, image_format: Optional[ImageFormat] = None):
         self._logger = logger
+        self._image_format = image_format or ImageFormat()
 
     def threshold(self, input_file: Path, output_file: Path, threshold: int) -> None:
         """Create the threshold image file."""
+        if not output_file:
+            raise ValueError("Must supply output file.")
+        self.threshold_many(input_file, {threshold: output_file})
+
+    def threshold_many(self, input_file: Path, output_files: dict[int, Path]) -> int:
+        """
+        Create a threshold image file for each threshold,
+        reading the input image only once.
+        Returns the number of image files created.
+        """
 
         if not input_file:
             raise ValueError("Must supply input file.")
-        if not output_file:
-            raise ValueError("Must supply output file.")
+        if not output_files:
+            raise ValueError("Must supply output files.")
         if not input_file.exists():
             raise FileNotFoundError(f"Input file does not exist '{input_file}'.")
-        if threshold < 0 or threshold > 255:
-            raise ValueError(f"Threshold must between 0 and 255, not {threshold}.")
+        for threshold, output_file in output_files.items():
+            if not output_file:
+                raise ValueError("Must supply output file.")
+            if threshold < 0 or threshold > 255:
+                raise ValueError(f"Threshold must between 0 and 255, not {threshold}.")
+
+        pending = {}
+        for threshold, output_file in sorted(output_files.items()):
+            if output_file.exists():
+                self._logger.debug(
+                    "Prepared image already exists for "
+                    f"'{input_file.parts[-2]}' '{input_file.name}' "
+                    f"threshold {threshold}."
+                )
+            else:
+                pending[threshold] = output_file
 
-        if output_file.exists():
-            self._logger.debug(
-                "Prepared image already exists for "
-                f"'{input_file.parts[-2]}' '{input_file.name}'."
-            )
-            return
+        if not pending:
+            return 0
 
         self._logger.info(
-            "Creating threshold image for "
+            f"Creating {len(pending)} threshold images for "
             f"'{input_file.parts[-2]}' '{input_file.name}'."
         )
 
-        img = Image.open(input_file)
+        greyscale = self.read_greyscale(input_file)
+        for threshold, output_file in pending.items():
+            self.save(self.binarise(greyscale, threshold), output_file)
+
+        return len(pending)
+
+    def prepare_image(
+        self, input_file: Path, threshold: int, output_file: Optional[Path] = None
+    ) -> np.ndarray:
+        """
+        Create the threshold image in memory, as an RGB array ready for the OCR.
+        The threshold image file is also saved, if an output file is given.
+        """
+        if not input_file:
+            raise ValueError("Must supply input file.")
+        if not input_file.exists():
+            raise FileNotFoundError(f"Input file does not exist '{input_file}'.")
+        if threshold < 0 or threshold > 255:
+            raise ValueError(f"Threshold must between 0 and 255, not {threshold}.")
+
+        return self.prepare_array(
+            self.read_greyscale(input_file), threshold, output_file
+        )
+
+    def prepare_array(
+        self,
+        greyscale: np.ndarray,
+        threshold: int,
+        output_file: Optional[Path] = None,
+    ) -> np.ndarray:
+        """Create the threshold image for a greyscale array that is already read."""
+        if threshold < 0 or threshold > 255:
+            raise ValueError(f"Threshold must between 0 and 255, not {threshold}.")
+
+        binary = self.binarise(greyscale, threshold)
+        if output_file and not output_file.exists():
+            self.save(binary, output_file)
+
+        # the same array as reading the saved threshold image as RGB
+        rgb = np.where(binary, np.uint8(255), np.uint8(0))
+        return np.repeat(rgb[:, :, np.newaxis], 3, axis=2)
+
+    def save(self, binary: np.ndarray, output_file: Path) -> None:
+        """
+        Save a threshold image using the image format,
+        or the format that matches the output file suffix.
+        """
+        image_format = self._image_format.for_file(output_file)
+        image_format.save(Image.fromarray(binary), output_file)
 
-        def calc_threshold(value):
-            return 255 if value > threshold else 0
+    def read_greyscale(self, input_file: Path) -> np.ndarray:
+        """Read an image file into a greyscale array."""
+        with Image.open(input_file) as img:
+            return np.asarray(img.convert("L"))
 
-        img_greyscale = img.convert("L")  # type: Image
-        img_threshold = img_greyscale.point(calc_threshold, mode="1")  # type: Image
-        img_threshold.save(output_file)
+    @classmethod
+    def binarise(cls, greyscale: np.ndarray, threshold: int) -> np.ndarray:
+        """Pixels lighter than the threshold are white (True), the rest are black."""
+        return greyscale > threshold
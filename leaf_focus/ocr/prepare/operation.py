@@ -1,28 +1,65 @@
 from logging import Logger
 from pathlib import Path
+from typing import Optional
 
+from leaf_focus.ocr.plan.operation import Operation as PlanOperation
 from leaf_focus.ocr.prepare.component import Component
+from leaf_focus.ocr.threshold.operation import Operation as ThresholdOperation
+from leaf_focus.pdf.images.image_format import ImageFormat
 from leaf_focus.support.location import Location
 
 
 class Operation:
-    def __init__(self, logger: Logger, base_path: Path):
+    def __init__(
+        self,
+        logger: Logger,
+        base_path: Path,
+        image_format: Optional[ImageFormat] = None,
+    ):
         self._logger = logger
         self._base_path = base_path
-        self._location = Location(logger)
-        self._component = Component(logger)
+        self._location = Location(logger, image_format)
+        self._component = Component(logger, image_format)
+        self._plan = PlanOperation(logger, base_path)
+        self._thresholds = ThresholdOperation(logger, base_path)
 
     def run(self, file_hash: str, page: int, threshold: int):
+        """
+        Create the prepared image for a page.
+        The threshold chosen for the pdf is used instead, if there is one.
+        """
+
+        # use the threshold chosen for the pdf, if there is one
+        threshold = self._thresholds.threshold(file_hash, threshold)
+
+        output_files = self.run_thresholds(file_hash, page, [threshold])
+        return output_files[0] if output_files else None
+
+    def run_thresholds(
+        self, file_hash: str, page: int, thresholds: list[int]
+    ) -> list[Path]:
+        """
+        Create the prepared image for a page for each threshold,
+        reading the page image only once.
+        """
+
+        # skip pages that have a usable embedded text layer
+        if not self._plan.needs_ocr(file_hash, page):
+            self._logger.debug(f"Page {page} of '{file_hash[0:15]}' does not need OCR.")
+            return []
 
         # create output directory
         loc = self._location
         bd = self._base_path
         input_file = loc.pdf_page_image_file(bd, file_hash, page)
-        output_file = loc.pdf_page_prepared_file(bd, file_hash, page, threshold)
-        loc.create_directory(output_file.parent)
+        output_files = {
+            threshold: loc.pdf_page_prepared_file(bd, file_hash, page, threshold)
+            for threshold in thresholds
+        }
+        loc.create_directory(loc.store_dir(bd, file_hash))
 
-        # create the image file
-        self._component.threshold(input_file, output_file, threshold)
+        # create the image files
+        self._component.threshold_many(input_file, output_files)
 
         # result
-        return output_file
+        return [output_files[threshold] for threshold in thresholds]
@@ -1,21 +1,41 @@
 from pathlib import Path
+from typing import Optional
 
 from prefect import Task
+from prefect.engine import signals
 
 from leaf_focus.ocr.prepare.operation import Operation
+from leaf_focus.pdf.images.image_format import ImageFormat
 
 
 class OcrPrepareTask(Task):
     """A Prefect task to run the ocr prepare operation."""
 
-    def __init__(self, base_path: Path, **kwargs):
+    def __init__(
+        self, base_path: Path, image_format: Optional[ImageFormat] = None, **kwargs
+    ):
         kwargs = {**kwargs, "name": "ocr.prepare"}
         super().__init__(**kwargs)
-        self._operation = Operation(self.logger, base_path)
+        self._operation = Operation(self.logger, base_path, image_format)
 
     # noinspection PyMethodOverriding
-    def run(self, input_item: tuple[str, int], threshold: int) -> tuple[str, int]:
-        """Run the task."""
+    def run(
+        self,
+        input_item: tuple[str, int],
+        threshold: int,
+        thresholds: Optional[list[int]] = None,
+    ) -> tuple[str, int]:
+        """
+        Run the task.
+        When thresholds are given, an image is prepared for each of them
+        instead of the one threshold.
+        """
         file_hash, page = input_item
-        self._operation.run(file_hash, page, threshold)
+        if thresholds:
+            output_files = self._operation.run_thresholds(file_hash, page, thresholds)
+        else:
+            output_files = [self._operation.run(file_hash, page, threshold)]
+        if not any(output_files):
+            # the OCR of this page is skipped as well
+            raise signals.SKIP(f"Page {page} of '{file_hash}' does not need OCR.")
         return file_hash, page
@@ -0,0 +1,145 @@
+import platform
+import random
+import sys
+import tempfile
+import time
+from importlib import metadata
+from logging import Logger
+from pathlib import Path
+from typing import Optional
+
+from leaf_focus.ocr.recognise.component import Component
+from leaf_focus.ocr.recognise.phase_timer import PhaseTimer
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Get the peak resident memory of this process in MB, if it is available."""
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # the peak is in bytes on macOS and in kilobytes on linux
+    if sys.platform == "darwin":
+        return round(peak / 1024 / 1024, 1)
+    return round(peak / 1024, 1)
+
+
+class Bench:
+    """Measure the speed of each phase of the OCR for a sample of pages."""
+
+    phases = [
+        "read",
+        "content",
+        "resize",
+        "detect",
+        "recognise",
+        "order",
+        "annotate",
+        "save",
+    ]
+    """The OCR phases in the order they run."""
+
+    packages = ["tensorflow", "keras-ocr", "numpy", "pillow"]
+    """The packages that affect the speed of the OCR."""
+
+    def __init__(self, logger: Logger, component: Component, timer: PhaseTimer):
+        self._logger = logger
+        self._component = component
+        self._timer = timer
+
+    def sample(
+        self, pages: list[tuple[str, int, int]], count: int, seed: int = 0
+    ) -> list[tuple[str, int, int]]:
+        """Choose the same random sample of pages each time for the same seed."""
+        if count < 1:
+            raise ValueError(f"Sample size must be 1 or more, not {count}.")
+        pages = sorted(pages)
+        if count >= len(pages):
+            return pages
+        return sorted(random.Random(seed).sample(pages, count))
+
+    def run(self, image_files: list[Path], batch_size: int = 1) -> dict:
+        """
+        Recognise the text in the images and measure the time of each phase.
+        The output is saved to a temporary directory, so existing output is kept.
+        The first image is recognised once before measuring,
+        so the time to load the model is measured separately.
+        """
+        if not image_files:
+            raise ValueError("Must supply image files.")
+
+        timer = self._timer
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_dir = Path(temp_dir)
+
+            start = time.perf_counter()
+            self._component.recognise_many(
+                self._jobs(output_dir / "warmup", image_files[0:1]), batch_size
+            )
+            warmup_seconds = time.perf_counter() - start
+            timer.reset()
+
+            start = time.perf_counter()
+            count = self._component.recognise_many(
+                self._jobs(output_dir / "bench", image_files), batch_size
+            )
+            seconds = time.perf_counter() - start
+
+        summary = timer.summary()
+        return {
+            "pages": count,
+            "batch_size": batch_size,
+            "seconds": round(seconds, 4),
+            "pages_per_second": round(count / seconds, 4) if seconds > 0 else None,
+            "warmup_seconds": round(warmup_seconds, 4),
+            "peak_rss_mb": peak_rss_mb(),
+            "phases": {name: summary[name] for name in self.phases if name in summary},
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "packages": self.package_versions(),
+        }
+
+    def package_versions(self) -> dict[str, Optional[str]]:
+        result = {}
+        for name in self.packages:
+            try:
+                result[name] = metadata.version(name)
+            except metadata.PackageNotFoundError:
+                result[name] = None
+        return result
+
+    def table(self, report: dict) -> list[str]:
+        """Format the benchmark report as a table."""
+        lines = [
+            f"{report['pages']} pages in {report['seconds']:.2f} s "
+            f"({report['pages_per_second']} pages/s), "
+            f"batch size {report['batch_size']}, "
+            f"warm up {report['warmup_seconds']:.2f} s, "
+            f"peak memory {report['peak_rss_mb']} MB",
+            f"{'phase':<10} {'count':>6} {'total s':>9} {'p50 ms':>9} {'p95 ms':>9}",
+        ]
+        for name, values in report["phases"].items():
+            lines.append(
+                f"{name:<10} {values['count']:>6} {values['total']:>9.3f} "
+                f"{values['p50'] * 1000:>9.1f} {values['p95'] * 1000:>9.1f}"
+            )
+        return lines
+
+    def _jobs(
+        self, output_dir: Path, image_files: list[Path]
+    ) -> list[tuple[Path, Path, Path]]:
+        output_dir.mkdir(parents=True, exist_ok=True)
+        jobs = []
+        for index, image_file in enumerate(image_files):
+            name = f"{index:06}-{image_file.stem}"
+            jobs.append(
+                (
+                    image_file,
+                    output_dir / f"{name}-ocr.png",
+                    output_dir / f"{name}-text.csv",
+                )
+            )
+        return jobs
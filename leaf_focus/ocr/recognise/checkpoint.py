@@ -0,0 +1,94 @@
+import json
+import threading
+from logging import Logger
+from pathlib import Path
+from typing import Iterable, Optional
+
+
+class Checkpoint:
+    """
+    Save the OCR work list and the finished pages,
+    so an interrupted run can continue without finding the pages again.
+    The first line is the work list and the options used to find it,
+    and each following line is a finished page.
+    """
+
+    def __init__(self, logger: Logger, path: Path):
+        if not path:
+            raise ValueError("Must supply checkpoint file.")
+
+        self._logger = logger
+        self._path = path
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def exists(self) -> bool:
+        return self._path.exists()
+
+    def start(
+        self,
+        pending: list[tuple[str, int, int]],
+        done_count: int,
+        options: Optional[dict] = None,
+    ) -> None:
+        """Save a new work list, and the options used to find the pages."""
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock, open(self._path, "wt", encoding="utf8") as f:
+            data = {
+                "pending": [list(item) for item in pending],
+                "done": done_count,
+                "options": options or {},
+            }
+            f.write(json.dumps(data) + "\n")
+
+        self._logger.debug(
+            f"Saved OCR checkpoint with {len(pending)} pending pages to '{self._path}'."
+        )
+
+    def options(self) -> dict:
+        """Get the options used to find the pages in the work list."""
+        with open(self._path, "rt", encoding="utf8") as f:
+            header = json.loads(f.readline())
+        return header.get("options", {})
+
+    def load(self) -> tuple[list[tuple[str, int, int]], int]:
+        """
+        Load the pages in the work list that are not finished.
+        Returns the pending (file hash, page, threshold) and the number of done pages.
+        """
+        with open(self._path, "rt", encoding="utf8") as f:
+            header = json.loads(f.readline())
+            finished = set()
+            for line in f:
+                # the last line might be incomplete if the run was interrupted
+                try:
+                    finished.add(tuple(json.loads(line)))
+                except ValueError:
+                    continue
+
+        pending = [tuple(item) for item in header["pending"]]
+        remaining = [item for item in pending if item not in finished]
+        done_count = header["done"] + len(pending) - len(remaining)
+
+        self._logger.debug(
+            f"Loaded OCR checkpoint with {len(remaining)} pending pages "
+            f"from '{self._path}'."
+        )
+        return remaining, done_count
+
+    def mark_done(self, items: Iterable[tuple[str, int, int]]) -> None:
+        """Record finished pages. This can be called from any thread."""
+        lines = [json.dumps(list(item)) + "\n" for item in items]
+        if not lines:
+            return
+        with self._lock, open(self._path, "at", encoding="utf8") as f:
+            f.writelines(lines)
+
+    def finish(self) -> None:
+        """Remove the checkpoint once all the pages are finished."""
+        with self._lock:
+            if self._path.exists():
+                self._path.unlink()
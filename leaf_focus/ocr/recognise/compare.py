@@ -0,0 +1,137 @@
+import csv
+import difflib
+import time
+from collections import Counter
+from dataclasses import dataclass, asdict, fields
+from logging import Logger
+from pathlib import Path
+
+from leaf_focus.ocr.recognise.component import Component
+from leaf_focus.ocr.recognise.page_items import PageItems
+
+
+@dataclass
+class BackendResult:
+    """The accuracy and speed of an OCR backend for one image."""
+
+    backend: str
+    image: str
+    seconds: float
+    words: int
+    word_match: float
+    """The fraction of the reference words that were also recognised."""
+    text_similarity: float
+    """The similarity of the page text to the reference page text, from 0 to 1."""
+
+
+class BackendComparison:
+    """Compare the accuracy and speed of OCR backends."""
+
+    def __init__(self, logger: Logger):
+        self._logger = logger
+
+    def run(
+        self, image_files: list[Path], backends: dict[str, Component]
+    ) -> list[BackendResult]:
+        """
+        Recognise the text in each image using each backend.
+        The first backend is the reference for the accuracy.
+        """
+        if not image_files:
+            raise ValueError("Must supply image files.")
+        if not backends:
+            raise ValueError("Must supply backends.")
+
+        results = []
+        reference = {}
+        for name, component in backends.items():
+            is_reference = not reference
+
+            # load the models before measuring the time
+            self._logger.info(f"Loading the OCR backend '{name}'.")
+            component.predict(image_files[0:1])
+
+            for image_file in image_files:
+                start = time.perf_counter()
+                items = component.predict([image_file])[0]
+                seconds = time.perf_counter() - start
+
+                if is_reference:
+                    reference[image_file] = items
+                word_match, text_similarity = self.score(reference[image_file], items)
+                results.append(
+                    BackendResult(
+                        backend=name,
+                        image=image_file.name,
+                        seconds=round(seconds, 4),
+                        words=len(items),
+                        word_match=round(word_match, 4),
+                        text_similarity=round(text_similarity, 4),
+                    )
+                )
+                self._logger.info(
+                    f"Backend '{name}' recognised {len(items)} words "
+                    f"in '{image_file.name}' in {seconds:.2f} seconds."
+                )
+
+        return results
+
+    def score(self, reference: PageItems, items: PageItems) -> tuple[float, float]:
+        """Calculate the word match and the text similarity to the reference."""
+        reference_words = Counter(reference.text)
+        words = Counter(items.text)
+        reference_count = sum(reference_words.values())
+        if reference_count > 0:
+            word_match = sum((reference_words & words).values()) / reference_count
+        else:
+            word_match = 1.0 if len(items) < 1 else 0.0
+
+        matcher = difflib.SequenceMatcher(
+            None, self.page_text(reference), self.page_text(items), autojunk=False
+        )
+        return word_match, matcher.ratio()
+
+    def page_text(self, items: PageItems) -> str:
+        """Get the text of a page, one line of text per line."""
+        lines = [
+            " ".join([item.text for item in items.line(line_num)])
+            for line_num in range(1, items.line_count() + 1)
+        ]
+        return "\n".join(lines)
+
+    def summary(self, results: list[BackendResult]) -> list[dict]:
+        """Calculate the average results for each backend."""
+        backends = {}
+        for result in results:
+            backends.setdefault(result.backend, []).append(result)
+
+        summaries = []
+        reference_seconds = None
+        for name, items in backends.items():
+            seconds = sum([i.seconds for i in items]) / len(items)
+            if reference_seconds is None:
+                reference_seconds = seconds
+            summaries.append(
+                {
+                    "backend": name,
+                    "images": len(items),
+                    "seconds": round(seconds, 4),
+                    "speedup": round(reference_seconds / seconds, 2)
+                    if seconds > 0
+                    else None,
+                    "word_match": round(
+                        sum([i.word_match for i in items]) / len(items), 4
+                    ),
+                    "text_similarity": round(
+                        sum([i.text_similarity for i in items]) / len(items), 4
+                    ),
+                }
+            )
+        return summaries
+
+    def save(self, path: Path, results: list[BackendResult]) -> None:
+        """Save the results to a csv file."""
+        with open(path, "wt", newline="", encoding="utf8") as f:
+            writer = csv.DictWriter(f, [i.name for i in fields(BackendResult)])
+            writer.writeheader()
+            writer.writerows([asdict(r) for r in results])
@@ -1,24 +1,118 @@
 import os
+from concurrent.futures import Executor
+from contextlib import nullcontext
 from logging import Logger
 from pathlib import Path
-from typing import Any, Optional, Iterable
+from typing import Any, Callable, Optional, Iterable
 
 import numpy as np
+from PIL import Image
 
-from leaf_focus.ocr.recognise.item import Item as TextItem
+from leaf_focus.ocr.annotate.component import Component as AnnotateComponent
+from leaf_focus.ocr.recognise.content_area import ContentArea
+from leaf_focus.ocr.recognise.detection_cache import DetectionCache
+from leaf_focus.ocr.recognise.io_pipeline import IoPipeline
+from leaf_focus.ocr.recognise.line_order import LineOrder
+from leaf_focus.ocr.recognise.model_store import ModelStore
+from leaf_focus.ocr.recognise.page_items import PageItems
+from leaf_focus.ocr.recognise.phase_timer import PhaseTimer
+from leaf_focus.ocr.recognise.result_cache import ResultCache
+from leaf_focus.ocr.recognise.tflite_backend import TflitePipeline
 
 
 class Component:
     """Run image OCR and save the output."""
 
-    def __init__(self, logger: Logger):
+    detection_scale = 2
+    """The most the images are scaled up before finding the text boxes."""
+
+    detection_max_size = 2048
+    """The largest side of an image after scaling."""
+
+    def __init__(
+        self,
+        logger: Logger,
+        intra_op_threads: Optional[int] = None,
+        inter_op_threads: Optional[int] = None,
+        annotate: bool = False,
+        detection_cache: Optional[DetectionCache] = None,
+        result_cache: Optional[ResultCache] = None,
+        detection_resolution: Optional[float] = None,
+        content_area: Optional[ContentArea] = None,
+        backend: Optional[TflitePipeline] = None,
+        model_store: Optional[ModelStore] = None,
+        timer: Optional[PhaseTimer] = None,
+        io_pipeline: Optional[IoPipeline] = None,
+    ):
         self._logger = logger
         self._pipeline = None
 
+        if detection_resolution is not None and not 0 < detection_resolution <= 1:
+            raise ValueError(
+                "Detection resolution must be more than 0 and at most 1, "
+                f"not {detection_resolution}."
+            )
+
+        # the text boxes can be found using a smaller copy of each image,
+        # while the text is still recognised using the full size image
+        self._detection_resolution = detection_resolution
+
+        # blank pages can be skipped and the margins cropped before the OCR
+        self._content_area = content_area
+
+        # the OCR models can be run using another backend,
+        # instead of the keras-ocr pipeline
+        self._backend = backend
+
+        # the model weights can be loaded from a local store,
+        # instead of being downloaded by keras-ocr
+        self._model_store = model_store
+
+        # the time taken by each phase of the OCR can be measured
+        self._timer = timer
+
+        # the images can be read and the output written in other threads,
+        # while the OCR model runs in this thread
+        self._io_pipeline = io_pipeline
+
+        # the text boxes found by the detector can be cached,
+        # so the recognition can be run again without the detection
+        self._detection_cache = detection_cache
+
+        # pages with the same image content can use the same predictions
+        self._result_cache = result_cache
+
+        # only create the annotation images when requested
+        # they can also be created later using the annotate component
+        self._annotate = annotate
+
+        # the number of threads tensorflow uses within and between operations
+        # None uses the tensorflow default, which is based on the number of cores
+        self._intra_op_threads = intra_op_threads
+        self._inter_op_threads = inter_op_threads
+
+    @property
+    def pipeline(self):
+        """
+        The keras-ocr pipeline.
+        The model is only loaded when the first image needs OCR,
+        as importing tensorflow and building the model takes a while.
+        """
         self._construct_pipeline()
+        return self._pipeline
+
+    def has_output(
+        self, annotation_file: Optional[Path], predictions_file: Path
+    ) -> bool:
+        """Check if the OCR output already exists."""
+        if self._annotate and not annotation_file.exists():
+            return False
+        return predictions_file.exists()
 
     def _construct_pipeline(self):
         if self._pipeline is None:
+            self._log_debug("Loading the OCR model.")
+
             # set TF_CPP_MIN_LOG_LEVEL before importing tensorflow
             os.environ["TF_CPP_MIN_LOG_LEVEL"] = "2"
 
@@ -26,58 +120,455 @@ class Component:
 
             tf.get_logger().setLevel("WARNING")
 
+            # the thread pools must be set before tensorflow runs any operations
+            if self._intra_op_threads:
+                tf.config.threading.set_intra_op_parallelism_threads(
+                    self._intra_op_threads
+                )
+            if self._inter_op_threads:
+                tf.config.threading.set_inter_op_parallelism_threads(
+                    self._inter_op_threads
+                )
+
+            if self._backend is not None:
+                self._pipeline = self._backend
+                return
+
+            store = self._model_store
+            if store and store.has_weights():
+                self._log_debug(f"Loading the OCR model from '{store.models_dir}'.")
+                self._pipeline = store.load_pipeline(
+                    self.detection_scale, self.detection_max_size
+                )
+                return
+
             import keras_ocr
 
             # see: https://github.com/faustomorales/keras-ocr
             # keras-ocr will automatically download pretrained
             # weights for the detector and recognizer.
-            self._pipeline = keras_ocr.pipeline.Pipeline()
+            self._pipeline = keras_ocr.pipeline.Pipeline(
+                scale=self.detection_scale, max_size=self.detection_max_size
+            )
+
+    @property
+    def detection_settings(self) -> str:
+        """The detector settings that affect the detected text boxes."""
+        result = f"scale={self.detection_scale},max_size={self.detection_max_size}"
+        if self._detection_resolution:
+            result += f",resolution={self._detection_resolution}"
+        if self._backend is not None:
+            result += f",backend={self._backend.name}"
+        if self._content_area:
+            result += f",{self._content_area.settings}"
+        return result
+
+    def has_detection(self, image_file: Path) -> bool:
+        """Check if the text boxes for an image are in the detection cache."""
+        cache = self._detection_cache
+        if not cache or not image_file.exists():
+            return False
+        image_hash = cache.image_hash(image_file)
+        return cache.load(image_hash, self.detection_settings) is not None
 
     def recognise_text(
         self,
         image_file: Path,
-        annotation_file: Path,
+        annotation_file: Optional[Path],
         predictions_file: Path,
     ) -> None:
-        """Recognise the text in an image and save the text and image annotations."""
+        """
+        Recognise the text in an image and save the text.
+        The image annotations are only saved if annotate is enabled.
+        """
 
         if not image_file:
             raise ValueError("Must supply image file.")
-        if not annotation_file:
+        if self._annotate and not annotation_file:
             raise ValueError("Must supply annotation file.")
         if not predictions_file:
             raise ValueError("Must supply predictions file.")
         if not image_file.exists():
             raise FileNotFoundError(f"Image file does not exist '{image_file}'.")
 
-        if annotation_file.exists() and predictions_file.exists():
+        if self.has_output(annotation_file, predictions_file):
             self._log_debug(f"OCR output already exists for '{image_file}'.")
             return
 
-        self._log_info(f"Running OCR on '{image_file}'.")
+        jobs = self.restore_results([(image_file, annotation_file, predictions_file)])
+        if jobs:
+            self._recognise_batch(jobs)
+
+    def recognise_many(
+        self,
+        jobs: Iterable[tuple[Path, Path, Path]],
+        batch_size: int = 4,
+        recognise_only: bool = False,
+        on_done: Optional[Callable[[list[tuple[Path, Path, Path]]], None]] = None,
+        read_image: Optional[Callable[[tuple[Path, Path, Path]], np.ndarray]] = None,
+        replace: bool = False,
+    ) -> int:
+        """
+        Recognise the text in many images, running the OCR in batches.
+        Each job is (image file, annotation file, predictions file).
+        When recognise only is set, only the images with cached text boxes
+        are recognised again, even if they already have output.
+        When replace is set, the images that already have output
+        are recognised again and the output is replaced.
+        The on done function is given the jobs as they are finished,
+        including the jobs that already had output.
+        The read image function can create the image for a job in memory,
+        in which case the image file does not need to exist.
+        Returns the number of images that were recognised,
+        not including the images that used the result cache.
+        """
+
+        def done(finished: list[tuple[Path, Path, Path]]) -> None:
+            if on_done and finished:
+                on_done(finished)
+
+        if batch_size < 1:
+            raise ValueError(f"Batch size must be 1 or more, not {batch_size}.")
+
+        # skip the images that already have output before batching
+        pending = []
+        existing = []
+        for image_file, annotation_file, predictions_file in jobs:
+            if not image_file:
+                raise ValueError("Must supply image file.")
+            if self._annotate and not annotation_file:
+                raise ValueError("Must supply annotation file.")
+            if not predictions_file:
+                raise ValueError("Must supply predictions file.")
+            if not read_image and not image_file.exists():
+                raise FileNotFoundError(f"Image file does not exist '{image_file}'.")
+
+            if recognise_only:
+                if not self.has_detection(image_file):
+                    self._log_debug(f"No cached text boxes for '{image_file}'.")
+                    continue
+            elif not replace and self.has_output(annotation_file, predictions_file):
+                self._log_debug(f"OCR output already exists for '{image_file}'.")
+                existing.append((image_file, annotation_file, predictions_file))
+                continue
+
+            pending.append((image_file, annotation_file, predictions_file))
+
+        done(existing)
+
+        if not recognise_only:
+            remaining = self.restore_results(pending)
+            not_restored = set(remaining)
+            done([job for job in pending if job not in not_restored])
+            pending = remaining
+
+        # the images that used the result cache were not recognised
+        count = len(pending)
+
+        self._log_info(
+            f"Running OCR on {len(pending)} images in batches of {batch_size}."
+        )
+
+        batches = []
+        for start in range(0, len(pending), batch_size):
+            end = start + batch_size
+            batches.append(pending[start:end])
+
+        def write(outputs):
+            self._write_batch(outputs, recognise_only)
+            done([job for job, _, _ in outputs])
+
+        def read(batch, executor: Optional[Executor] = None):
+            return self._read_batch(batch, executor, read_image)
+
+        if self._io_pipeline and batches:
+            self._io_pipeline.run(batches, read, self._run_batch, write)
+        else:
+            for batch in batches:
+                write(self._run_batch(read(batch)))
+
+        return count
+
+    def restore_results(
+        self, jobs: list[tuple[Path, Path, Path]]
+    ) -> list[tuple[Path, Path, Path]]:
+        """
+        Use the cached predictions for the images that have already been recognised.
+        Images that are only in memory do not use the cache.
+        Returns the jobs that still need OCR.
+        """
+        cache = self._result_cache
+        if not cache:
+            return jobs
+
+        remaining = []
+        for image_file, annotation_file, predictions_file in jobs:
+            if not image_file.exists():
+                remaining.append((image_file, annotation_file, predictions_file))
+                continue
+
+            image_hash = cache.image_hash(image_file)
+            if not cache.restore(image_hash, predictions_file, self.detection_settings):
+                remaining.append((image_file, annotation_file, predictions_file))
+                continue
+
+            if self._annotate:
+                annotate = AnnotateComponent(self._logger)
+                annotate.annotate(image_file, predictions_file, annotation_file)
 
-        # read in the image
+        return remaining
+
+    def _recognise_batch(
+        self, jobs: list[tuple[Path, Path, Path]], replace_cached: bool = False
+    ) -> None:
+        """Run one OCR call for a batch of images and save the output for each."""
+        outputs = self._run_batch(self._read_batch(jobs))
+        self._write_batch(outputs, replace_cached)
+
+    def _read_batch(
+        self,
+        jobs: list[tuple[Path, Path, Path]],
+        executor: Optional[Executor] = None,
+        read_image: Optional[Callable[[tuple[Path, Path, Path]], np.ndarray]] = None,
+    ) -> tuple[list[tuple[Path, Path, Path]], list[np.ndarray], list]:
+        """
+        Read in the images and find the content area of each image.
+        The images are read using the executor, if there is one,
+        and created using the read image function, if there is one.
+        """
+
+        def read(job: tuple[Path, Path, Path]) -> np.ndarray:
+            if read_image:
+                return read_image(job)
+
+            import keras_ocr
+
+            return keras_ocr.tools.read(str(job[0]))
+
+        with self._phase("read"):
+            images = list(executor.map(read, jobs) if executor else map(read, jobs))
+
+        with self._phase("content"):
+            areas = [self._find_content(image) for image in images]
+
+        return jobs, images, areas
+
+    def _run_batch(
+        self, batch: tuple[list[tuple[Path, Path, Path]], list[np.ndarray], list]
+    ) -> list[tuple[tuple[Path, Path, Path], np.ndarray, PageItems]]:
+        """Run the OCR on a batch of images that have been read."""
+        jobs, images, areas = batch
+
+        for image_file, _, _ in jobs:
+            self._log_info(f"Running OCR on '{image_file}'.")
+
+        # blank pages have no text, so they have empty predictions without OCR
+        outputs = []
+        pending = []
+        for job, image, area in zip(jobs, images, areas):
+            if area is None:
+                self._log_info(f"Skipping blank page '{job[0]}'.")
+                outputs.append((job, image, PageItems.empty()))
+            else:
+                outputs.append(None)
+                pending.append((job, image, area))
+
+        if pending:
+            recognised = iter(self._recognise_areas(pending))
+            outputs = [output or next(recognised) for output in outputs]
+
+        return outputs
+
+    def _write_batch(
+        self,
+        outputs: list[tuple[tuple[Path, Path, Path], np.ndarray, PageItems]],
+        replace_cached: bool = False,
+    ) -> None:
+        """Save the output for a batch of images."""
+        for job, image, items in outputs:
+            self._save_output(job, image, items)
+
+        if self._result_cache:
+            for image_file, _, predictions_file in [job for job, _, _ in outputs]:
+                if not image_file.exists():
+                    continue
+                image_hash = self._result_cache.image_hash(image_file)
+                self._result_cache.store(
+                    image_hash,
+                    predictions_file,
+                    replace_cached,
+                    settings=self.detection_settings,
+                )
+
+    def predict(self, image_files: list[Path]) -> list[PageItems]:
+        """
+        Recognise the text in images, without saving the output.
+        The text is arranged into lines.
+        """
         import keras_ocr
 
-        images = [
-            keras_ocr.tools.read(str(image_file)),
+        resized = [
+            self._resize(keras_ocr.tools.read(str(image_file)))
+            for image_file in image_files
+        ]
+        box_groups = self.detect(
+            image_files, [self._resize_for_detection(r) for r in resized]
+        )
+        prediction_groups = self.recognise_boxes(resized, box_groups)
+        return [
+            self.order_text_lines(self.convert_predictions(predictions))
+            for predictions in prediction_groups
         ]
 
+    def _recognise_areas(
+        self, pending: list[tuple[tuple[Path, Path, Path], np.ndarray, tuple]]
+    ) -> list[tuple[tuple[Path, Path, Path], np.ndarray, PageItems]]:
+        """Run the OCR on the content area of each image."""
+
+        # the OCR only sees the content area, so the boxes are
+        # moved by the offset of the area to get the page coordinates
+        image_files = [job[0] for job, _, _ in pending]
+        offsets = [(left, top) for _, _, (left, top, _, _) in pending]
+        crops = [
+            image[top:bottom, left:right]
+            for _, image, (left, top, right, bottom) in pending
+        ]
+        with self._phase("resize"):
+            resized = [self._resize(crop) for crop in crops]
+            detection_images = [self._resize_for_detection(r) for r in resized]
+
         # Each list of predictions in prediction_groups is a list of
         # (word, box) tuples.
-        prediction_groups = self._pipeline.recognize(images)
+        with self._phase("detect"):
+            box_groups = self.detect(image_files, detection_images, offsets)
+        with self._phase("recognise"):
+            prediction_groups = self.recognise_boxes(resized, box_groups, offsets)
+
+        return [
+            (job, image, self.convert_predictions(predictions))
+            for (job, image, _), predictions in zip(pending, prediction_groups)
+        ]
+
+    def _save_output(
+        self, job: tuple[Path, Path, Path], image: np.ndarray, items: PageItems
+    ) -> None:
+        _, annotation_file, predictions_file = job
+        if self._annotate:
+            with self._phase("annotate"):
+                self.save_figure(annotation_file, image, items)
+        self.save_items(predictions_file, items)
+
+    def _find_content(self, image: np.ndarray) -> Optional[tuple[int, int, int, int]]:
+        """
+        Find the area of the image to run the OCR on.
+        Returns None if the image is blank.
+        """
+        if not self._content_area:
+            height, width = image.shape[:2]
+            return 0, 0, width, height
+        return self._content_area.find(image)
+
+    def detect(
+        self,
+        image_files: list[Path],
+        resized: list[tuple[np.ndarray, float]],
+        offsets: Optional[list[tuple[int, int]]] = None,
+    ) -> list[np.ndarray]:
+        """
+        Find the text boxes in each resized image.
+        Each image can be part of the original image, starting at the offset.
+        The boxes are in the coordinates of the original image.
+        Boxes from the detection cache are used when available.
+        """
+        cache = self._detection_cache
+        settings = self.detection_settings
+
+        box_groups = [None] * len(image_files)
+        image_hashes = [None] * len(image_files)
+        if cache:
+            for index, image_file in enumerate(image_files):
+                # images that are only in memory do not use the cache
+                if not image_file.exists():
+                    continue
+                image_hashes[index] = cache.image_hash(image_file)
+                box_groups[index] = cache.load(image_hashes[index], settings)
+
+        missing = [index for index, boxes in enumerate(box_groups) if boxes is None]
+        self._log_debug(
+            f"Using cached text boxes for {len(image_files) - len(missing)} images "
+            f"and detecting text boxes for {len(missing)} images."
+        )
+        if not missing:
+            return box_groups
+
+        import keras_ocr
+
+        # the detector needs all the images in a batch to be the same size
+        max_height, max_width = np.array(
+            [resized[index][0].shape[:2] for index in missing]
+        ).max(axis=0)
+        padded = np.array(
+            [
+                keras_ocr.tools.pad(
+                    resized[index][0], width=max_width, height=max_height
+                )
+                for index in missing
+            ]
+        )
+        detected = self.pipeline.detector.detect(images=padded)
+
+        for index, boxes in zip(missing, detected):
+            _, scale = resized[index]
+            boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4, 2) / scale
+            if offsets:
+                boxes = boxes + np.array(offsets[index], dtype=np.float32)
+            box_groups[index] = boxes
+            if cache and image_hashes[index]:
+                cache.save(image_hashes[index], settings, boxes)
+
+        return box_groups
+
+    def recognise_boxes(
+        self,
+        resized: list[tuple[np.ndarray, float]],
+        box_groups: list[np.ndarray],
+        offsets: Optional[list[tuple[int, int]]] = None,
+    ) -> list[list[tuple[str, np.ndarray]]]:
+        """
+        Recognise the text in each box of each resized image.
+        Each image can be part of the original image, starting at the offset.
+        Returns the (word, box) predictions in the coordinates of the original image.
+        """
+        if not offsets:
+            offsets = [(0, 0)] * len(resized)
+        scaled_groups = [
+            (boxes - np.array(offset, dtype=np.float32)) * scale
+            for boxes, (_, scale), offset in zip(box_groups, resized, offsets)
+        ]
+        word_groups = self.pipeline.recognizer.recognize_from_boxes(
+            images=[image for image, _ in resized], box_groups=scaled_groups
+        )
+        return [
+            list(zip(words, boxes)) for words, boxes in zip(word_groups, box_groups)
+        ]
+
+    def reorder_text_lines(self, predictions_file: Path) -> None:
+        """Arrange the saved predictions into lines again, without running OCR."""
+        if not predictions_file:
+            raise ValueError("Must supply predictions file.")
+        if not predictions_file.exists():
+            raise FileNotFoundError(
+                f"Predictions file does not exist '{predictions_file}'."
+            )
 
-        # Plot the predictions
-        for image, predictions in zip(images, prediction_groups):
-            self.save_figure(annotation_file, image, predictions)
-            items = self.convert_predictions(predictions)
-            self.save_items(predictions_file, items)
+        items = PageItems.load(predictions_file)
+        self.save_items(predictions_file, items)
 
     def save_figure(
         self,
         annotation_file: Path,
         image: Optional[np.ndarray],
-        predictions: list[tuple[Any, Any]],
+        items: Optional[PageItems],
     ):
         """Save the annotated image."""
 
@@ -86,84 +577,78 @@ class Component:
         if image is None or image.size < 1 or len(image.shape) != 3:
             msg_image = image.shape if image is not None else None
             raise ValueError(f"Must supply valid image data, not '{msg_image}'.")
-        if not predictions:
-            predictions = []
+        if items is None:
+            items = PageItems.empty()
 
-        self._log_info(f"Saving OCR image to '{annotation_file}'.")
+        annotate = AnnotateComponent(self._logger)
+        annotate.save(annotation_file, Image.fromarray(image), items)
 
-        import matplotlib.pyplot as plt
-
-        annotation_file.parent.mkdir(exist_ok=True, parents=True)
-
-        fig, ax = plt.subplots(figsize=(20, 20))
-        import keras_ocr
-
-        keras_ocr.tools.drawAnnotations(image=image, predictions=predictions, ax=ax)
-        fig.savefig(str(annotation_file))
-        plt.close(fig)
-
-    def convert_predictions(self, predictions: list[tuple[Any, Any]]):
+    def convert_predictions(self, predictions: list[tuple[Any, Any]]) -> PageItems:
         """Convert predictions to items."""
-        if not predictions:
-            predictions = []
-
-        for prediction in predictions:
-            yield TextItem.from_prediction(prediction)
+        return PageItems.from_predictions(predictions)
 
-    def save_items(self, items_file: Path, items: Iterable[TextItem]):
-        """Save items to csv file."""
+    def save_items(self, items_file: Path, items: PageItems):
+        """Save items to csv file and binary file."""
         if not items_file:
             raise ValueError("Must supply predictions file.")
-        if not items:
+        if items is None:
             raise ValueError("Must supply predictions data.")
 
         self._log_info(f"Saving OCR predictions to '{items_file}'.")
 
-        items_list = list(items)
+        # the predictions files might be hard links to the result cache,
+        # so replace the files instead of writing to them
+        binary_file = PageItems.binary_path(items_file)
+        for path in [items_file, binary_file]:
+            if path.exists():
+                path.unlink()
 
         # order_text_lines sets the line number and line order
-        self.order_text_lines(items_list)
-        TextItem.save(items_file, items_list)
-
-    def order_text_lines(self, items: Iterable[TextItem]):
-        """Put items into lines of text (top -> bottom, left -> right)."""
-        if not items:
-            items = []
+        with self._phase("order"):
+            self.order_text_lines(items)
 
-        self._log_debug("Arranging text into lines.")
-
-        lines = []
-        current_line = []
-        for item in items:
-            if not item.is_horizontal_level:
-                # exclude items that are too sloped
-                continue
-
-            if len(current_line) < 1:
-                current_line.append(item)
+        with self._phase("save"):
+            items.save(items_file)
 
-            elif any([item.is_same_line(i) for i in current_line]):
-                current_line.append(item)
+            # the binary file is faster to load than the csv file
+            items.save_binary(binary_file)
 
-            elif len(current_line) > 0:
-                # store current line
-                current_line = sorted(current_line, key=lambda x: x.top_left)
-                lines.append(current_line)
-
-                # create new line
-                current_line = [item]
+    def order_text_lines(self, items: PageItems) -> PageItems:
+        """Put items into lines of text (top -> bottom, left -> right)."""
+        self._log_debug("Arranging text into lines.")
 
-        # include last items
-        if len(current_line) > 0:
-            lines.append(current_line)
+        line_numbers, line_orders = LineOrder(self._logger).assemble(items.boxes)
+        items.assign_lines(line_numbers, line_orders)
+        return items
 
-        # update items to set line number and line order
-        for line_index, line in enumerate(lines):
-            for item_index, item in enumerate(line):
-                item.line_number = line_index + 1
-                item.line_order = item_index + 1
+    def _resize(self, image: np.ndarray) -> tuple[np.ndarray, float]:
+        """Scale an image the same way the keras-ocr pipeline does."""
+        import keras_ocr
 
-        return lines
+        return keras_ocr.tools.resize_image(
+            image, max_scale=self.detection_scale, max_size=self.detection_max_size
+        )
+
+    def _resize_for_detection(
+        self, resized: tuple[np.ndarray, float]
+    ) -> tuple[np.ndarray, float]:
+        """
+        Scale a resized image down to the detection resolution.
+        Returns the smaller image and its scale from the original image.
+        """
+        image, scale = resized
+        resolution = self._detection_resolution
+        if not resolution or resolution == 1:
+            return resized
+
+        height, width = image.shape[:2]
+        size = (max(1, round(width * resolution)), max(1, round(height * resolution)))
+        smaller = Image.fromarray(image).resize(size, Image.BILINEAR)
+        return np.asarray(smaller), scale * resolution
+
+    def _phase(self, name: str):
+        """Measure the time taken by a phase, if there is a timer."""
+        return self._timer.phase(name) if self._timer else nullcontext()
 
     def _build_name(self, prefix: str, middle: str, suffix: str):
         prefix = prefix.strip("-")
@@ -0,0 +1,73 @@
+from logging import Logger
+from typing import Optional
+
+import numpy as np
+
+
+class ContentArea:
+    """
+    Find the part of a prepared page image that contains ink,
+    so blank pages and empty margins do not need to go through the OCR.
+    """
+
+    min_ink_coverage = 0.002
+    """The smallest fraction of dark pixels in a page that is not blank."""
+
+    ink_level = 128
+    """Pixels darker than this level are ink."""
+
+    padding = 16
+    """The number of pixels to keep around the ink."""
+
+    def __init__(self, logger: Logger, min_ink_coverage: Optional[float] = None):
+        if min_ink_coverage is not None and not 0 <= min_ink_coverage <= 1:
+            raise ValueError(
+                "Minimum ink coverage must be between 0 and 1, "
+                f"not {min_ink_coverage}."
+            )
+
+        self._logger = logger
+        if min_ink_coverage is not None:
+            self.min_ink_coverage = min_ink_coverage
+
+    @property
+    def settings(self) -> str:
+        """The settings that change which pages are blank and how they are cropped."""
+        return (
+            f"min_ink_coverage={self.min_ink_coverage},"
+            f"ink_level={self.ink_level},"
+            f"crop_padding={self.padding}"
+        )
+
+    def ink(self, image: np.ndarray) -> np.ndarray:
+        """Get a mask of the dark pixels in an image."""
+        grey = image if image.ndim == 2 else image[..., 0]
+        return grey < self.ink_level
+
+    def find(self, image: np.ndarray) -> Optional[tuple[int, int, int, int]]:
+        """
+        Find the area of an image that contains ink,
+        as (left, top, right, bottom), where right and bottom are exclusive.
+        Returns None if the image is blank.
+        """
+        ink = self.ink(image)
+        height, width = ink.shape
+
+        # the projection profiles are the amount of ink in each row and column
+        rows = ink.sum(axis=1)
+        cols = ink.sum(axis=0)
+
+        coverage = rows.sum() / ink.size if ink.size > 0 else 0.0
+        if coverage <= 0 or coverage < self.min_ink_coverage:
+            self._logger.debug(f"Image is blank with ink coverage {coverage:.4f}.")
+            return None
+
+        ink_rows = np.flatnonzero(rows)
+        ink_cols = np.flatnonzero(cols)
+        pad = self.padding
+        return (
+            max(0, int(ink_cols[0]) - pad),
+            max(0, int(ink_rows[0]) - pad),
+            min(width, int(ink_cols[-1]) + 1 + pad),
+            min(height, int(ink_rows[-1]) + 1 + pad),
+        )
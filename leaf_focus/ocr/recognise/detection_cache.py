@@ -0,0 +1,59 @@
+from logging import Logger
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from leaf_focus.pdf.identify.component import Component as IdentifyComponent
+from leaf_focus.support.location import Location
+
+
+class DetectionCache:
+    """
+    Store the text boxes found by the OCR detector for each prepared image.
+    The boxes are stored by the hash of the image file,
+    so the detector only needs to run once for each image.
+    """
+
+    def __init__(self, logger: Logger, base_path: Path):
+        self._logger = logger
+        self._base_path = base_path
+        self._location = Location(logger)
+        self._identify = IdentifyComponent(logger)
+
+    def image_hash(self, image_file: Path) -> str:
+        """Calculate the hash of an image file."""
+        return self._identify.file_hash(image_file)
+
+    def load(self, image_hash: str, settings: str) -> Optional[np.ndarray]:
+        """
+        Load the boxes for an image, in image coordinates.
+        Returns None if the boxes are not in the cache,
+        or were found using different detector settings.
+        """
+        cache_file = self._location.ocr_detection_cache_file(
+            self._base_path, image_hash
+        )
+        if not cache_file.exists():
+            return None
+
+        with np.load(cache_file, allow_pickle=False) as data:
+            if str(data["settings"]) != settings:
+                self._logger.debug(
+                    f"Detection cache for '{image_hash}' used other settings."
+                )
+                return None
+            return data["boxes"]
+
+    def save(self, image_hash: str, settings: str, boxes: np.ndarray) -> None:
+        """Save the boxes for an image, in image coordinates."""
+        cache_file = self._location.ocr_detection_cache_file(
+            self._base_path, image_hash
+        )
+        self._location.create_directory(cache_file.parent)
+
+        boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4, 2)
+        with open(cache_file, "wb") as f:
+            np.savez(f, settings=np.array(settings), boxes=boxes)
+
+        self._logger.debug(f"Saved {len(boxes)} detected boxes to '{cache_file}'.")
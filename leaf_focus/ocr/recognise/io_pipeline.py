@@ -0,0 +1,132 @@
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from logging import Logger
+from typing import Any, Callable, Iterable
+
+
+class _Done:
+    """Marks the end of the read batches."""
+
+
+class _Failed:
+    """Passes an error from the reader thread to the main thread."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class IoPipeline:
+    """
+    Read the upcoming batches and write the finished batches in other threads,
+    so the main thread can keep the OCR model busy.
+    The queues are bounded, so only a few batches are in memory at once.
+    """
+
+    def __init__(
+        self,
+        logger: Logger,
+        read_queue: int = 2,
+        write_queue: int = 2,
+        threads: int = 2,
+    ):
+        if read_queue < 1:
+            raise ValueError(f"Read queue must be 1 or more, not {read_queue}.")
+        if write_queue < 1:
+            raise ValueError(f"Write queue must be 1 or more, not {write_queue}.")
+        if threads < 1:
+            raise ValueError(f"Threads must be 1 or more, not {threads}.")
+
+        self._logger = logger
+        self._read_queue = read_queue
+        self._write_queue = write_queue
+        self._threads = threads
+
+    def run(
+        self,
+        batches: Iterable[Any],
+        read: Callable[[Any, Executor], Any],
+        process: Callable[[Any], Any],
+        write: Callable[[Any], None],
+    ) -> None:
+        """
+        Read each batch in the reader threads, process it in this thread,
+        then write it in the writer threads.
+        The read function can use the executor to read the items in a batch.
+        """
+        ready = queue.Queue(maxsize=self._read_queue)
+        stop = threading.Event()
+
+        self._logger.debug(
+            f"Running OCR with a read queue of {self._read_queue}, "
+            f"a write queue of {self._write_queue} "
+            f"and {self._threads} threads each for reading and writing."
+        )
+
+        with ThreadPoolExecutor(
+            self._threads, thread_name_prefix="ocr-read"
+        ) as readers, ThreadPoolExecutor(
+            self._threads, thread_name_prefix="ocr-write"
+        ) as writers:
+            producer = threading.Thread(
+                target=self._produce,
+                args=(batches, read, readers, ready, stop),
+                name="ocr-prefetch",
+                daemon=True,
+            )
+            producer.start()
+
+            writes = deque()
+            try:
+                while True:
+                    item = ready.get()
+                    if isinstance(item, _Done):
+                        break
+                    if isinstance(item, _Failed):
+                        raise item.error
+
+                    output = process(item)
+
+                    # wait for the oldest write when the write queue is full
+                    while len(writes) >= self._write_queue:
+                        writes.popleft().result()
+                    writes.append(writers.submit(write, output))
+
+                while writes:
+                    writes.popleft().result()
+
+            finally:
+                # let the reader thread finish if it is waiting for queue space
+                stop.set()
+                while producer.is_alive():
+                    try:
+                        ready.get(timeout=0.1)
+                    except queue.Empty:
+                        pass
+                producer.join()
+
+    def _produce(
+        self,
+        batches: Iterable[Any],
+        read: Callable[[Any, Executor], Any],
+        readers: Executor,
+        ready: queue.Queue,
+        stop: threading.Event,
+    ) -> None:
+        try:
+            for batch in batches:
+                if stop.is_set():
+                    return
+                self._put(ready, read(batch, readers), stop)
+            self._put(ready, _Done(), stop)
+        except Exception as error:
+            self._put(ready, _Failed(error), stop)
+
+    def _put(self, ready: queue.Queue, item: Any, stop: threading.Event) -> None:
+        while not stop.is_set():
+            try:
+                ready.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
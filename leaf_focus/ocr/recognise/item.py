@@ -227,7 +227,18 @@ class Item:
 
     @classmethod
     def load(cls, path: Path):
-        """Load found text items from a file."""
+        """
+        Load found text items from a file.
+        Uses the binary predictions file if there is an up-to-date one.
+        """
+        from leaf_focus.ocr.recognise.page_items import PageItems
+
+        binary_path = PageItems.current_binary(path)
+        if binary_path:
+            for view in PageItems.load_binary(binary_path):
+                yield view.to_item()
+            return
+
         logger = logging.getLogger(cls.__name__)
         logger.debug(f"Loading OCR items from '{path}'.")
         count = 0
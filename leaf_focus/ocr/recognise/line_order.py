@@ -0,0 +1,94 @@
+from logging import Logger
+
+import numpy as np
+
+
+class LineOrder:
+    """
+    Arrange text boxes into lines of text (top -> bottom, left -> right).
+    Works on arrays of box coordinates instead of one item at a time.
+    """
+
+    level_buffer = 0.09
+    """The largest top slope that is approximately horizontal."""
+
+    def __init__(self, logger: Logger):
+        self._logger = logger
+
+    def assemble(self, boxes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Find the line number and line order for each box.
+
+        The boxes have the shape (n, 4, 2), with the points in the order
+        top left, top right, bottom right, bottom left.
+        Returns the line numbers and line orders, both starting from 1.
+        Boxes that are too sloped are not included in a line,
+        and have a line number and order of 0.
+        """
+        boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4, 2)
+        count = len(boxes)
+        line_numbers = np.zeros(count, dtype=np.int64)
+        line_orders = np.zeros(count, dtype=np.int64)
+        if count < 1:
+            return line_numbers, line_orders
+
+        # exclude boxes that are too sloped
+        level = np.flatnonzero(self.is_horizontal_level(boxes))
+        if len(level) < 1:
+            return line_numbers, line_orders
+
+        # Two boxes are on the same line when the middle thirds
+        # of their heights overlap.
+        band_top, band_bottom = self.line_bands(boxes[level])
+
+        # Sweep down the page by the top of each band.
+        # A new line starts when a band begins below the lowest
+        # band bottom seen so far in the current line.
+        by_top = np.argsort(band_top, kind="stable")
+        sorted_top = band_top[by_top]
+        sorted_bottom = band_bottom[by_top]
+        reach = np.maximum.accumulate(sorted_bottom)
+        new_line = np.empty(len(by_top), dtype=bool)
+        new_line[0] = True
+        new_line[1:] = sorted_top[1:] > reach[:-1]
+        sorted_line = np.cumsum(new_line)
+
+        line_numbers[level[by_top]] = sorted_line
+
+        # order the boxes in each line by the top left point
+        top_left_x = boxes[level, 0, 0]
+        top_left_y = boxes[level, 0, 1]
+        level_lines = line_numbers[level]
+        in_order = np.lexsort((top_left_y, top_left_x, level_lines))
+        ordered_lines = level_lines[in_order]
+        line_starts = np.flatnonzero(
+            np.r_[True, ordered_lines[1:] != ordered_lines[:-1]]
+        )
+        line_lengths = np.diff(np.r_[line_starts, len(in_order)])
+        first_in_line = np.repeat(line_starts, line_lengths)
+        line_orders[level[in_order]] = np.arange(len(in_order)) - first_in_line + 1
+
+        self._logger.debug(
+            f"Arranged {len(level)} of {count} text boxes into "
+            f"{int(sorted_line[-1])} lines."
+        )
+
+        return line_numbers, line_orders
+
+    def is_horizontal_level(self, boxes: np.ndarray) -> np.ndarray:
+        """Is the side-to-side slope of each box approximately horizontal?"""
+        x_diff = boxes[:, 1, 0] - boxes[:, 0, 0]
+        y_diff = boxes[:, 1, 1] - boxes[:, 0, 1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            slope = y_diff / x_diff
+        vertical = np.where(y_diff >= 0, np.inf, -np.inf)
+        slope = np.where(x_diff == 0, vertical, slope)
+        return np.abs(slope) <= self.level_buffer
+
+    def line_bands(self, boxes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Get the middle third of the height of each box."""
+        y = boxes[:, :, 1]
+        top = y.min(axis=1)
+        bottom = y.max(axis=1)
+        third = (bottom - top) / 3
+        return top + third, bottom - third
@@ -0,0 +1,157 @@
+import json
+import os
+import shutil
+from logging import Logger
+from pathlib import Path
+from typing import Optional
+
+from leaf_focus.pdf.identify.component import Component as IdentifyComponent
+from leaf_focus.support.location import Location
+
+
+class ModelStore:
+    """
+    Store the OCR model weights in a local directory,
+    so the OCR can run without downloading the weights.
+    """
+
+    names = ["detector", "recognizer"]
+    """The models in the store."""
+
+    manifest_name = "models.json"
+
+    def __init__(self, logger: Logger, models_dir: Path):
+        if not models_dir:
+            raise ValueError("Must supply models directory.")
+
+        self._logger = logger
+        self._models_dir = models_dir
+        self._location = Location(logger)
+        self._identify = IdentifyComponent(logger)
+
+    @property
+    def models_dir(self) -> Path:
+        return self._models_dir
+
+    @property
+    def manifest_file(self) -> Path:
+        return self._models_dir / self.manifest_name
+
+    def weights_file(self, name: str) -> Path:
+        return self._models_dir / f"{name}.h5"
+
+    def tflite_file(self, name: str, quantisation: str) -> Path:
+        return self._models_dir / f"{name}-{quantisation}.tflite"
+
+    def has_weights(self) -> bool:
+        """Check if the weights for all the models are in the store."""
+        if not self.manifest_file.exists():
+            return False
+        return all([self.weights_file(name).exists() for name in self.names])
+
+    def read_manifest(self) -> dict:
+        with open(self.manifest_file, "rt", encoding="utf8") as f:
+            return json.load(f)
+
+    def fetch(self) -> None:
+        """Download the pretrained keras-ocr weights and save them to the store."""
+        os.environ["TF_CPP_MIN_LOG_LEVEL"] = "2"
+
+        import keras_ocr
+
+        self._logger.info(f"Fetching the OCR model weights to '{self._models_dir}'.")
+        self._location.create_directory(self._models_dir)
+
+        # keras-ocr will automatically download the pretrained weights
+        detector = keras_ocr.detection.Detector()
+        detector.model.save_weights(str(self.weights_file("detector")))
+
+        recognizer = keras_ocr.recognition.Recognizer()
+        recognizer.model.save_weights(str(self.weights_file("recognizer")))
+
+        self._write_manifest(recognizer.alphabet, keras_ocr.__version__)
+
+    def import_models(self, source_dir: Path) -> None:
+        """Copy the model weights from another store, such as one on another host."""
+        if not source_dir:
+            raise ValueError("Must supply source directory.")
+
+        source = ModelStore(self._logger, source_dir)
+        if not source.manifest_file.exists():
+            raise FileNotFoundError(
+                f"Model manifest does not exist '{source.manifest_file}'."
+            )
+
+        source.verify()
+
+        self._logger.info(
+            f"Importing the OCR model weights from '{source_dir}' "
+            f"to '{self._models_dir}'."
+        )
+        self._location.create_directory(self._models_dir)
+        for name in self.names:
+            shutil.copyfile(source.weights_file(name), self.weights_file(name))
+        shutil.copyfile(source.manifest_file, self.manifest_file)
+
+        self.verify()
+
+    def verify(self) -> None:
+        """Check that the weights files match the manifest."""
+        manifest = self.read_manifest()
+        for name in self.names:
+            weights_file = self.weights_file(name)
+            if not weights_file.exists():
+                raise FileNotFoundError(
+                    f"Model weights file does not exist '{weights_file}'."
+                )
+            expected = manifest[name]["sha256"]
+            actual = self._identify.file_hash(weights_file)
+            if actual != expected:
+                raise ValueError(
+                    f"Model weights file '{weights_file}' has hash '{actual}', "
+                    f"expected '{expected}'."
+                )
+
+    def load_detector(self):
+        """Build the keras-ocr detector using the weights in the store."""
+        import keras_ocr
+
+        detector = keras_ocr.detection.Detector(weights=None)
+        detector.model.load_weights(str(self.weights_file("detector")))
+        return detector
+
+    def load_recognizer(self):
+        """Build the keras-ocr recognizer using the weights in the store."""
+        import keras_ocr
+
+        alphabet = self.read_manifest()["recognizer"]["alphabet"]
+        recognizer = keras_ocr.recognition.Recognizer(alphabet=alphabet, weights=None)
+        recognizer.model.load_weights(str(self.weights_file("recognizer")))
+        return recognizer
+
+    def load_pipeline(self, scale: float, max_size: int):
+        """Build the keras-ocr pipeline using the weights in the store."""
+        import keras_ocr
+
+        return keras_ocr.pipeline.Pipeline(
+            detector=self.load_detector(),
+            recognizer=self.load_recognizer(),
+            scale=scale,
+            max_size=max_size,
+        )
+
+    def _write_manifest(self, alphabet: str, source: Optional[str] = None) -> None:
+        manifest = {
+            "keras_ocr": source,
+            "detector": {
+                "file": self.weights_file("detector").name,
+                "sha256": self._identify.file_hash(self.weights_file("detector")),
+            },
+            "recognizer": {
+                "file": self.weights_file("recognizer").name,
+                "sha256": self._identify.file_hash(self.weights_file("recognizer")),
+                "alphabet": alphabet,
+            },
+        }
+        with open(self.manifest_file, "wt", encoding="utf8") as f:
+            json.dump(manifest, f, indent=2)
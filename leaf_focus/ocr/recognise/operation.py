@@ -1,30 +1,112 @@
 from logging import Logger
 from pathlib import Path
+from typing import Callable, Iterable, Optional
 
+import numpy as np
+
+from leaf_focus.ocr.plan.operation import Operation as PlanOperation
+from leaf_focus.ocr.prepare.component import Component as PrepareComponent
 from leaf_focus.ocr.recognise.component import Component
+from leaf_focus.ocr.recognise.content_area import ContentArea
+from leaf_focus.ocr.recognise.detection_cache import DetectionCache
+from leaf_focus.ocr.recognise.io_pipeline import IoPipeline
+from leaf_focus.ocr.recognise.model_store import ModelStore
+from leaf_focus.ocr.recognise.page_items import PageItems
+from leaf_focus.ocr.recognise.result_cache import ResultCache
+from leaf_focus.ocr.recognise.tflite_backend import TflitePipeline
+from leaf_focus.ocr.threshold.operation import Operation as ThresholdOperation
 from leaf_focus.support.location import Location
 from leaf_focus.pdf.identify.item import Item as PdfIdentifyItem
+from leaf_focus.pdf.images.image_format import ImageFormat
 from leaf_focus.pdf.images.item import Item as ImageItem
 
 
 class Operation:
     """A pipeline building block that creates the ocr recognise files."""
 
-    def __init__(self, logger: Logger, base_path: Path):
+    def __init__(
+        self,
+        logger: Logger,
+        base_path: Path,
+        intra_op_threads: Optional[int] = None,
+        inter_op_threads: Optional[int] = None,
+        annotate: bool = False,
+        perceptual_hash: bool = False,
+        detection_resolution: Optional[float] = None,
+        crop_margins: bool = False,
+        min_ink_coverage: Optional[float] = None,
+        backend: str = "keras",
+        quantisation: str = "none",
+        models_dir: Optional[Path] = None,
+        prefetch: int = 0,
+        write_queue: int = 2,
+        io_threads: int = 2,
+        image_format: Optional[ImageFormat] = None,
+    ):
         self._logger = logger
         self._base_path = base_path
-        self._location = Location(logger)
-        self._component = Component(logger)
+        self._image_format = image_format or ImageFormat()
+        self._location = Location(logger, image_format)
+        self._model_store = ModelStore(
+            logger, models_dir or self._location.ocr_models_dir(base_path)
+        )
+        self._result_cache = ResultCache(logger, base_path, perceptual_hash)
+        self._component = Component(
+            logger,
+            intra_op_threads,
+            inter_op_threads,
+            annotate,
+            DetectionCache(logger, base_path),
+            self._result_cache,
+            detection_resolution,
+            ContentArea(logger, min_ink_coverage) if crop_margins else None,
+            self.build_backend(
+                logger, self._model_store, backend, quantisation, intra_op_threads
+            ),
+            self._model_store,
+            io_pipeline=IoPipeline(logger, prefetch, write_queue, io_threads)
+            if prefetch > 0
+            else None,
+        )
+        self._plan = PlanOperation(logger, base_path)
+        self._thresholds = ThresholdOperation(logger, base_path)
+
+    @classmethod
+    def build_backend(
+        cls,
+        logger: Logger,
+        model_store: ModelStore,
+        backend: str,
+        quantisation: str,
+        num_threads: Optional[int] = None,
+    ) -> Optional[TflitePipeline]:
+        """Create the OCR backend. The keras-ocr pipeline is used for 'keras'."""
+        if backend == "keras":
+            return None
+        if backend == "tflite":
+            return TflitePipeline(logger, model_store, quantisation, num_threads)
+        raise ValueError(f"OCR backend must be 'keras' or 'tflite', not '{backend}'.")
+
+    @property
+    def model_store(self) -> ModelStore:
+        """The local store of OCR model weights."""
+        return self._model_store
+
+    @property
+    def result_cache(self) -> ResultCache:
+        """The cache of OCR predictions by page image content."""
+        return self._result_cache
 
     def run(self, file_hash: str, page: int, threshold: int):
         """Run the operation."""
 
-        # crate output directory
-        loc = self._location
-        bd = self._base_path
-        input_file = loc.pdf_page_prepared_file(bd, file_hash, page, threshold)
-        annotation_file = loc.pdf_page_ocr_file(bd, file_hash, page, threshold)
-        predictions_file = loc.pdf_page_text_file(bd, file_hash, page, threshold)
+        # use the threshold chosen for the pdf, if there is one
+        threshold = self.chosen_threshold(file_hash, threshold)
+
+        # get the input and output files
+        input_file, annotation_file, predictions_file = self.job(
+            file_hash, page, threshold
+        )
 
         # create annotation file and predictions file
         self._component.recognise_text(input_file, annotation_file, predictions_file)
@@ -32,17 +114,317 @@ class Operation:
         # result
         return annotation_file, predictions_file
 
-    def run_many(self):
-        """Run the operation for all the pdfs."""
+    def chosen_threshold(self, file_hash: str, threshold: int) -> int:
+        """Get the threshold chosen for a pdf, or the threshold if there is none."""
+        return self._thresholds.threshold(file_hash, threshold)
+
+    def run_greyscale(
+        self,
+        file_hash: str,
+        page: int,
+        threshold: int,
+        greyscale: np.ndarray,
+        keep_intermediates: bool = False,
+    ) -> tuple[Path, Path]:
+        """
+        Run the operation for a rendered page image that is already read,
+        preparing it in memory.
+        The prepared image file is only saved when keep intermediates is set.
+        """
+
+        # use the threshold chosen for the pdf, if there is one
+        threshold = self.chosen_threshold(file_hash, threshold)
+
+        input_file, annotation_file, predictions_file = self.job(
+            file_hash, page, threshold
+        )
+        prepare = PrepareComponent(self._logger, self._image_format)
+        output_file = input_file if keep_intermediates else None
+
+        def read_image(_: tuple[Path, Path, Path]) -> np.ndarray:
+            return prepare.prepare_array(greyscale, threshold, output_file)
+
+        self._component.recognise_many(
+            [(input_file, annotation_file, predictions_file)],
+            batch_size=1,
+            read_image=read_image,
+        )
+        return annotation_file, predictions_file
+
+    def run_many(self, batch_size: int = 4, recognise_only: bool = False):
+        """
+        Run the operation for all the pdfs, recognising the images in batches.
+        When recognise only is set, the text recognition is run again for
+        all the images with cached text boxes, without running the detection.
+        """
+        if recognise_only:
+            jobs = [self.job(*item) for item in self.find_prepared()]
+            return self._component.recognise_many(jobs, batch_size, True)
+
+        pending, done_count = self.find_pending()
+        self._logger.info(
+            f"Found {len(pending)} pages that need OCR "
+            f"and {done_count} pages that are done."
+        )
+        if not pending:
+            # the OCR model is not loaded when there is nothing to do
+            return 0
+
+        jobs = [self.job(*item) for item in pending]
+        return self._component.recognise_many(jobs, batch_size)
+
+    def run_pages(
+        self,
+        pages: Iterable[tuple[str, int, int]],
+        batch_size: int = 4,
+        on_done: Optional[Callable[[list[tuple[str, int, int]]], None]] = None,
+        fused: bool = False,
+        keep_intermediates: bool = False,
+        use_chosen: bool = True,
+    ) -> list[tuple[Path, Path]]:
+        """
+        Run the operation for the (file hash, page, threshold) pages,
+        recognising the images in batches.
+        The on done function is given the pages as they are finished.
+        When fused is set, each rendered page image is prepared in memory
+        and given straight to the OCR, without reading a prepared image file.
+        The prepared image files are only saved when keep intermediates is set.
+        The threshold chosen for each pdf is used, unless use chosen is not set.
+        """
+        pages = list(pages)
+
+        # use the threshold chosen for each pdf, if there is one
+        if use_chosen:
+            chosen = [
+                (file_hash, page, self.chosen_threshold(file_hash, threshold))
+                for file_hash, page, threshold in pages
+            ]
+        else:
+            chosen = pages
+        return self._run_pages(
+            pages, chosen, batch_size, on_done, fused, keep_intermediates
+        )
+
+    def _run_pages(
+        self,
+        pages: list[tuple[str, int, int]],
+        chosen: list[tuple[str, int, int]],
+        batch_size: int = 4,
+        on_done: Optional[Callable[[list[tuple[str, int, int]]], None]] = None,
+        fused: bool = False,
+        keep_intermediates: bool = False,
+        replace: bool = False,
+    ) -> list[tuple[Path, Path]]:
+        """
+        Recognise the chosen (file hash, page, threshold) pages.
+        The on done function is given the matching pages as they are finished.
+        When replace is set, existing output is recognised again.
+        """
+        jobs = [self.job(*item) for item in chosen]
+
+        # the component finishes jobs, which are matched back to the pages
+        page_by_file = {job[2]: item for job, item in zip(jobs, pages)}
+        chosen_by_file = {job[2]: item for job, item in zip(jobs, chosen)}
+
+        def finished(done_jobs: list[tuple[Path, Path, Path]]) -> None:
+            if on_done:
+                on_done([page_by_file[job[2]] for job in done_jobs])
+
+        if fused:
+            read_image = self._prepare_in_memory(chosen_by_file, keep_intermediates)
+        else:
+            read_image = None
+
+        self._component.recognise_many(
+            jobs, batch_size, on_done=finished, read_image=read_image, replace=replace
+        )
+        return [
+            (annotation_file, predictions_file)
+            for _, annotation_file, predictions_file in jobs
+        ]
+
+    def retry_pages(
+        self,
+        pages: Iterable[tuple[str, int]],
+        threshold: int,
+        batch_size: int = 4,
+    ) -> list[tuple[Path, Path]]:
+        """
+        Prepare the (file hash, page) pages using another threshold
+        and recognise them again, including pages the OCR plan skips.
+        Pages that already have output for the threshold are recognised again,
+        as the other OCR settings might have changed, and the output is replaced.
+        The threshold is recorded for the pages, so the report uses their output.
+        """
+        loc = self._location
+        bd = self._base_path
+        prepare = PrepareComponent(self._logger, self._image_format)
+
+        items = []
+        for file_hash, page in pages:
+            image_file = loc.pdf_page_image_file(bd, file_hash, page)
+            if not image_file.exists():
+                self._logger.warning(
+                    f"Cannot retry OCR without page image '{image_file}'."
+                )
+                continue
+            prepared_file = loc.pdf_page_prepared_file(bd, file_hash, page, threshold)
+            prepare.threshold(image_file, prepared_file, threshold)
+            items.append((file_hash, page, threshold))
+
+        # the retry threshold is used instead of the threshold chosen for the pdf
+        result = self._run_pages(items, items, batch_size, replace=True)
+
+        # the report uses the output of the pages that were recognised again
+        pages_by_hash = {}
+        for file_hash, page, _ in items:
+            pages_by_hash.setdefault(file_hash, []).append(page)
+        for file_hash, page_nums in pages_by_hash.items():
+            self._thresholds.write_retry(file_hash, page_nums, threshold)
+
+        return result
+
+    def reorder_many(self) -> int:
+        """
+        Arrange the text in all the predictions files into lines again.
+        This does not load the OCR model.
+        """
+        count = 0
+        for predictions_file in self.find_predictions():
+            self._component.reorder_text_lines(predictions_file)
+            count += 1
+        return count
+
+    def find_prepared(self) -> Iterable[tuple[str, int, int]]:
+        """
+        Find the (file hash, page, threshold) of all prepared images
+        for the pages that need OCR.
+        Only the images prepared using the threshold chosen for a pdf are found,
+        when the pdf has a chosen threshold.
+        Only the images saved in the configured image format are found.
+        """
         for json_path in self._base_path.rglob("pdf-identify.json"):
 
             # read the pdf identity json file
             pdf_identify = PdfIdentifyItem.read(json_path)
-            for pdf_image in ImageItem.load(json_path.parent):
+            chosen = self._thresholds.read(pdf_identify.file_hash)
+            suffix = self._image_format.suffix
+            for pdf_image in ImageItem.load(json_path.parent, suffix=suffix):
                 if pdf_image.variety != "prep":
                     continue
                 if pdf_image.threshold is None:
                     continue
+                if chosen and pdf_image.threshold != chosen.threshold:
+                    continue
+                if not self._plan.needs_ocr(pdf_identify.file_hash, pdf_image.page):
+                    continue
+
+                yield pdf_identify.file_hash, pdf_image.page, pdf_image.threshold
+
+    def find_rendered(self, threshold: int) -> Iterable[tuple[str, int, int]]:
+        """
+        Find the (file hash, page, threshold) of all rendered page images
+        for the pages that need OCR.
+        The threshold is the one chosen for the pdf, or else the given threshold.
+        Each page is found once, using the page image the OCR reads,
+        even when the page was rendered in more than one image format.
+        """
+        loc = self._location
+        for json_path in self._base_path.rglob("pdf-identify.json"):
+            file_hash = PdfIdentifyItem.read(json_path).file_hash
+            page_threshold = self._thresholds.threshold(file_hash, threshold)
+            for pdf_image in ImageItem.load(json_path.parent):
+                if pdf_image.variety is not None:
+                    continue
+                image_file = loc.pdf_page_image_file(
+                    self._base_path, file_hash, pdf_image.page
+                )
+                if pdf_image.path != image_file:
+                    continue
+                if not self._plan.needs_ocr(file_hash, pdf_image.page):
+                    continue
+
+                yield file_hash, pdf_image.page, page_threshold
+
+    def find_pending(
+        self, rendered_threshold: Optional[int] = None
+    ) -> tuple[list[tuple[str, int, int]], int]:
+        """
+        Find the prepared images that do not have OCR output.
+        When a rendered threshold is given, the rendered page images are found
+        instead, for preparing in memory.
+        Returns the pending (file hash, page, threshold) and the number of done pages.
+        This only checks the files, so it does not load the OCR model.
+        """
+        if rendered_threshold is None:
+            items = self.find_prepared()
+        else:
+            items = self.find_rendered(rendered_threshold)
 
-                # run the ocr on the prepared image
-                self.run(pdf_identify.file_hash, pdf_image.page, pdf_image.threshold)
+        pending = []
+        done_count = 0
+        for file_hash, page, threshold in items:
+            _, annotation_file, predictions_file = self.job(file_hash, page, threshold)
+            if self._component.has_output(annotation_file, predictions_file):
+                done_count += 1
+            else:
+                pending.append((file_hash, page, threshold))
+        return pending, done_count
+
+    def find_predictions(self) -> Iterable[Path]:
+        """Find all the csv predictions files."""
+        for json_path in self._base_path.rglob("pdf-identify.json"):
+            for item in ImageItem.load(json_path.parent, suffix=".csv"):
+                if item.variety != "text" or item.threshold is None:
+                    continue
+                yield item.path
+
+    def convert_predictions(self, force: bool = False) -> tuple[int, int]:
+        """
+        Create the binary predictions file for each csv predictions file
+        that does not have an up-to-date binary file.
+        Returns the number of files converted and the number already done.
+        """
+        converted = 0
+        done = 0
+        for predictions_file in self.find_predictions():
+            if not force and PageItems.current_binary(predictions_file):
+                done += 1
+                continue
+
+            items = PageItems.load_csv(predictions_file)
+            items.save_binary(PageItems.binary_path(predictions_file))
+            converted += 1
+
+        self._logger.info(
+            f"Converted {converted} predictions files "
+            f"and {done} predictions files were already converted."
+        )
+        return converted, done
+
+    def _prepare_in_memory(
+        self,
+        page_by_file: dict[Path, tuple[str, int, int]],
+        keep_intermediates: bool,
+    ) -> Callable[[tuple[Path, Path, Path]], np.ndarray]:
+        """Create a function that prepares the rendered page image for a job."""
+        prepare = PrepareComponent(self._logger, self._image_format)
+
+        def read_image(job: tuple[Path, Path, Path]) -> np.ndarray:
+            file_hash, page, threshold = page_by_file[job[2]]
+            image_file = self._location.pdf_page_image_file(
+                self._base_path, file_hash, page
+            )
+            output_file = job[0] if keep_intermediates else None
+            return prepare.prepare_image(image_file, threshold, output_file)
+
+        return read_image
+
+    def job(self, file_hash: str, page: int, threshold: int) -> tuple[Path, Path, Path]:
+        """Get the input image, annotation and predictions files for a page."""
+        loc = self._location
+        bd = self._base_path
+        input_file = loc.pdf_page_prepared_file(bd, file_hash, page, threshold)
+        annotation_file = loc.pdf_page_ocr_file(bd, file_hash, page, threshold)
+        predictions_file = loc.pdf_page_text_file(bd, file_hash, page, threshold)
+        return input_file, annotation_file, predictions_file
@@ -0,0 +1,134 @@
+import queue
+from dataclasses import dataclass
+from logging import Logger
+from multiprocessing.shared_memory import SharedMemory
+from typing import Optional
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class PageSlot:
+    """A greyscale page image in a slot of a page buffer."""
+
+    slot: int
+    height: int
+    width: int
+
+
+class PageBuffer:
+    """
+    A ring of fixed size greyscale page image slots in shared memory,
+    so a page image can be given to another process without saving
+    it to a file or copying it.
+    The process that creates the buffer writes the pages and frees the slots.
+    Other processes attach to the buffer by name and read the pages.
+    """
+
+    def __init__(
+        self,
+        shared_memory: SharedMemory,
+        slots: int,
+        height: int,
+        width: int,
+        owner: bool,
+    ):
+        self._shared_memory = shared_memory
+        self._slots = slots
+        self._height = height
+        self._width = width
+        self._owner = owner
+        self._array = np.ndarray(
+            (slots, height, width), dtype=np.uint8, buffer=shared_memory.buf
+        )
+
+        # the free slots are only tracked by the process that writes the pages
+        self._free = queue.Queue()  # type: queue.Queue[int]
+        if owner:
+            for slot in range(slots):
+                self._free.put(slot)
+
+    @classmethod
+    def create(
+        cls, logger: Logger, slots: int, height: int, width: int
+    ) -> "PageBuffer":
+        """Create a page buffer that can hold pages up to the height and width."""
+        if slots < 1:
+            raise ValueError(f"Slots must be 1 or more, not {slots}.")
+        if height < 1 or width < 1:
+            raise ValueError(f"Page size must be 1 or more, not {height}x{width}.")
+
+        shared_memory = SharedMemory(create=True, size=slots * height * width)
+        logger.debug(
+            f"Created page buffer '{shared_memory.name}' with {slots} slots "
+            f"of {height}x{width} pixels ({shared_memory.size / 1024 / 1024:.1f} MB)."
+        )
+        return cls(shared_memory, slots, height, width, owner=True)
+
+    @classmethod
+    def attach(cls, name: str, slots: int, height: int, width: int) -> "PageBuffer":
+        """Attach to a page buffer created by another process."""
+        # the worker processes share the resource tracker of the process
+        # that created the buffer, which removes the buffer when it is closed
+        shared_memory = SharedMemory(name=name)
+        return cls(shared_memory, slots, height, width, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._shared_memory.name
+
+    @property
+    def slots(self) -> int:
+        return self._slots
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """The largest (height, width) of a page."""
+        return self._height, self._width
+
+    def acquire(self, timeout: Optional[float] = None) -> int:
+        """
+        Get a free slot.
+        This waits until a slot is released when all the slots are in use.
+        """
+        try:
+            return self._free.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No page buffer slot was free after {timeout} s.")
+
+    def release(self, slot: int) -> None:
+        """Make a slot available for another page. Can be called from any thread."""
+        if not 0 <= slot < self._slots:
+            raise ValueError(
+                f"Slot must be between 0 and {self._slots - 1}, not {slot}."
+            )
+        self._free.put(slot)
+
+    def write(self, slot: int, image: np.ndarray) -> PageSlot:
+        """Copy a greyscale page image into a slot."""
+        if image.ndim != 2:
+            raise ValueError(f"Must supply a greyscale image, not shape {image.shape}.")
+        height, width = image.shape
+        if height > self._height or width > self._width:
+            raise ValueError(
+                f"Page size {height}x{width} is larger than "
+                f"the slot size {self._height}x{self._width}."
+            )
+        self._array[slot, 0:height, 0:width] = image
+        return PageSlot(slot=slot, height=height, width=width)
+
+    def read(self, page: PageSlot) -> np.ndarray:
+        """
+        Get the greyscale page image in a slot, without copying it.
+        The image is only valid until the slot is released.
+        """
+        height, width = page.height, page.width
+        return self._array[page.slot, 0:height, 0:width]
+
+    def close(self) -> None:
+        """Stop using the buffer. The process that created it also removes it."""
+        # the array must not be used after the shared memory is closed
+        self._array = None
+        self._shared_memory.close()
+        if self._owner:
+            self._shared_memory.unlink()
@@ -0,0 +1,392 @@
+import csv
+import logging
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+
+import numpy as np
+
+from leaf_focus.ocr.recognise.item import Item
+
+_corners = ["top_left", "top_right", "bottom_right", "bottom_left"]
+_fields = ["text", "line_number", "line_order"] + [
+    f"{corner}_{axis}" for corner in _corners for axis in ["x", "y"]
+]
+
+
+def _coordinate(corner: int, axis: int) -> property:
+    def get(self: "ItemView") -> float:
+        return float(self._items.boxes[self._index, corner, axis])
+
+    return property(get)
+
+
+def _point(corner: int) -> property:
+    def get(self: "ItemView") -> tuple[float, float]:
+        x, y = self._items.boxes[self._index, corner]
+        return float(x), float(y)
+
+    return property(get)
+
+
+def _slope(start: int, end: int) -> property:
+    def get(self: "PageItems") -> np.ndarray:
+        return self.slope(start, end)
+
+    return property(get)
+
+
+class ItemView:
+    """A lightweight view of one text item in a page of items."""
+
+    __slots__ = ("_items", "_index")
+
+    def __init__(self, items: "PageItems", index: int):
+        self._items = items
+        self._index = index
+
+    @property
+    def text(self) -> str:
+        return self._items.text[self._index]
+
+    @property
+    def line_number(self) -> Optional[int]:
+        return int(self._items.line_number[self._index]) or None
+
+    @property
+    def line_order(self) -> Optional[int]:
+        return int(self._items.line_order[self._index]) or None
+
+    top_left_x = _coordinate(0, 0)
+    top_left_y = _coordinate(0, 1)
+    top_right_x = _coordinate(1, 0)
+    top_right_y = _coordinate(1, 1)
+    bottom_right_x = _coordinate(2, 0)
+    bottom_right_y = _coordinate(2, 1)
+    bottom_left_x = _coordinate(3, 0)
+    bottom_left_y = _coordinate(3, 1)
+
+    top_left = _point(0)
+    top_right = _point(1)
+    bottom_right = _point(2)
+    bottom_left = _point(3)
+
+    def to_item(self) -> Item:
+        """Create a standalone item from this view."""
+        text, box = self.to_prediction
+        item = Item.from_prediction((text, box))
+        item.line_number = self.line_number
+        item.line_order = self.line_order
+        return item
+
+    @property
+    def to_prediction(self):
+        box = tuple(self._items.boxes[self._index].tolist())
+        return self.text, tuple(tuple(point) for point in box)
+
+    def __str__(self):
+        return str(self.to_item())
+
+    def __repr__(self):
+        return f"ItemView({self._index}, {self.text!r})"
+
+
+class PageItems:
+    """
+    All the found text items in one page, stored as arrays.
+    Views of individual items are only created when they are needed.
+    """
+
+    level_buffer = 0.09
+    """The largest top slope that is approximately horizontal."""
+
+    binary_suffix = ".npz"
+    binary_version = 1
+
+    def __init__(
+        self,
+        text: list[str],
+        boxes: np.ndarray,
+        line_number: Optional[np.ndarray] = None,
+        line_order: Optional[np.ndarray] = None,
+    ):
+        boxes = np.asarray(boxes)
+        if not np.issubdtype(boxes.dtype, np.floating):
+            boxes = boxes.astype(np.float64)
+        boxes = boxes.reshape(-1, 4, 2)
+
+        count = len(boxes)
+        if len(text) != count:
+            raise ValueError(f"Must supply {count} text values, not {len(text)}.")
+
+        self.text = list(text)
+        """The recognised text for each item."""
+
+        self.boxes = boxes
+        """The (top left, top right, bottom right, bottom left) points of each item."""
+
+        self.line_number = self._line_values(line_number, count)
+        """The line number of each item, 0 if the item is not in a line."""
+
+        self.line_order = self._line_values(line_order, count)
+        """The order of each item in its line, 0 if the item is not in a line."""
+
+    @classmethod
+    def empty(cls) -> "PageItems":
+        return cls([], np.empty((0, 4, 2), dtype=np.float64))
+
+    @classmethod
+    def from_predictions(cls, predictions: Iterable[tuple[Any, Any]]) -> "PageItems":
+        """Convert from a list of (text, box) to page items."""
+        predictions = list(predictions or [])
+        if not predictions:
+            return cls.empty()
+        text = [text for text, _ in predictions]
+        boxes = np.stack([np.asarray(box) for _, box in predictions])
+        return cls(text, boxes)
+
+    @classmethod
+    def from_items(cls, items: Iterable[Item]) -> "PageItems":
+        """Convert from individual items to page items."""
+        items = list(items or [])
+        if not items:
+            return cls.empty()
+        return cls(
+            [i.text for i in items],
+            np.array([i.to_prediction[1] for i in items], dtype=np.float64),
+            np.array([i.line_number or 0 for i in items]),
+            np.array([i.line_order or 0 for i in items]),
+        )
+
+    @classmethod
+    def binary_path(cls, path: Path) -> Path:
+        """Get the binary predictions file that goes with a csv predictions file."""
+        return path.with_suffix(cls.binary_suffix)
+
+    @classmethod
+    def load(cls, path: Path) -> "PageItems":
+        """
+        Load found text items from a file.
+        The binary file is used instead of the csv file
+        when it exists and is at least as new as the csv file.
+        """
+        binary_path = cls.current_binary(path)
+        if binary_path:
+            return cls.load_binary(binary_path)
+        return cls.load_csv(path)
+
+    @classmethod
+    def current_binary(cls, path: Path) -> Optional[Path]:
+        """
+        Get the binary predictions file for a predictions file,
+        if it exists and is at least as new as the csv file.
+        """
+        if path.suffix == cls.binary_suffix:
+            return path
+        binary_path = cls.binary_path(path)
+        if not binary_path.exists():
+            return None
+        if path.exists() and binary_path.stat().st_mtime < path.stat().st_mtime:
+            return None
+        return binary_path
+
+    @classmethod
+    def load_csv(cls, path: Path) -> "PageItems":
+        """Load found text items from a csv file."""
+        logger = logging.getLogger(cls.__name__)
+        logger.debug(f"Loading OCR items from '{path}'.")
+
+        with open(path, "rt", encoding="utf8") as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            rows = list(reader)
+
+        if not header or not rows:
+            return cls.empty()
+
+        columns = {name: index for index, name in enumerate(header)}
+        text_col = columns["text"]
+        coord_cols = [columns[name] for name in _fields[3:]]
+        line_cols = [columns.get("line_number"), columns.get("line_order")]
+
+        text = [row[text_col] for row in rows]
+        boxes = np.array(
+            [[row[c] for c in coord_cols] for row in rows], dtype=np.float64
+        )
+        line_number, line_order = [
+            np.array(
+                [int(row[c].strip() or 0) if c is not None else 0 for row in rows],
+                dtype=np.int64,
+            )
+            for c in line_cols
+        ]
+
+        logger.debug(f"Loaded {len(rows)} OCR items from '{path}'.")
+        return cls(text, boxes, line_number, line_order)
+
+    @classmethod
+    def load_binary(cls, path: Path) -> "PageItems":
+        """Load found text items from a binary file."""
+        logger = logging.getLogger(cls.__name__)
+        logger.debug(f"Loading OCR items from '{path}'.")
+
+        with np.load(path, allow_pickle=False) as data:
+            version = int(data["version"])
+            if version != cls.binary_version:
+                raise ValueError(
+                    f"Unknown binary predictions version '{version}' in '{path}'."
+                )
+            text_bytes = data["text"].tobytes()
+            text_offsets = data["text_offsets"]
+            boxes = data["boxes"]
+            line_number = data["line_number"]
+            line_order = data["line_order"]
+
+        text = [
+            text_bytes[start:end].decode("utf8")
+            for start, end in zip(text_offsets[:-1], text_offsets[1:])
+        ]
+
+        logger.debug(f"Loaded {len(text)} OCR items from '{path}'.")
+        return cls(text, boxes, line_number, line_order)
+
+    def save_binary(self, path: Path) -> None:
+        """
+        Save found text items to a binary file.
+        The text is stored as one block of utf8 bytes with the offset of each item,
+        and the coordinates are stored as one float32 block.
+        """
+        logger = logging.getLogger(self.__class__.__name__)
+        logger.debug(f"Saving {len(self)} OCR items to '{path}'.")
+
+        # store the items in the same order as the csv file
+        in_order = np.lexsort((self.line_order, self.line_number))
+        encoded = [self.text[index].encode("utf8") for index in in_order]
+        text_offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        text_offsets[1:] = np.cumsum(
+            np.array([len(e) for e in encoded], dtype=np.int64)
+        )
+
+        # write to the open file, so numpy does not add a suffix
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                version=np.array(self.binary_version),
+                text=np.frombuffer(b"".join(encoded), dtype=np.uint8),
+                text_offsets=text_offsets,
+                boxes=self.boxes[in_order].astype(np.float32),
+                line_number=self.line_number[in_order].astype(np.int32),
+                line_order=self.line_order[in_order].astype(np.int32),
+            )
+
+        logger.debug(f"Saved OCR items to '{path}'.")
+
+    def save(self, path: Path) -> None:
+        """Save found text items to a csv file."""
+        logger = logging.getLogger(self.__class__.__name__)
+        logger.debug(f"Saving {len(self)} OCR items to '{path}'.")
+
+        in_order = np.lexsort((self.line_order, self.line_number))
+        with open(path, "wt", newline="", encoding="utf8") as f:
+            writer = csv.writer(f)
+            writer.writerow(_fields)
+            for index in in_order:
+                line_number = self.line_number[index]
+                line_order = self.line_order[index]
+                writer.writerow(
+                    [
+                        self.text[index],
+                        line_number if line_number > 0 else "",
+                        line_order if line_order > 0 else "",
+                        *self.boxes[index].reshape(-1),
+                    ]
+                )
+
+        logger.debug(f"Saved OCR items to '{path}'.")
+
+    def assign_lines(self, line_numbers: np.ndarray, line_orders: np.ndarray):
+        """Set the line number and line order of each item."""
+        self.line_number = self._line_values(line_numbers, len(self))
+        self.line_order = self._line_values(line_orders, len(self))
+
+    def line_count(self) -> int:
+        """Get the number of lines."""
+        return int(self.line_number.max()) if len(self) > 0 else 0
+
+    def line(self, line_num: int) -> list[ItemView]:
+        """Get the items in a line, in line order."""
+        indexes = np.flatnonzero(self.line_number == line_num)
+        indexes = indexes[np.argsort(self.line_order[indexes], kind="stable")]
+        return [ItemView(self, int(index)) for index in indexes]
+
+    @property
+    def top_length(self) -> np.ndarray:
+        """The length of the top of each item."""
+        return self._length(0, 1)
+
+    @property
+    def left_length(self) -> np.ndarray:
+        """The length of the left side of each item."""
+        return self._length(0, 3)
+
+    @property
+    def line_bounds(self) -> tuple[np.ndarray, np.ndarray]:
+        """Line bounds from top of text to bottom of text for each item."""
+        y = self.boxes[:, :, 1]
+        return y.min(axis=1), y.max(axis=1)
+
+    def slope(self, start: int, end: int) -> np.ndarray:
+        """The slope between two corners of each item."""
+        x_diff = self.boxes[:, end, 0] - self.boxes[:, start, 0]
+        y_diff = self.boxes[:, end, 1] - self.boxes[:, start, 1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            slope = y_diff / x_diff
+        vertical = np.where(y_diff >= 0, np.inf, -np.inf)
+        return np.where(x_diff == 0, vertical, slope)
+
+    slope_top_left_right = _slope(0, 1)
+    slope_top_right_left = _slope(1, 0)
+    slope_left_top_bottom = _slope(0, 3)
+    slope_left_bottom_top = _slope(3, 0)
+    slope_bottom_left_right = _slope(3, 2)
+    slope_bottom_right_left = _slope(2, 3)
+    slope_right_top_bottom = _slope(1, 2)
+    slope_right_bottom_top = _slope(2, 1)
+
+    @property
+    def is_horizontal_level(self) -> np.ndarray:
+        """Is the side-to-side slope of each item approximately horizontal?"""
+        return np.abs(self.slope_top_left_right) <= self.level_buffer
+
+    @property
+    def is_vertical_level(self) -> np.ndarray:
+        """Is the top-to-bottom slope of each item approximately vertical?"""
+        return self.slope_left_top_bottom == np.inf
+
+    def _length(self, start: int, end: int) -> np.ndarray:
+        diff = self.boxes[:, end] - self.boxes[:, start]
+        return np.hypot(diff[:, 0], diff[:, 1])
+
+    def _line_values(self, values: Optional[np.ndarray], count: int) -> np.ndarray:
+        if values is None:
+            return np.zeros(count, dtype=np.int64)
+        values = np.asarray(values, dtype=np.int64).reshape(-1)
+        if len(values) != count:
+            raise ValueError(f"Must supply {count} line values, not {len(values)}.")
+        return values
+
+    def __len__(self):
+        return len(self.text)
+
+    def __getitem__(self, index: int) -> ItemView:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"Item index out of range '{index}'.")
+        return ItemView(self, index)
+
+    def __iter__(self) -> Iterator[ItemView]:
+        for index in range(len(self)):
+            yield ItemView(self, index)
+
+    def __str__(self):
+        return f"{len(self)} items in {self.line_count()} lines"
@@ -0,0 +1,42 @@
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+import numpy as np
+
+
+class PhaseTimer:
+    """Measure the time taken by each phase of the OCR."""
+
+    def __init__(self):
+        self._durations = {}  # type: dict[str, list[float]]
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Measure the time taken by the code in the with block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._durations.setdefault(name, []).append(elapsed)
+
+    def durations(self, name: str) -> list[float]:
+        """Get the time in seconds of each run of a phase."""
+        return list(self._durations.get(name, []))
+
+    def reset(self) -> None:
+        self._durations = {}
+
+    def summary(self) -> dict[str, dict]:
+        """Get the count, total, p50 and p95 time in seconds of each phase."""
+        result = {}
+        for name, durations in self._durations.items():
+            values = np.array(durations)
+            result[name] = {
+                "count": len(values),
+                "total": round(float(values.sum()), 6),
+                "p50": round(float(np.percentile(values, 50)), 6),
+                "p95": round(float(np.percentile(values, 95)), 6),
+            }
+        return result
@@ -0,0 +1,352 @@
+import functools
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, as_completed
+from logging import Logger
+from pathlib import Path
+from typing import Iterable, Optional
+
+from PIL import Image
+
+from leaf_focus.ocr.prepare.component import Component as PrepareComponent
+from leaf_focus.ocr.recognise.operation import Operation
+from leaf_focus.ocr.recognise.page_buffer import PageBuffer, PageSlot
+from leaf_focus.pdf.images.image_format import ImageFormat
+from leaf_focus.support.location import Location
+
+# The operation for the current worker process.
+# Each worker process loads its own OCR model.
+_worker_operation = None  # type: Optional[Operation]
+
+# The shared page images for the current worker process, when the pages
+# are prepared in memory.
+_worker_buffer = None  # type: Optional[PageBuffer]
+
+
+def _init_worker(
+    base_path: Path,
+    intra_op_threads: int,
+    inter_op_threads: int,
+    cpu_cores: Optional[list[list[int]]],
+    worker_counter: "multiprocessing.Value",
+    log_level: int,
+    annotate: bool,
+    perceptual_hash: bool,
+    detection_resolution: Optional[float],
+    crop_margins: bool,
+    min_ink_coverage: Optional[float],
+    backend: str,
+    quantisation: str,
+    models_dir: Optional[Path],
+    image_format: Optional[ImageFormat] = None,
+    buffer_args: Optional[tuple[str, int, int, int]] = None,
+) -> None:
+    """Set up a worker process and load the OCR model."""
+    global _worker_operation
+    global _worker_buffer
+
+    logging.basicConfig(
+        level=log_level,
+        format="%(asctime)s [%(levelname)-8s] %(processName)s: %(message)s",
+    )
+    logger = logging.getLogger()
+
+    with worker_counter.get_lock():
+        worker_index = worker_counter.value
+        worker_counter.value += 1
+
+    # pin this worker to its own cpu cores
+    if cpu_cores:
+        cores = cpu_cores[worker_index % len(cpu_cores)]
+        if hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, cores)
+            logger.info(f"OCR worker {worker_index} using cpu cores {cores}.")
+        else:
+            logger.warning("Setting the cpu affinity is not supported.")
+
+    _worker_operation = Operation(
+        logger,
+        base_path,
+        intra_op_threads,
+        inter_op_threads,
+        annotate,
+        perceptual_hash,
+        detection_resolution,
+        crop_margins,
+        min_ink_coverage,
+        backend,
+        quantisation,
+        models_dir,
+        image_format=image_format,
+    )
+
+    if buffer_args:
+        _worker_buffer = PageBuffer.attach(*buffer_args)
+
+
+def _run_page(file_hash: str, page: int, threshold: int) -> tuple[Path, Path]:
+    """Recognise the text for one page in a worker process."""
+    return _worker_operation.run(file_hash, page, threshold)
+
+
+def _run_buffered_page(
+    file_hash: str,
+    page: int,
+    threshold: int,
+    page_slot: PageSlot,
+    keep_intermediates: bool,
+) -> tuple[Path, Path]:
+    """Recognise the text for one page image in the page buffer in a worker process."""
+    greyscale = _worker_buffer.read(page_slot)
+    return _worker_operation.run_greyscale(
+        file_hash, page, threshold, greyscale, keep_intermediates
+    )
+
+
+class Pool:
+    """Run the OCR for many pages using multiple processes."""
+
+    def __init__(
+        self,
+        logger: Logger,
+        base_path: Path,
+        workers: Optional[int] = None,
+        intra_op_threads: Optional[int] = None,
+        inter_op_threads: int = 1,
+        cpu_affinity: bool = False,
+        annotate: bool = False,
+        perceptual_hash: bool = False,
+        detection_resolution: Optional[float] = None,
+        crop_margins: bool = False,
+        min_ink_coverage: Optional[float] = None,
+        backend: str = "keras",
+        quantisation: str = "none",
+        models_dir: Optional[Path] = None,
+        fused: bool = False,
+        keep_intermediates: bool = False,
+        page_slots: Optional[int] = None,
+        image_format: Optional[ImageFormat] = None,
+    ):
+        cpu_count = os.cpu_count() or 1
+        workers = workers or cpu_count
+
+        if workers < 1:
+            raise ValueError(f"Workers must be 1 or more, not {workers}.")
+        if page_slots is not None and page_slots < 1:
+            raise ValueError(f"Page slots must be 1 or more, not {page_slots}.")
+
+        # share the cores between the workers,
+        # so the tensorflow thread pools do not compete for the same cores
+        if not intra_op_threads:
+            intra_op_threads = max(1, cpu_count // workers)
+
+        self._logger = logger
+        self._base_path = base_path
+        self._workers = workers
+        self._intra_op_threads = intra_op_threads
+        self._inter_op_threads = inter_op_threads
+        self._cpu_affinity = cpu_affinity
+        self._annotate = annotate
+        self._perceptual_hash = perceptual_hash
+        self._detection_resolution = detection_resolution
+        self._crop_margins = crop_margins
+        self._min_ink_coverage = min_ink_coverage
+        self._backend = backend
+        self._quantisation = quantisation
+        self._models_dir = models_dir
+
+        # the rendered page images can be read once in this process
+        # and given to the workers in shared memory
+        self._fused = fused
+        self._keep_intermediates = keep_intermediates
+        self._page_slots = page_slots or workers * 2
+        self._image_format = image_format
+        self._location = Location(logger, image_format)
+
+    def cpu_cores(self) -> Optional[list[list[int]]]:
+        """Get the cpu cores for each worker, if the cpu affinity is set."""
+        if not self._cpu_affinity:
+            return None
+
+        if hasattr(os, "sched_getaffinity"):
+            available = sorted(os.sched_getaffinity(0))
+        else:
+            available = list(range(os.cpu_count() or 1))
+
+        per_worker = max(1, len(available) // self._workers)
+        result = []
+        for index in range(self._workers):
+            start = (index * per_worker) % len(available)
+            end = start + per_worker
+            result.append(available[start:end])
+        return result
+
+    def run(
+        self, pages: Iterable[tuple[str, int, int]]
+    ) -> Iterable[tuple[str, int, int, Path, Path]]:
+        """
+        Recognise the text for each (file hash, page, threshold).
+        Yields (file hash, page, threshold, annotation file, predictions file)
+        as each page is finished.
+        When fused is set, each rendered page image is read in this process
+        and given to a worker using a slot in a shared page buffer.
+        The next page waits for a free slot when all the slots are in use.
+        """
+
+        pages = list(pages)
+        log_data = {
+            "pages": len(pages),
+            "workers": self._workers,
+            "intra_op_threads": self._intra_op_threads,
+            "inter_op_threads": self._inter_op_threads,
+            "cpu_affinity": self._cpu_affinity,
+            "detection_resolution": self._detection_resolution,
+            "crop_margins": self._crop_margins,
+            "backend": self._backend,
+            "quantisation": self._quantisation,
+            "fused": self._fused,
+        }
+        log_msg = ", ".join([f"{k}={v}" for k, v in log_data.items()])
+        self._logger.info(f"Running OCR pool using {log_msg}.")
+
+        # use spawn so each worker starts a fresh tensorflow
+        context = multiprocessing.get_context("spawn")
+        worker_counter = context.Value("i", 0)
+        buffer = None
+        if self._fused and pages:
+            height, width = self.page_shape(pages)
+            buffer = PageBuffer.create(self._logger, self._page_slots, height, width)
+
+        init_args = (
+            self._base_path,
+            self._intra_op_threads,
+            self._inter_op_threads,
+            self.cpu_cores(),
+            worker_counter,
+            self._logger.getEffectiveLevel(),
+            self._annotate,
+            self._perceptual_hash,
+            self._detection_resolution,
+            self._crop_margins,
+            self._min_ink_coverage,
+            self._backend,
+            self._quantisation,
+            self._models_dir,
+            self._image_format,
+            (buffer.name, buffer.slots, *buffer.shape) if buffer else None,
+        )
+
+        try:
+            with ProcessPoolExecutor(
+                max_workers=self._workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=init_args,
+            ) as executor:
+                if buffer:
+                    yield from self._run_buffered(executor, buffer, pages)
+                else:
+                    yield from self._run_files(executor, pages)
+        finally:
+            if buffer:
+                buffer.close()
+
+    def page_shape(self, pages: list[tuple[str, int, int]]) -> tuple[int, int]:
+        """Find the largest (height, width) of the rendered page images."""
+        loc = self._location
+        height = 1
+        width = 1
+        for file_hash, page, _ in pages:
+            image_file = loc.pdf_page_image_file(self._base_path, file_hash, page)
+
+            # only the image header is read
+            with Image.open(image_file) as img:
+                width = max(width, img.width)
+                height = max(height, img.height)
+        return height, width
+
+    def _run_files(
+        self, executor: Executor, pages: list[tuple[str, int, int]]
+    ) -> Iterable[tuple[str, int, int, Path, Path]]:
+        """Recognise the text for each page in the prepared image files."""
+        futures = {
+            executor.submit(_run_page, file_hash, page, threshold): (
+                file_hash,
+                page,
+                threshold,
+            )
+            for file_hash, page, threshold in pages
+        }
+        for future in as_completed(futures):
+            file_hash, page, threshold = futures[future]
+            annotation_file, predictions_file = future.result()
+            yield file_hash, page, threshold, annotation_file, predictions_file
+
+    def _run_buffered(
+        self,
+        executor: Executor,
+        buffer: PageBuffer,
+        pages: list[tuple[str, int, int]],
+    ) -> Iterable[tuple[str, int, int, Path, Path]]:
+        """Recognise the text for each page, using the page buffer."""
+        loc = self._location
+        prepare = PrepareComponent(self._logger, self._image_format)
+        completed = queue.Queue()
+        stop = threading.Event()
+
+        def finished(item: tuple[str, int, int], slot: int, future: Future) -> None:
+            # the worker has finished with the page image, so the slot can be used
+            buffer.release(slot)
+            completed.put((item, future))
+
+        def produce() -> None:
+            try:
+                for item in pages:
+                    file_hash, page, threshold = item
+                    slot = None
+                    while slot is None:
+                        if stop.is_set():
+                            return
+                        try:
+                            slot = buffer.acquire(timeout=0.1)
+                        except TimeoutError:
+                            continue
+
+                    try:
+                        image_file = loc.pdf_page_image_file(
+                            self._base_path, file_hash, page
+                        )
+                        page_slot = buffer.write(
+                            slot, prepare.read_greyscale(image_file)
+                        )
+                        future = executor.submit(
+                            _run_buffered_page,
+                            file_hash,
+                            page,
+                            threshold,
+                            page_slot,
+                            self._keep_intermediates,
+                        )
+                    except Exception:
+                        buffer.release(slot)
+                        raise
+                    future.add_done_callback(functools.partial(finished, item, slot))
+            except Exception as error:
+                completed.put(error)
+
+        producer = threading.Thread(target=produce, name="ocr-page-buffer", daemon=True)
+        producer.start()
+        try:
+            for _ in range(len(pages)):
+                result = completed.get()
+                if isinstance(result, Exception):
+                    raise result
+                (file_hash, page, threshold), future = result
+                annotation_file, predictions_file = future.result()
+                yield file_hash, page, threshold, annotation_file, predictions_file
+        finally:
+            stop.set()
+            producer.join()
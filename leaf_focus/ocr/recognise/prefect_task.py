@@ -1,17 +1,23 @@
 from pathlib import Path
+from typing import Optional
 
 from prefect import Task
 
 from leaf_focus.ocr.recognise.operation import Operation
+from leaf_focus.ocr.recognise.service import Address, Client
+from leaf_focus.pdf.images.image_format import ImageFormat
+from leaf_focus.support.location import Location
 
 
 class OcrRecogniseTask(Task):
     """A Prefect task to run the ocr recognise operation."""
 
-    def __init__(self, base_path: Path, **kwargs):
+    def __init__(
+        self, base_path: Path, image_format: Optional[ImageFormat] = None, **kwargs
+    ):
         kwargs = {**kwargs, "name": "ocr.recognise"}
         super().__init__(**kwargs)
-        self._operation = Operation(self.logger, base_path)
+        self._operation = Operation(self.logger, base_path, image_format=image_format)
 
     # noinspection PyMethodOverriding
     def run(self, input_item: tuple[str, int], threshold: int) -> tuple[Path, Path]:
@@ -21,3 +27,32 @@ class OcrRecogniseTask(Task):
             file_hash, page, threshold
         )
         return annotation_path, predictions_path
+
+
+class OcrRecogniseServiceTask(Task):
+    """A Prefect task that sends pages to a running OCR service."""
+
+    def __init__(self, base_path: Path, address: Address, **kwargs):
+        kwargs = {**kwargs, "name": "ocr.recognise.service"}
+        super().__init__(**kwargs)
+        self._address = address
+        self._key_file = Location(self.logger).ocr_service_key_file(base_path)
+
+    # noinspection PyMethodOverriding
+    def run(
+        self,
+        input_item: tuple[str, int],
+        threshold: int,
+        thresholds: Optional[list[int]] = None,
+    ) -> tuple[Path, Path]:
+        """
+        Run the task.
+        When thresholds are given, the threshold is used
+        instead of the threshold chosen for the pdf.
+        """
+        file_hash, page = input_item
+        client = Client(self._address, self._key_file)
+        annotation_path, predictions_path = client.recognise(
+            file_hash, page, threshold, exact=bool(thresholds)
+        )
+        return annotation_path, predictions_path
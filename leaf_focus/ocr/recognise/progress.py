@@ -0,0 +1,72 @@
+import threading
+import time
+from collections import Counter
+from typing import Callable, Iterable, Optional
+
+
+class Progress:
+    """Track the OCR progress for each pdf and the overall throughput."""
+
+    def __init__(
+        self,
+        pages: list[tuple[str, int, int]],
+        done_count: int = 0,
+        report: Optional[Callable[[str], None]] = None,
+    ):
+        self._totals = Counter([file_hash for file_hash, _, _ in pages])
+        self._finished = Counter()
+        self._total = len(pages)
+        self._count = 0
+        self._done_count = done_count
+        self._report = report
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+
+    @property
+    def count(self) -> int:
+        """The number of pages finished in this run."""
+        return self._count
+
+    def update(self, items: Iterable[tuple[str, int, int]]) -> None:
+        """Record finished pages. This can be called from any thread."""
+        with self._lock:
+            for file_hash, _, _ in items:
+                self._count += 1
+                self._finished[file_hash] += 1
+                if self._report:
+                    self._report(self.message(file_hash))
+
+    def message(self, file_hash: str) -> str:
+        """Describe the progress for a pdf and for the whole run."""
+        finished = self._finished[file_hash]
+        total = self._totals[file_hash]
+        state = "finished" if finished >= total else "in progress"
+        return (
+            f"Pdf '{file_hash[0:15]}' {state}, {finished} of {total} pages. "
+            f"Overall {self._count} of {self._total} pages "
+            f"({self.pages_per_second():.2f} pages/s)."
+        )
+
+    def pages_per_second(self) -> float:
+        seconds = time.perf_counter() - self._start
+        return self._count / seconds if seconds > 0 else 0.0
+
+    def summary(self, cached: Optional[int] = None) -> str:
+        """
+        Describe the throughput for the whole run.
+        The finished pages include the pages that used the result cache,
+        which are described when the number of cached pages is given.
+        """
+        seconds = time.perf_counter() - self._start
+        rate = self.pages_per_second()
+        result = (
+            f"Finished {self._count} of {self._total} pending pages "
+            f"from {len(self._totals)} pdfs in {seconds:.1f} seconds "
+            f"({rate:.2f} pages/s, {rate * 3600:.0f} pages/hour). "
+        )
+        if cached is not None:
+            result += (
+                f"Recognised {self._count - cached} pages "
+                f"and used the result cache for {cached} pages. "
+            )
+        return result + f"{self._done_count} pages were already done."
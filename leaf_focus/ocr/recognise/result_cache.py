@@ -0,0 +1,137 @@
+import hashlib
+import os
+import shutil
+from logging import Logger
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from leaf_focus.ocr.recognise.page_items import PageItems
+from leaf_focus.pdf.identify.component import Component as IdentifyComponent
+from leaf_focus.support.location import Location
+
+
+class ResultCache:
+    """
+    Store the OCR predictions by the content of the prepared page image
+    and the OCR settings, so identical pages in different pdfs are only
+    recognised once for the same settings.
+    """
+
+    perceptual_hash_size = 16
+    """The width and height of the grid used for the perceptual hash."""
+
+    def __init__(self, logger: Logger, base_path: Path, perceptual: bool = False):
+        self._logger = logger
+        self._base_path = base_path
+        self._location = Location(logger)
+        self._identify = IdentifyComponent(logger)
+
+        # the perceptual hash also matches images that are rendered
+        # slightly differently, so it is only used when requested
+        self._perceptual = perceptual
+
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hash_type(self) -> str:
+        return "dhash" if self._perceptual else "sha256"
+
+    def image_hash(self, image_file: Path) -> str:
+        """Calculate the key for an image file."""
+        if self._perceptual:
+            return self.perceptual_hash(image_file)
+        return self._identify.file_hash(image_file)
+
+    def perceptual_hash(self, image_file: Path) -> str:
+        """Calculate the difference hash (dHash) of an image file."""
+        size = self.perceptual_hash_size
+        with Image.open(image_file) as image:
+            small = image.convert("L").resize((size + 1, size), Image.BILINEAR)
+        pixels = np.asarray(small, dtype=np.int16)
+        brighter = pixels[:, 1:] > pixels[:, :-1]
+        return np.packbits(brighter.reshape(-1)).tobytes().hex()
+
+    def cache_key(self, image_hash: str, settings: str) -> str:
+        """
+        Calculate the cache key for an image and the OCR settings.
+        Predictions made using other settings are not used.
+        """
+        if not settings:
+            return image_hash
+        content = f"{image_hash}\n{settings}".encode("utf8")
+        return hashlib.sha256(content).hexdigest()
+
+    def restore(
+        self, image_hash: str, predictions_file: Path, settings: str = ""
+    ) -> bool:
+        """
+        Link or copy the cached predictions to the predictions file.
+        Returns True if the predictions were in the cache for the settings.
+        """
+        cache_file = self._cache_file(image_hash, settings)
+        if not cache_file.exists():
+            self.misses += 1
+            return False
+
+        self._location.create_directory(predictions_file.parent)
+        self._link_or_copy(cache_file, predictions_file)
+
+        cache_binary = PageItems.binary_path(cache_file)
+        if cache_binary.exists():
+            self._link_or_copy(cache_binary, PageItems.binary_path(predictions_file))
+
+        self.hits += 1
+        self._logger.info(
+            f"Using cached OCR predictions '{cache_file.name}' for "
+            f"'{predictions_file.parent.name}' '{predictions_file.name}'."
+        )
+        return True
+
+    def store(
+        self,
+        image_hash: str,
+        predictions_file: Path,
+        replace: bool = False,
+        settings: str = "",
+    ) -> None:
+        """Add the predictions for an image made using the settings to the cache."""
+        cache_file = self._cache_file(image_hash, settings)
+        if cache_file.exists() and not replace:
+            return
+
+        # other predictions files might be hard links to the cache files,
+        # so replace the cache files instead of writing to them
+        self._location.create_directory(cache_file.parent)
+        self._replace(predictions_file, cache_file)
+
+        binary_file = PageItems.binary_path(predictions_file)
+        if binary_file.exists():
+            self._replace(binary_file, PageItems.binary_path(cache_file))
+
+    def summary(self) -> str:
+        total = self.hits + self.misses
+        return (
+            f"OCR result cache had {self.hits} hits and {self.misses} misses "
+            f"from {total} pages."
+        )
+
+    def _cache_file(self, image_hash: str, settings: str) -> Path:
+        return self._location.ocr_result_cache_file(
+            self._base_path, self.cache_key(image_hash, settings), self.hash_type
+        )
+
+    def _replace(self, source: Path, target: Path) -> None:
+        if target.exists():
+            target.unlink()
+        shutil.copyfile(source, target)
+
+    def _link_or_copy(self, source: Path, target: Path) -> None:
+        if target.exists():
+            target.unlink()
+        try:
+            os.link(source, target)
+        except OSError:
+            shutil.copyfile(source, target)
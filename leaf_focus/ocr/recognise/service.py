@@ -0,0 +1,252 @@
+import os
+import queue
+import secrets
+import threading
+from dataclasses import dataclass, field
+from logging import Logger
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client as ConnectionClient
+from multiprocessing.connection import Connection, Listener
+from pathlib import Path
+from typing import Optional, Union
+
+from leaf_focus.ocr.recognise.operation import Operation
+
+Address = Union[str, tuple[str, int]]
+
+
+@dataclass
+class Job:
+    """One page to recognise, and the outcome once it has been recognised."""
+
+    file_hash: str
+    page: int
+    threshold: int
+    exact: bool = False
+    """Use the threshold instead of the threshold chosen for the pdf."""
+
+    done: threading.Event = field(default_factory=threading.Event)
+    annotation_file: Optional[Path] = None
+    predictions_file: Optional[Path] = None
+    error: Optional[str] = None
+
+
+class Service:
+    """
+    A long-lived local OCR worker.
+    The OCR model is loaded once, and pages are recognised as clients send them.
+    A new key is created each time the service starts, and saved to the key file.
+    Only clients that can read the key file can connect.
+    """
+
+    def __init__(
+        self,
+        logger: Logger,
+        operation: Operation,
+        address: Address,
+        key_file: Path,
+        batch_size: int = 4,
+        batch_wait: float = 0.5,
+    ):
+        if not address:
+            raise ValueError("Must supply address.")
+        if not key_file:
+            raise ValueError("Must supply key file.")
+        if batch_size < 1:
+            raise ValueError(f"Batch size must be 1 or more, not {batch_size}.")
+
+        self._logger = logger
+        self._operation = operation
+        self._address = address
+        self._key_file = key_file
+        self._authkey = None  # type: Optional[bytes]
+        self._batch_size = batch_size
+        self._batch_wait = batch_wait
+
+        self._jobs = queue.Queue()  # type: queue.Queue[Job]
+        self._stopping = threading.Event()
+
+    def serve(self) -> None:
+        """Accept page jobs until a client asks the service to stop."""
+
+        worker = threading.Thread(target=self._process, daemon=True)
+        worker.start()
+
+        # remove a unix socket file left behind by a service that did not stop
+        if isinstance(self._address, str) and Path(self._address).is_socket():
+            self._logger.warning(f"Removing existing socket '{self._address}'.")
+            Path(self._address).unlink()
+
+        self._authkey = self.create_key(self._key_file)
+        self._logger.info(f"OCR service listening on '{self._address}'.")
+
+        try:
+            with Listener(self._address, authkey=self._authkey) as listener:
+                while not self._stopping.is_set():
+                    try:
+                        conn = listener.accept()
+                    except (OSError, AuthenticationError) as e:
+                        self._logger.warning(f"OCR service connection failed: {e}.")
+                        continue
+                    if self._stopping.is_set():
+                        conn.close()
+                        break
+                    handler = threading.Thread(
+                        target=self._handle, args=(conn,), daemon=True
+                    )
+                    handler.start()
+        finally:
+            self._key_file.unlink(missing_ok=True)
+
+        self._logger.info("OCR service stopped.")
+
+    @classmethod
+    def create_key(cls, key_file: Path) -> bytes:
+        """Create a new random key and save it to a file only the owner can read."""
+        key = secrets.token_hex(32).encode("ascii")
+        key_file.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(key_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(key)
+        # the mode is not changed when the file already existed
+        os.chmod(key_file, 0o600)
+        return key
+
+    @classmethod
+    def read_key(cls, key_file: Path) -> bytes:
+        """Read the key of the running service."""
+        return key_file.read_bytes().strip()
+
+    def _handle(self, conn: Connection) -> None:
+        """Receive requests from one client connection."""
+        with conn:
+            while True:
+                try:
+                    message = conn.recv()
+                except EOFError:
+                    return
+
+                command = message[0]
+                if command == "stop":
+                    conn.send(("ok",))
+                    self._stop()
+                    return
+
+                if command != "recognise":
+                    conn.send(("error", f"Unknown command '{command}'."))
+                    continue
+
+                _, file_hash, page, threshold, exact = message
+                job = Job(
+                    file_hash=file_hash, page=page, threshold=threshold, exact=exact
+                )
+                self._jobs.put(job)
+                job.done.wait()
+
+                if job.error:
+                    conn.send(("error", job.error))
+                else:
+                    conn.send(("ok", job.annotation_file, job.predictions_file))
+
+    def _process(self) -> None:
+        """Recognise the queued pages, collecting waiting jobs into batches."""
+        while True:
+            batch = [self._jobs.get()]
+            while len(batch) < self._batch_size:
+                try:
+                    batch.append(self._jobs.get(timeout=self._batch_wait))
+                except queue.Empty:
+                    break
+
+            self._run_batch(batch)
+            for job in batch:
+                job.done.set()
+
+    def _run_batch(self, batch: list[Job]) -> None:
+        """
+        Recognise a batch of jobs.
+        When the batch fails, each job is recognised on its own,
+        so only the jobs that fail are given the error.
+        """
+        op = self._operation
+        pages = [
+            (
+                j.file_hash,
+                j.page,
+                j.threshold
+                if j.exact
+                else op.chosen_threshold(j.file_hash, j.threshold),
+            )
+            for j in batch
+        ]
+        try:
+            results = op.run_pages(pages, self._batch_size, use_chosen=False)
+            for job, (annotation_file, predictions_file) in zip(batch, results):
+                job.annotation_file = annotation_file
+                job.predictions_file = predictions_file
+        except Exception as e:
+            if len(batch) > 1:
+                self._logger.warning(
+                    f"OCR service could not recognise {len(batch)} pages "
+                    f"together, recognising each page on its own: {e}."
+                )
+                for job in batch:
+                    self._run_batch([job])
+                return
+
+            self._logger.exception("OCR service could not recognise pages.")
+            batch[0].error = f"{e.__class__.__name__}: {e}"
+
+    def _stop(self) -> None:
+        self._stopping.set()
+
+        # connect to the listener to wake up the blocking accept
+        try:
+            ConnectionClient(self._address, authkey=self._authkey).close()
+        except OSError:
+            pass
+
+
+class Client:
+    """Send page jobs to a running OCR service."""
+
+    def __init__(self, address: Address, key_file: Path):
+        if not address:
+            raise ValueError("Must supply address.")
+        if not key_file:
+            raise ValueError("Must supply key file.")
+        self._address = address
+        self._key_file = key_file
+
+    def recognise(
+        self, file_hash: str, page: int, threshold: int, exact: bool = False
+    ) -> tuple[Path, Path]:
+        """
+        Recognise the text for a page and wait for the result.
+        The threshold chosen for the pdf is used, unless exact is set.
+        """
+        result = self._send(("recognise", file_hash, page, threshold, exact))
+        _, annotation_file, predictions_file = result
+        return annotation_file, predictions_file
+
+    def stop(self) -> None:
+        """Ask the OCR service to stop."""
+        self._send(("stop",))
+
+    def _send(self, message: tuple) -> tuple:
+        try:
+            # the key changes each time the service starts
+            authkey = Service.read_key(self._key_file)
+            conn = ConnectionClient(self._address, authkey=authkey)
+        except (OSError, AuthenticationError) as e:
+            raise ValueError(
+                f"Could not connect to OCR service at '{self._address}': {e}."
+            ) from e
+
+        with conn:
+            conn.send(message)
+            result = conn.recv()
+
+        if result[0] == "error":
+            raise ValueError(f"OCR service error: {result[1]}")
+        return result
@@ -0,0 +1,245 @@
+import json
+import os
+from logging import Logger
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from leaf_focus.ocr.recognise.model_store import ModelStore
+from leaf_focus.support.location import Location
+
+
+def ctc_greedy_decode(probabilities: np.ndarray, alphabet: str) -> list[str]:
+    """
+    Decode the recognizer output using the best character at each step.
+    The probabilities have the shape (images, steps, characters + 1),
+    where the last character is the CTC blank.
+    """
+    blank = len(alphabet)
+    best = np.asarray(probabilities).argmax(axis=-1)
+
+    # keep the first of each repeated character, then drop the blanks
+    keep = np.ones(best.shape, dtype=bool)
+    keep[:, 1:] = best[:, 1:] != best[:, :-1]
+    keep &= best != blank
+
+    return ["".join([alphabet[i] for i in row[k]]) for row, k in zip(best, keep)]
+
+
+class TfliteModel:
+    """Run a TFLite model using the TFLite interpreter."""
+
+    def __init__(self, model_file: Path, num_threads: Optional[int] = None):
+        import tensorflow as tf
+
+        self._interpreter = tf.lite.Interpreter(
+            model_path=str(model_file), num_threads=num_threads
+        )
+        self._input = self._interpreter.get_input_details()[0]
+        self._output = self._interpreter.get_output_details()[0]
+        self._shape = None
+
+    @property
+    def input_shape(self) -> tuple:
+        """The model input shape, with -1 for the dimensions that can change."""
+        return tuple(self._input["shape_signature"])
+
+    def predict(self, inputs: np.ndarray) -> np.ndarray:
+        inputs = np.asarray(inputs, dtype=np.float32)
+
+        # the tensors only need to be allocated again when the input shape changes
+        if self._shape != inputs.shape:
+            self._interpreter.resize_tensor_input(self._input["index"], inputs.shape)
+            self._interpreter.allocate_tensors()
+            self._shape = inputs.shape
+
+        self._interpreter.set_tensor(self._input["index"], inputs)
+        self._interpreter.invoke()
+        return self._interpreter.get_tensor(self._output["index"])
+
+
+class TfliteDetector:
+    """Find text boxes using the keras-ocr detector converted to TFLite."""
+
+    def __init__(self, model: TfliteModel):
+        self._model = model
+
+    def detect(
+        self,
+        images: np.ndarray,
+        detection_threshold: float = 0.7,
+        text_threshold: float = 0.4,
+        link_threshold: float = 0.4,
+        size_threshold: int = 10,
+    ) -> list[np.ndarray]:
+        """Find the text boxes in a batch of images that are all the same size."""
+        from keras_ocr import detection
+
+        inputs = np.array([detection.compute_input(image) for image in images])
+        return detection.getBoxes(
+            self._model.predict(inputs),
+            detection_threshold=detection_threshold,
+            text_threshold=text_threshold,
+            link_threshold=link_threshold,
+            size_threshold=size_threshold,
+        )
+
+
+class TfliteRecognizer:
+    """Recognise text using the keras-ocr recognizer converted to TFLite."""
+
+    def __init__(self, model: TfliteModel, alphabet: str):
+        self._model = model
+        self._alphabet = alphabet
+
+    def recognize_from_boxes(
+        self, images: list[np.ndarray], box_groups: list[np.ndarray]
+    ) -> list[list[str]]:
+        """Recognise the text in each box of each image."""
+        import cv2
+        from keras_ocr import tools
+
+        _, height, width, channels = self._model.input_shape
+
+        crops = []
+        start_end = []
+        for image, boxes in zip(images, box_groups):
+            if channels == 1 and image.shape[-1] == 3:
+                image = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+            for box in boxes:
+                crops.append(
+                    tools.warpBox(
+                        image=image, box=box, target_height=height, target_width=width
+                    )
+                )
+            start = start_end[-1][1] if start_end else 0
+            start_end.append((start, start + len(boxes)))
+
+        if not crops:
+            return [[] for _ in images]
+
+        inputs = np.float32(crops) / 255
+        if inputs.ndim == 3:
+            inputs = inputs[..., np.newaxis]
+
+        words = ctc_greedy_decode(self._model.predict(inputs), self._alphabet)
+        return [words[start:end] for start, end in start_end]
+
+
+class TflitePipeline:
+    """
+    An OCR backend that runs the keras-ocr models using the TFLite interpreter.
+    The keras-ocr models are converted to TFLite the first time they are needed,
+    with optional post-training quantisation.
+    """
+
+    quantisations = ["none", "float16", "int8"]
+    """
+    The available quantisations.
+    int8 uses dynamic range quantisation, so the weights are stored as int8
+    and the inputs and outputs stay as float.
+    """
+
+    def __init__(
+        self,
+        logger: Logger,
+        model_store: ModelStore,
+        quantisation: str = "none",
+        num_threads: Optional[int] = None,
+    ):
+        if quantisation not in self.quantisations:
+            raise ValueError(
+                f"Quantisation must be one of {', '.join(self.quantisations)}, "
+                f"not '{quantisation}'."
+            )
+
+        self._logger = logger
+        self._model_store = model_store
+        self._location = Location(logger)
+        self._quantisation = quantisation
+        self._num_threads = num_threads
+        self._detector = None  # type: Optional[TfliteDetector]
+        self._recognizer = None  # type: Optional[TfliteRecognizer]
+
+    @property
+    def name(self) -> str:
+        return f"tflite-{self._quantisation}"
+
+    @property
+    def detector(self) -> TfliteDetector:
+        if self._detector is None:
+            model_file = self.model_file("detector")
+            if not model_file.exists():
+                self.convert_models()
+            self._detector = TfliteDetector(TfliteModel(model_file, self._num_threads))
+        return self._detector
+
+    @property
+    def recognizer(self) -> TfliteRecognizer:
+        if self._recognizer is None:
+            model_file = self.model_file("recognizer")
+            if not model_file.exists():
+                self.convert_models()
+            with open(model_file.with_suffix(".json"), "rt", encoding="utf8") as f:
+                alphabet = json.load(f)["alphabet"]
+            self._recognizer = TfliteRecognizer(
+                TfliteModel(model_file, self._num_threads), alphabet
+            )
+        return self._recognizer
+
+    def model_file(self, name: str) -> Path:
+        return self._model_store.tflite_file(name, self._quantisation)
+
+    def convert_models(self) -> None:
+        """Convert the pretrained keras-ocr models to TFLite models."""
+        os.environ["TF_CPP_MIN_LOG_LEVEL"] = "2"
+
+        import keras_ocr
+
+        self._logger.info(
+            f"Converting the OCR models to TFLite with quantisation "
+            f"'{self._quantisation}'."
+        )
+
+        detector_file = self.model_file("detector")
+        recognizer_file = self.model_file("recognizer")
+        self._location.create_directory(detector_file.parent)
+
+        # use the weights in the model store if they are available,
+        # otherwise keras-ocr will automatically download the pretrained weights
+        store = self._model_store
+        if store.has_weights():
+            detector = store.load_detector()
+            recognizer = store.load_recognizer()
+        else:
+            detector = keras_ocr.detection.Detector()
+            recognizer = keras_ocr.recognition.Recognizer()
+
+        detector_file.write_bytes(self.convert_model(detector.model))
+
+        # the recognizer prediction model includes the CTC decoding,
+        # which is done using numpy instead, so convert only the backbone
+        recognizer_file.write_bytes(self.convert_model(recognizer.backbone))
+        with open(recognizer_file.with_suffix(".json"), "wt", encoding="utf8") as f:
+            json.dump({"alphabet": recognizer.alphabet}, f, indent=2)
+
+    def convert_model(self, model) -> bytes:
+        """Convert a keras model to a TFLite model."""
+        import tensorflow as tf
+
+        converter = tf.lite.TFLiteConverter.from_keras_model(model)
+
+        # the recurrent layers of the recognizer might need the tensorflow ops
+        converter.target_spec.supported_ops = [
+            tf.lite.OpsSet.TFLITE_BUILTINS,
+            tf.lite.OpsSet.SELECT_TF_OPS,
+        ]
+
+        if self._quantisation == "float16":
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            converter.target_spec.supported_types = [tf.float16]
+        elif self._quantisation == "int8":
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+
+        return converter.convert()
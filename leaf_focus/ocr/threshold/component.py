@@ -0,0 +1,97 @@
+import re
+from logging import Logger
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+from PIL import Image
+
+from leaf_focus.ocr.threshold.item import ThresholdScore
+
+
+class Component:
+    """Choose the threshold for preparing the pages of a pdf."""
+
+    _word_re = re.compile(r"^[a-z0-9]{2,}$", re.IGNORECASE)
+
+    def __init__(self, logger: Logger):
+        self._logger = logger
+
+    def otsu(self, image_file: Path) -> int:
+        """
+        Estimate the threshold that best separates the text from the background,
+        using Otsu's method on the greyscale histogram of the image.
+        """
+        if not image_file:
+            raise ValueError("Must supply image file.")
+        if not image_file.exists():
+            raise FileNotFoundError(f"Image file does not exist '{image_file}'.")
+
+        with Image.open(image_file) as img:
+            histogram = np.array(img.convert("L").histogram(), dtype=np.float64)
+        return self.otsu_histogram(histogram)
+
+    @classmethod
+    def otsu_histogram(cls, histogram: np.ndarray) -> int:
+        """
+        Find the threshold that maximises the variance between the pixels
+        at or below the threshold and the pixels above it.
+        """
+        total = histogram.sum()
+        if total <= 0:
+            raise ValueError("Must supply a histogram with at least one pixel.")
+
+        levels = np.arange(len(histogram))
+        weight_dark = np.cumsum(histogram)
+        weight_light = total - weight_dark
+        sum_dark = np.cumsum(histogram * levels)
+        sum_total = sum_dark[-1]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean_dark = sum_dark / weight_dark
+            mean_light = (sum_total - sum_dark) / weight_light
+            between = weight_dark * weight_light * (mean_dark - mean_light) ** 2
+
+        between = np.nan_to_num(between, nan=0.0, posinf=0.0, neginf=0.0)
+        return int(np.argmax(between))
+
+    def sample(self, pages: list[int], count: int) -> list[int]:
+        """Choose pages spread evenly through the pdf."""
+        if count < 1:
+            raise ValueError(f"Sample size must be 1 or more, not {count}.")
+        pages = sorted(pages)
+        if count >= len(pages):
+            return pages
+        step = len(pages) / count
+        return sorted({pages[int(step * index + step / 2)] for index in range(count)})
+
+    def candidates(self, thresholds: Iterable[int], otsu: int) -> list[int]:
+        """Combine the given thresholds and the Otsu estimate."""
+        result = sorted({int(t) for t in thresholds} | {int(otsu)})
+        for threshold in result:
+            if threshold < 0 or threshold > 255:
+                raise ValueError(f"Threshold must between 0 and 255, not {threshold}.")
+        return result
+
+    def score(self, threshold: int, texts: Iterable[Iterable[str]]) -> ThresholdScore:
+        """Count the recognised words in the sample pages."""
+        words = [w for page in texts for w in page if w and self._word_re.match(w)]
+        return ThresholdScore(
+            threshold=threshold,
+            word_count=len(words),
+            char_count=sum([len(w) for w in words]),
+        )
+
+    def choose(self, scores: list[ThresholdScore], preferred: int) -> int:
+        """
+        Choose the threshold that recognised the most words.
+        Ties are broken by the most characters,
+        then by the threshold closest to the preferred threshold.
+        """
+        if not scores:
+            raise ValueError("Must supply threshold scores.")
+        best = max(
+            scores,
+            key=lambda s: (s.word_count, s.char_count, -abs(s.threshold - preferred)),
+        )
+        return best.threshold
@@ -0,0 +1,82 @@
+import dataclasses
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from leaf_focus.support.serialise import LeafFocusJsonEncoder, LeafFocusJsonDecoder
+
+
+@dataclass
+class ThresholdScore:
+    """The OCR result of the sample pages for one threshold."""
+
+    threshold: int
+    """The threshold used to prepare the sample pages."""
+
+    word_count: int
+    """The number of recognised words in the sample pages."""
+
+    char_count: int
+    """The number of characters in the recognised words."""
+
+
+@dataclass
+class Item:
+    """The threshold chosen for preparing the pages of a pdf."""
+
+    file_hash: str
+    threshold: int
+    """The chosen threshold."""
+
+    otsu: Optional[int] = None
+    """The threshold estimated from the histogram of the sample pages."""
+
+    pages: list[int] = field(default_factory=list)
+    """The sample pages."""
+
+    scores: list[ThresholdScore] = field(default_factory=list)
+    """The score of each candidate threshold. Empty if OCR was not used."""
+
+    def write(self, path: Path) -> None:
+        with open(path, "wt") as f:
+            item_dict = dataclasses.asdict(self)
+            json.dump(item_dict, f, indent=2, cls=LeafFocusJsonEncoder)
+
+    @classmethod
+    def read(cls, path: Path) -> "Item":
+        with open(path, "rt") as f:
+            item_dict = json.load(f, cls=LeafFocusJsonDecoder)
+            return Item(
+                file_hash=item_dict["file_hash"],
+                threshold=item_dict["threshold"],
+                otsu=item_dict.get("otsu"),
+                pages=item_dict.get("pages") or [],
+                scores=[ThresholdScore(**s) for s in item_dict.get("scores") or []],
+            )
+
+
+@dataclass
+class RetryItem:
+    """The thresholds used to recognise pages of a pdf again."""
+
+    file_hash: str
+    pages: dict[int, int] = field(default_factory=dict)
+    """The threshold used for each page that was recognised again."""
+
+    def write(self, path: Path) -> None:
+        with open(path, "wt") as f:
+            item_dict = dataclasses.asdict(self)
+            json.dump(item_dict, f, indent=2, cls=LeafFocusJsonEncoder)
+
+    @classmethod
+    def read(cls, path: Path) -> "RetryItem":
+        with open(path, "rt") as f:
+            item_dict = json.load(f, cls=LeafFocusJsonDecoder)
+            return RetryItem(
+                file_hash=item_dict["file_hash"],
+                pages={
+                    int(page): threshold
+                    for page, threshold in (item_dict.get("pages") or {}).items()
+                },
+            )
@@ -0,0 +1,175 @@
+import tempfile
+from logging import Logger
+from pathlib import Path
+from statistics import median
+from typing import Iterable, Optional
+
+from leaf_focus.ocr.plan.operation import Operation as PlanOperation
+from leaf_focus.ocr.prepare.component import Component as PrepareComponent
+from leaf_focus.ocr.recognise.component import Component as RecogniseComponent
+from leaf_focus.ocr.threshold.component import Component
+from leaf_focus.ocr.threshold.item import Item, RetryItem, ThresholdScore
+from leaf_focus.pdf.identify.item import Item as PdfIdentifyItem
+from leaf_focus.pdf.images.item import Item as ImageItem
+from leaf_focus.support.location import Location
+
+
+class Operation:
+    """A pipeline building block that creates and reads the ocr threshold files."""
+
+    def __init__(
+        self,
+        logger: Logger,
+        base_path: Path,
+        recognise: Optional[RecogniseComponent] = None,
+    ):
+        """
+        The recognise component is used to score the candidate thresholds.
+        Without it, the threshold is estimated from the page histograms only.
+        """
+        self._logger = logger
+        self._base_path = base_path
+        self._location = Location(logger)
+        self._component = Component(logger)
+        self._prepare = PrepareComponent(logger)
+        self._recognise = recognise
+        self._plan = PlanOperation(logger, base_path)
+        self._thresholds = {}  # type: dict[str, Optional[Item]]
+
+    def run(
+        self,
+        file_hash: str,
+        threshold: int,
+        candidates: Iterable[int] = (),
+        sample_size: int = 3,
+    ) -> Optional[Path]:
+        """
+        Choose the threshold for a pdf by preparing a sample of its pages
+        using each candidate threshold and the Otsu estimate,
+        then keeping the threshold that recognises the most words.
+        The given threshold is preferred when the scores are equal.
+        """
+        loc = self._location
+        bd = self._base_path
+        threshold_file = loc.ocr_threshold_file(bd, file_hash)
+
+        pages = self.find_pages(file_hash)
+        if not pages:
+            self._logger.warning(
+                f"Cannot choose ocr threshold without page images "
+                f"for '{file_hash[0:15]}'."
+            )
+            return None
+
+        sample = self._component.sample(pages, sample_size)
+        image_files = [loc.pdf_page_image_file(bd, file_hash, p) for p in sample]
+        otsu = int(median([self._component.otsu(f) for f in image_files]))
+
+        if self._recognise is None:
+            item = Item(file_hash=file_hash, threshold=otsu, otsu=otsu, pages=sample)
+        else:
+            scores = [
+                self._score(image_files, candidate)
+                for candidate in self._component.candidates(
+                    [threshold, *candidates], otsu
+                )
+            ]
+            item = Item(
+                file_hash=file_hash,
+                threshold=self._component.choose(scores, threshold),
+                otsu=otsu,
+                pages=sample,
+                scores=scores,
+            )
+
+        item.write(threshold_file)
+        self._thresholds[file_hash] = item
+
+        self._logger.info(
+            f"Chose ocr threshold {item.threshold} (Otsu {otsu}) "
+            f"using {len(sample)} pages of '{file_hash[0:15]}'."
+        )
+        return threshold_file
+
+    def run_many(
+        self,
+        threshold: int,
+        candidates: Iterable[int] = (),
+        sample_size: int = 3,
+        rescan: bool = False,
+    ) -> list[Item]:
+        """
+        Choose the threshold for all the pdfs.
+        Pdfs that already have a threshold are skipped, unless rescan is set.
+        """
+        candidates = list(candidates)
+        result = []
+        for file_hash in self.find_identified():
+            if not rescan and self.read(file_hash):
+                result.append(self._thresholds[file_hash])
+                continue
+            if self.run(file_hash, threshold, candidates, sample_size):
+                result.append(self._thresholds[file_hash])
+        return result
+
+    def find_identified(self) -> Iterable[str]:
+        """Find the hash of all the identified pdfs."""
+        for json_path in self._base_path.rglob("pdf-identify.json"):
+            yield PdfIdentifyItem.read(json_path).file_hash
+
+    def find_pages(self, file_hash: str) -> list[int]:
+        """Find the pages of a pdf that have an image and need OCR."""
+        store_dir = self._location.store_dir(self._base_path, file_hash)
+        if not store_dir.exists():
+            return []
+        # a page can be rendered in more than one image format
+        return sorted(
+            {
+                item.page
+                for item in ImageItem.load(store_dir)
+                if item.variety is None and self._plan.needs_ocr(file_hash, item.page)
+            }
+        )
+
+    def read(self, file_hash: str) -> Optional[Item]:
+        """Read the chosen threshold for a pdf, if there is one."""
+        if file_hash not in self._thresholds:
+            path = self._location.ocr_threshold_file(self._base_path, file_hash)
+            self._thresholds[file_hash] = Item.read(path) if path.exists() else None
+        return self._thresholds[file_hash]
+
+    def threshold(self, file_hash: str, default: int) -> int:
+        """Get the chosen threshold for a pdf, or the default if there is none."""
+        item = self.read(file_hash)
+        return default if item is None else item.threshold
+
+    def read_retry(self, file_hash: str) -> Optional[RetryItem]:
+        """Read the thresholds of the pages recognised again, if there are any."""
+        path = self._location.ocr_retry_file(self._base_path, file_hash)
+        return RetryItem.read(path) if path.exists() else None
+
+    def write_retry(self, file_hash: str, pages: Iterable[int], threshold: int) -> Path:
+        """Record the threshold used to recognise pages of a pdf again."""
+        path = self._location.ocr_retry_file(self._base_path, file_hash)
+        item = self.read_retry(file_hash) or RetryItem(file_hash=file_hash)
+        item.pages.update({page: threshold for page in pages})
+        item.pages = dict(sorted(item.pages.items()))
+        item.write(path)
+        return path
+
+    def _score(self, image_files: list[Path], threshold: int) -> ThresholdScore:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            prepared_files = []
+            for image_file in image_files:
+                prepared_file = Path(temp_dir) / f"{image_file.stem}-th-{threshold}.png"
+                self._prepare.threshold(image_file, prepared_file, threshold)
+                prepared_files.append(prepared_file)
+
+            predictions = self._recognise.predict(prepared_files)
+
+        score = self._component.score(threshold, [p.text for p in predictions])
+        self._logger.debug(
+            f"Threshold {threshold} recognised {score.word_count} words "
+            f"in {len(image_files)} sample pages."
+        )
+        return score
@@ -1,5 +1,6 @@
 import logging
 from pathlib import Path
+from typing import Optional
 
 import click
 
@@ -137,7 +138,7 @@ def pdf_text(exe_file: Path, input_file: Path, output_prefix: Path):
     "exe_file",
     required=True,
     type=Path,
-    help="Path to the xpdf pdftopng executable.",
+    help="Path to the xpdf pdftopng or pdftoppm executable.",
 )
 @click.option(
     "-i",
@@ -155,7 +156,30 @@ def pdf_text(exe_file: Path, input_file: Path, output_prefix: Path):
     type=Path,
     help="Path prefix for the output files.",
 )
-def pdf_images(exe_file: Path, input_file: Path, output_prefix: Path):
+@click.option(
+    "-n",
+    "--page-count",
+    "page_count",
+    type=click.IntRange(min=1),
+    default=None,
+    help="The number of pages in the pdf, used to split it into page ranges.",
+)
+@click.option(
+    "-w",
+    "--workers",
+    "workers",
+    type=click.IntRange(min=1),
+    default=1,
+    help="The number of page ranges to render at the same time, "
+    "when the page count is given. Default is 1.",
+)
+def pdf_images(
+    exe_file: Path,
+    input_file: Path,
+    output_prefix: Path,
+    page_count: Optional[int],
+    workers: int,
+):
     """Create images from pages of a pdf."""
 
     from leaf_focus.pdf.images.component import Component
@@ -164,7 +188,7 @@ def pdf_images(exe_file: Path, input_file: Path, output_prefix: Path):
 
     logger = logging.getLogger()
     c = Component(logger, exe_file)
-    result = c.create(input_file, output_prefix)
+    result = c.create(input_file, output_prefix, page_count, workers)
 
     click.secho(
         f"There are {len(result)} images created from the pdf pages.", fg="bright_blue"
@@ -197,6 +221,7 @@ def pdf_all(config_file: Path):
         "pdf_info_exe": str(config.pdf_info),
         "pdf_text_exe": str(config.pdf_text),
         "pdf_image_exe": str(config.pdf_image),
+        "image_workers": config.image_workers,
     }
     log_msg = ", ".join([f"{k}={v}" for k, v in log_data.items()])
     logger.info(f"Running all using {log_msg}.")
@@ -208,5 +233,6 @@ def pdf_all(config_file: Path):
         pdf_info_exe=config.pdf_info,
         pdf_text_exe=config.pdf_text,
         pdf_image_exe=config.pdf_image,
+        image_workers=config.image_workers,
     )
     click.secho("Finished pdf all.", bold=True)
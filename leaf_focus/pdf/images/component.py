@@ -1,8 +1,12 @@
+import os
 import re
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from logging import Logger
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Optional
+
+from leaf_focus.pdf.images.image_format import ImageFormat
 
 
 class Component:
@@ -16,8 +20,19 @@ class Component:
             raise FileNotFoundError(f"Exe file does not exist '{exe_file}'.")
         self._exe_file = exe_file
 
-    def create(self, pdf_path: Path, output_prefix_path: Path) -> list[Path]:
-        """Create images of each page of a pdf."""
+    def create(
+        self,
+        pdf_path: Path,
+        output_prefix_path: Path,
+        page_count: Optional[int] = None,
+        workers: Optional[int] = 1,
+    ) -> list[Path]:
+        """
+        Create images of each page of a pdf.
+        When the page count is known, a large pdf is split into page ranges,
+        and the ranges are rendered at the same time using up to the number of
+        workers (default is one range). Use None for the number of cpus.
+        """
 
         if not pdf_path:
             raise ValueError("Must supply pdf file.")
@@ -29,25 +44,113 @@ class Component:
         if not output_prefix_path.parent.exists():
             output_prefix_path.parent.mkdir(exist_ok=True, parents=True)
 
-        # find the highest page number
+        workers = workers or os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError(f"Workers must be 1 or more, not {workers}.")
+
+        if page_count:
+            page_ranges = self.page_ranges(page_count, workers)
+        else:
+            page_ranges = [(1, None)]
+
+        existing_pages = [i[0] for i in self.read(output_prefix_path)]
+
+        if pdf_path:
+            msg_path = pdf_path.parts[-2]
+        else:
+            msg_path = ""
+        if len(page_ranges) > 1:
+            self._logger.info(
+                f"Creating pdf page images for cache id '{msg_path}' "
+                f"using {len(page_ranges)} page ranges."
+            )
+
+        if len(page_ranges) == 1:
+            first, last = page_ranges[0]
+            self._create_range(
+                pdf_path, output_prefix_path, existing_pages, first, last
+            )
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(
+                        self._create_range,
+                        pdf_path,
+                        output_prefix_path,
+                        existing_pages,
+                        first,
+                        last,
+                    )
+                    for first, last in page_ranges
+                ]
+                for future in futures:
+                    future.result()
+
         existing_files = sorted(
             self.read(output_prefix_path),
             key=lambda x: x[0],
         )
+        return [i[1] for i in existing_files]
+
+    @classmethod
+    def page_ranges(
+        cls, page_count: int, workers: int, min_pages: int = 20
+    ) -> list[tuple[int, int]]:
+        """
+        Split the pages into up to one (first, last) page range for each worker.
+        Each range has at least the minimum number of pages,
+        so small pdfs are rendered by one process.
+        """
+        if page_count < 1:
+            raise ValueError(f"Page count must be 1 or more, not {page_count}.")
+        if workers < 1:
+            raise ValueError(f"Workers must be 1 or more, not {workers}.")
+
+        count = max(1, min(workers, page_count // min_pages))
+        size, extra = divmod(page_count, count)
+        result = []
+        first = 1
+        for index in range(count):
+            last = first + size - 1 + (1 if index < extra else 0)
+            result.append((first, last))
+            first = last + 1
+        return result
+
+    def _create_range(
+        self,
+        pdf_path: Path,
+        output_prefix_path: Path,
+        existing_pages: list[int],
+        first: int,
+        last: Optional[int],
+    ) -> None:
+        """Create the images of a range of pages. The last page can be None."""
+
+        # find the highest page number in the range
+        in_range = [
+            i for i in existing_pages if i >= first and (last is None or i <= last)
+        ]
         page_start = None
-        if len(existing_files) > 0:
+        if len(in_range) > 0:
             # start from the last page number
             # this ensures the last page number is overwritten
             # if it was only partially created
-            last = existing_files[-1]
-            page_start = last[0]
+            page_start = max(in_range)
 
         if page_start:
-            last_page_number = ["-f", str(page_start)]
+            first_page_number = ["-f", str(page_start)]
+        elif first > 1:
+            first_page_number = ["-f", str(first)]
+        else:
+            first_page_number = []
+
+        if last is not None:
+            last_page_number = ["-l", str(last)]
         else:
             last_page_number = []
 
         # −f : Specifies the first page to convert.
+        # −l : Specifies the last page to convert.
         # -r : Specifies the resolution, in DPI. The default is 150 DPI.
         commands = (
             [
@@ -56,6 +159,7 @@ class Component:
                 "-r",
                 "150",
             ]
+            + first_page_number
             + last_page_number
             + [
                 str(pdf_path),
@@ -67,6 +171,8 @@ class Component:
             msg_page = f" starting from page {page_start}"
         else:
             msg_page = ""
+        if last is not None:
+            msg_page += f" for pages {first} to {last}"
 
         if pdf_path:
             msg_path = pdf_path.parts[-2]
@@ -82,15 +188,13 @@ class Component:
             self._logger.error(f"Could not create pdf page images: {repr(result)}")
             raise ValueError(result)
 
-        existing_files = sorted(
-            self.read(output_prefix_path),
-            key=lambda x: x[0],
-        )
-        return [i[1] for i in existing_files]
-
     def read(self, output_prefix_path: Path) -> Iterable[tuple[int, Path]]:
         pattern = re.compile(r".*-(?P<page>\d{6})$")
-        for path in output_prefix_path.parent.glob("*.png"):
+        # pdftopng creates png files, pdftoppm creates pgm files
+        suffixes = ImageFormat.all_suffixes()
+        for path in output_prefix_path.parent.glob(f"{output_prefix_path.name}-*"):
+            if path.suffix.lower() not in suffixes:
+                continue
             if not path.is_file():
                 continue
 
@@ -0,0 +1,83 @@
+from dataclasses import dataclass
+from pathlib import Path
+
+from PIL import Image
+
+
+@dataclass(frozen=True)
+class ImageFormat:
+    """The file format used to save the intermediate page images."""
+
+    name: str = "png"
+    """One of 'png', 'pgm', 'pbm' or 'tiff'."""
+
+    compress_level: int = 6
+    """The png compression level, from 0 (none) to 9 (smallest)."""
+
+    suffixes = {
+        "png": ".png",
+        "pgm": ".pgm",
+        "pbm": ".pbm",
+        "tiff": ".tif",
+    }
+    """The file suffix for each format name."""
+
+    def __post_init__(self):
+        if self.name not in self.suffixes:
+            names = ", ".join(sorted(self.suffixes))
+            raise ValueError(f"Image format must be one of {names}, not {self.name}.")
+        if not 0 <= self.compress_level <= 9:
+            raise ValueError(
+                f"Compression level must be between 0 and 9, not {self.compress_level}."
+            )
+
+    @property
+    def suffix(self) -> str:
+        return self.suffixes[self.name]
+
+    @classmethod
+    def all_suffixes(cls) -> list[str]:
+        """The suffixes of all the image files that can be read."""
+        return list(cls.suffixes.values())
+
+    @classmethod
+    def from_suffix(cls, suffix: str) -> "ImageFormat":
+        """Get the format with the default settings for a file suffix."""
+        for name, value in cls.suffixes.items():
+            if value == suffix.lower():
+                return ImageFormat(name)
+        raise ValueError(f"Image suffix is not recognised '{suffix}'.")
+
+    def for_file(self, path: Path) -> "ImageFormat":
+        """Get this format, or the format that matches the file suffix."""
+        if path.suffix.lower() == self.suffix:
+            return self
+        return self.from_suffix(path.suffix)
+
+    def save(self, image: Image.Image, path: Path) -> None:
+        """
+        Save an image.
+        The pbm and tiff formats store one bit per pixel,
+        so they are only suitable for threshold images.
+        """
+        if self.name == "png":
+            image.save(path, format="PNG", compress_level=self.compress_level)
+        elif self.name == "pgm":
+            image.convert("L").save(path, format="PPM")
+        elif self.name == "pbm":
+            self._bilevel(image).save(path, format="PPM")
+        elif self.name == "tiff":
+            # packed bits without compression
+            self._bilevel(image).save(path, format="TIFF", compression="raw")
+
+    def __str__(self):
+        if self.name == "png":
+            return f"{self.name}-{self.compress_level}"
+        return self.name
+
+    @classmethod
+    def _bilevel(cls, image: Image.Image) -> Image.Image:
+        if image.mode == "1":
+            return image
+        # a threshold at the middle grey, without dithering
+        return image.convert("L").point(lambda x: 255 if x > 127 else 0, mode="1")
@@ -3,6 +3,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
+from leaf_focus.pdf.images.image_format import ImageFormat
+
 
 @dataclass
 class Item:
@@ -17,8 +19,18 @@ class Item:
     )
 
     @classmethod
-    def load(cls, directory: Path):
-        for path in directory.glob("*.png"):
+    def load(cls, directory: Path, suffix: Optional[str] = None):
+        """
+        Load the items in a directory with the suffix.
+        Page images in any of the image formats are loaded when there is no suffix.
+        """
+        if suffix:
+            suffixes = [suffix]
+        else:
+            suffixes = ImageFormat.all_suffixes()
+        for path in sorted(directory.glob("pdf-page-*")):
+            if path.suffix.lower() not in suffixes:
+                continue
             if not path.is_file():
                 continue
             try:
@@ -1,8 +1,9 @@
 from logging import Logger
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Optional
 
 from leaf_focus.pdf.images.item import Item
+from leaf_focus.pdf.info.item import Item as PdfInfoItem
 from leaf_focus.support.location import Location
 from leaf_focus.pdf.images.component import Component
 
@@ -10,11 +11,22 @@ from leaf_focus.pdf.images.component import Component
 class Operation:
     """A pipeline building block that creates the pdf page images file."""
 
-    def __init__(self, logger: Logger, base_path: Path, exe_path: Path):
+    def __init__(
+        self,
+        logger: Logger,
+        base_path: Path,
+        exe_path: Path,
+        workers: Optional[int] = 1,
+    ):
+        """
+        The workers are the number of page ranges of a large pdf
+        that are rendered at the same time. Use None for the number of cpus.
+        """
         self._logger = logger
         self._base_path = base_path
         self._location = Location(logger)
         self._component = Component(logger, exe_path)
+        self._workers = workers
 
     def run(self, pdf_path: Path, file_hash: str):
         """Run the operation."""
@@ -24,7 +36,10 @@ class Operation:
         self._location.create_directory(output_prefix.parent)
 
         # create the pdf page images
-        pdf_image_paths = self._component.create(pdf_path, output_prefix)
+        # the page count is used to split a large pdf into page ranges
+        pdf_image_paths = self._component.create(
+            pdf_path, output_prefix, self.page_count(file_hash), self._workers
+        )
 
         # result
         return pdf_image_paths
@@ -35,3 +50,18 @@ class Operation:
             if not item.path.name.startswith(output_prefix.name):
                 continue
             yield item
+
+    def page_count(self, file_hash: str) -> Optional[int]:
+        """Get the number of pages from the pdf info file, if it exists."""
+        info_file = self._location.info_file(self._base_path, file_hash)
+        if not info_file.exists():
+            return None
+
+        pages = PdfInfoItem.load_json(info_file).entries.get("Pages")
+        try:
+            return int(pages, 10) if pages else None
+        except ValueError:
+            self._logger.warning(
+                f"Could not read the page count '{pages}' for '{file_hash[0:15]}'."
+            )
+            return None
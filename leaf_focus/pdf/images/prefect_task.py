@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Optional
 
 from prefect import Task
 
@@ -11,10 +11,12 @@ from leaf_focus.pdf.images.item import Item as ImageItem
 class PdfImagesTask(Task):
     """A Prefect task to run the pdf images operation."""
 
-    def __init__(self, base_path: Path, exe_path: Path, **kwargs):
+    def __init__(
+        self, base_path: Path, exe_path: Path, workers: Optional[int] = 1, **kwargs
+    ):
         kwargs = {**kwargs, "name": "pdf.images"}
         super().__init__(**kwargs)
-        self._operation = Operation(self.logger, base_path, exe_path)
+        self._operation = Operation(self.logger, base_path, exe_path, workers)
 
     # noinspection PyMethodOverriding
     def run(self, input_item: PdfIdentifyItem) -> Iterable[tuple[str, int]]:
@@ -46,5 +48,8 @@ class PdfImagesLoadTask(Task):
                     continue
                 if pdf_image.threshold is not None:
                     continue
-                result.append((pdf_identify.file_hash, pdf_image.page))
+                item = (pdf_identify.file_hash, pdf_image.page)
+                # a page can be rendered in more than one image format
+                if item not in result:
+                    result.append(item)
         return result
@@ -1,11 +1,15 @@
 from pathlib import Path
+from typing import Optional
 
 from prefect import Flow, flatten, unmapped, Parameter
 from prefect.executors import DaskExecutor
 
 from leaf_focus.download.crawl.prefect_task import DownloadCrawlTask
 from leaf_focus.ocr.prepare.prefect_task import OcrPrepareTask
+from leaf_focus.ocr.recognise.prefect_task import OcrRecogniseServiceTask
+from leaf_focus.ocr.recognise.service import Address
 from leaf_focus.pdf.identify.prefect_task import PdfIdentifyTask
+from leaf_focus.pdf.images.image_format import ImageFormat
 from leaf_focus.pdf.images.prefect_task import PdfImagesLoadTask
 from leaf_focus.pdf.images.prefect_task import PdfImagesTask
 from leaf_focus.pdf.info.prefect_task import PdfInfoTask
@@ -19,8 +23,14 @@ class Construct:
         pdf_info_exe: Path,
         pdf_text_exe: Path,
         pdf_image_exe: Path,
+        ocr_address: Optional[Address] = None,
+        image_format: Optional[ImageFormat] = None,
+        image_workers: Optional[int] = 1,
     ):
-        """Build the full Prefect flow."""
+        """
+        Build the full Prefect flow.
+        The OCR only runs when the address of a running OCR service is provided.
+        """
 
         with Flow("leaf-focus") as flow:
             feed_dir = Parameter("feed_dir")
@@ -33,29 +43,33 @@ class Construct:
             pdf_identify_items = pdf_identify_task.map(download_items)
 
             pdf_info_task = PdfInfoTask(base_dir, pdf_info_exe)
-            pdf_info_task.map(pdf_identify_items)
+            pdf_info_items = pdf_info_task.map(pdf_identify_items)
 
             pdf_text_task = PdfTextTask(base_dir, pdf_text_exe)
             pdf_text_task.map(pdf_identify_items)
 
-            pdf_images_task = PdfImagesTask(base_dir, pdf_image_exe)
-            pdf_image_items = pdf_images_task.map(pdf_identify_items)
+            # the page count from the pdf info is used to split large pdfs
+            pdf_images_task = PdfImagesTask(base_dir, pdf_image_exe, image_workers)
+            pdf_image_items = pdf_images_task.map(
+                pdf_identify_items, upstream_tasks=[pdf_info_items]
+            )
 
-            ocr_prepare_task = OcrPrepareTask(base_dir)
-            ocr_prepare_task.map(
+            ocr_prepare_task = OcrPrepareTask(base_dir, image_format)
+            ocr_prepare_items = ocr_prepare_task.map(
                 input_item=flatten(pdf_image_items),
                 threshold=unmapped(threshold),
             )
 
-            # NOTE: Cannot run OCR as part of the Prefect flow.
-            #       This is because tensorflow does not
-            #       integrate very well into the Prefect Flow.
-            # ocr_recognise_task = OcrRecogniseTask(base_dir)
-            # ocr_recognise_task.map(
-            #     input_item=flatten(ocr_prepare_items),
-            #     threshold=unmapped(threshold),
-            #     ocr_wrapper=ocr_resource,
-            # )
+            # NOTE: tensorflow does not integrate very well into the Prefect Flow.
+            #       Instead, the OCR runs in a separate long-lived OCR service,
+            #       which loads the model once and recognises pages as
+            #       they are prepared.
+            if ocr_address:
+                ocr_recognise_task = OcrRecogniseServiceTask(base_dir, ocr_address)
+                ocr_recognise_task.map(
+                    input_item=ocr_prepare_items,
+                    threshold=unmapped(threshold),
+                )
 
         return flow
 
@@ -65,6 +79,7 @@ class Construct:
         pdf_info_exe: Path,
         pdf_text_exe: Path,
         pdf_image_exe: Path,
+        image_workers: Optional[int] = 1,
     ):
         """Build the pdf Prefect flow."""
 
@@ -78,38 +93,52 @@ class Construct:
             pdf_identify_items = pdf_identify_task.map(download_items)
 
             pdf_info_task = PdfInfoTask(base_dir, pdf_info_exe)
-            pdf_info_task.map(pdf_identify_items)
+            pdf_info_items = pdf_info_task.map(pdf_identify_items)
 
             pdf_text_task = PdfTextTask(base_dir, pdf_text_exe)
             pdf_text_task.map(pdf_identify_items)
 
-            pdf_images_task = PdfImagesTask(base_dir, pdf_image_exe)
-            pdf_images_task.map(pdf_identify_items)
+            # the page count from the pdf info is used to split large pdfs
+            pdf_images_task = PdfImagesTask(base_dir, pdf_image_exe, image_workers)
+            pdf_images_task.map(pdf_identify_items, upstream_tasks=[pdf_info_items])
 
         return flow
 
-    def build_ocr(self, base_dir: Path):
-        """Build the ocr Prefect flow."""
+    def build_ocr(
+        self,
+        base_dir: Path,
+        ocr_address: Optional[Address] = None,
+        image_format: Optional[ImageFormat] = None,
+    ):
+        """
+        Build the ocr Prefect flow.
+        The OCR only runs when the address of a running OCR service is provided.
+        """
 
         with Flow("leaf-focus") as flow:
             threshold = Parameter("threshold")
+            thresholds = Parameter("thresholds", default=None)
 
             pcf_image_task = PdfImagesLoadTask(base_dir)
             pdf_image_items = pcf_image_task()
 
-            ocr_prepare_task = OcrPrepareTask(base_dir)
-            ocr_prepare_task.map(
+            ocr_prepare_task = OcrPrepareTask(base_dir, image_format)
+            ocr_prepare_items = ocr_prepare_task.map(
                 input_item=pdf_image_items,
                 threshold=unmapped(threshold),
+                thresholds=unmapped(thresholds),
             )
 
-            # NOTE: Cannot run OCR as part of the Prefect flow.
-            # ocr_recognise_task = OcrRecogniseTask(base_dir)
-            # ocr_recognise_task.map(
-            #     input_item=ocr_prepare_items,
-            #     threshold=unmapped(threshold),
-            #     ocr_wrapper=ocr_resource,
-            # )
+            if ocr_address:
+                # only the first threshold is recognised by the OCR service,
+                # and given thresholds are used instead of the chosen threshold,
+                # as they are the images that were prepared
+                ocr_recognise_task = OcrRecogniseServiceTask(base_dir, ocr_address)
+                ocr_recognise_task.map(
+                    input_item=ocr_prepare_items,
+                    threshold=unmapped(threshold),
+                    thresholds=unmapped(thresholds),
+                )
 
         return flow
 
@@ -137,9 +166,20 @@ class Construct:
         pdf_image_exe: Path,
         threshold: int,
         serial: bool = False,
+        ocr_address: Optional[Address] = None,
+        image_format: Optional[ImageFormat] = None,
+        image_workers: Optional[int] = 1,
     ):
         """Run the Prefect flow."""
-        flow = self.build_full(base_dir, pdf_info_exe, pdf_text_exe, pdf_image_exe)
+        flow = self.build_full(
+            base_dir,
+            pdf_info_exe,
+            pdf_text_exe,
+            pdf_image_exe,
+            ocr_address,
+            image_format,
+            image_workers,
+        )
 
         if not serial:
             dask_executor = DaskExecutor()
@@ -155,9 +195,16 @@ class Construct:
         pdf_text_exe: Path,
         pdf_image_exe: Path,
         serial: bool = False,
+        image_workers: Optional[int] = 1,
     ):
-        """Run the pdf Prefect flow."""
-        flow = self.build_pdf(base_dir, pdf_info_exe, pdf_text_exe, pdf_image_exe)
+        """
+        Run the pdf Prefect flow.
+        The image workers are the number of page ranges of a large pdf
+        that are rendered at the same time.
+        """
+        flow = self.build_pdf(
+            base_dir, pdf_info_exe, pdf_text_exe, pdf_image_exe, image_workers
+        )
 
         if not serial:
             dask_executor = DaskExecutor()
@@ -170,13 +217,18 @@ class Construct:
         base_dir: Path,
         threshold: int,
         serial: bool = False,
+        ocr_address: Optional[Address] = None,
+        thresholds: Optional[list[int]] = None,
+        image_format: Optional[ImageFormat] = None,
     ):
-        """Run the ocr Prefect flow."""
-        flow = self.build_ocr(
-            base_dir,
-        )
+        """
+        Run the ocr Prefect flow.
+        When thresholds are given, an image is prepared for each of them.
+        The prepared images are saved using the image format.
+        """
+        flow = self.build_ocr(base_dir, ocr_address, image_format)
         if not serial:
             dask_executor = DaskExecutor()
-            flow.run(executor=dask_executor, threshold=threshold)
+            flow.run(executor=dask_executor, threshold=threshold, thresholds=thresholds)
         else:
-            flow.run()
+            flow.run(threshold=threshold, thresholds=thresholds)
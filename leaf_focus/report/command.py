@@ -7,6 +7,7 @@ import click
 from leaf_focus.report.item.document import Document
 from leaf_focus.report.item.correction import Correction
 from leaf_focus.report.item.known_text import KnownText
+from leaf_focus.report.item.poor_page import PoorPage
 from leaf_focus.report.item.line_parser import LineParser
 from leaf_focus.report.item.report_entry import ReportEntry
 from leaf_focus.report.processing.normalise import Normalise
@@ -25,8 +26,20 @@ from leaf_focus.support.config import Config
     type=Path,
     help="Path to the config file.",
 )
-def report(config_file: Path):
-    """Create a report."""
+@click.option(
+    "--min-page-coverage",
+    "min_page_coverage",
+    type=click.FloatRange(min=0, max=1),
+    default=0.5,
+    help="The smallest fraction of lines in a page that are matched or used "
+    "in the report, before the page is listed in 'poor-pages.csv'. Default is 0.5.",
+)
+def report(config_file: Path, min_page_coverage: float):
+    """
+    Create a report.
+    The pages that were not parsed well are saved to 'poor-pages.csv',
+    which can be used by 'ocr retry-pages' to run the OCR again for those pages.
+    """
     if not config_file:
         raise click.UsageError("Must provide config file.")
 
@@ -60,8 +73,10 @@ def report(config_file: Path):
     # create parser
     logger = logging.getLogger()
     config = Config.load(config_file)
-    parse = Parse(logger, config, parsers, sections, normalise)
-    docs = Document.load(config.processing_dir, config.feed_dir)
+    parse = Parse(logger, config, parsers, sections, normalise, min_page_coverage)
+    docs = Document.load(
+        config.processing_dir, config.feed_dir, config.prepare_image_threshold
+    )
 
     # run parser
     items = (item for item in parse.documents(docs))
@@ -70,5 +85,6 @@ def report(config_file: Path):
     ReportEntry.save(config.report_dir / "report.csv", items)
     SkippedLine.save(config.report_dir / "skipped-lines.csv", parse.skipped_lines)
     SkippedPage.save(config.report_dir / "skipped-pages.csv", parse.skipped_pages)
+    PoorPage.save(config.report_dir / "poor-pages.csv", parse.poor_pages)
 
     click.secho("Finished report.", bold=True)
@@ -33,8 +33,13 @@ class Document:
         return self.pdf_hash_value[0:15]
 
     @classmethod
-    def load(cls, processing_dir: Path, feed_dir: Path) -> Iterable["Document"]:
-        """Load documents from a directory."""
+    def load(
+        cls, processing_dir: Path, feed_dir: Path, threshold: Optional[int] = None
+    ) -> Iterable["Document"]:
+        """
+        Load documents from a directory.
+        The threshold selects the ocr text for pages recognised more than once.
+        """
 
         items = {}
 
@@ -102,7 +107,7 @@ class Document:
                 referrer_url=referrer_url,
                 assembly=assembly,
             )
-            pages = Page.load(pdf_processing, doc)
+            pages = Page.load(pdf_processing, doc, threshold)
             doc.pages = list(pages)
             yield doc
 
@@ -1,9 +1,11 @@
 import math
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import TYPE_CHECKING, Iterable
+from typing import TYPE_CHECKING, Iterable, Optional
 
-from leaf_focus.ocr.recognise.item import Item as OcrItem
+from leaf_focus.ocr.recognise.page_items import ItemView, PageItems
+from leaf_focus.ocr.threshold.item import Item as ThresholdItem
+from leaf_focus.ocr.threshold.item import RetryItem
 from leaf_focus.pdf.images.item import Item as ImageItem
 from leaf_focus.pdf.text.component import Component
 from leaf_focus.report.item.line import Line
@@ -23,27 +25,41 @@ class Page:
     lines: list[Line] = field(default_factory=list)
     """The lines in the page."""
 
-    items: list[OcrItem] = field(default_factory=list)
-    """The recognised items in a line."""
+    items: PageItems = field(default_factory=PageItems.empty)
+    """The recognised items in the page."""
 
     @classmethod
-    def load(cls, document_dir: Path, document: "Document") -> Iterable["Page"]:
-        """Load pages of a document."""
+    def load(
+        cls, document_dir: Path, document: "Document", threshold: Optional[int] = None
+    ) -> Iterable["Page"]:
+        """
+        Load pages of a document.
+        When a page was recognised using more than one threshold,
+        the ocr text is used for the threshold the page was recognised again with,
+        or the threshold chosen for the document, or the given threshold,
+        or else the lowest threshold.
+        """
         text_path = document_dir / "pdf-text.txt"
         if not text_path.exists():
             return []
 
         # load ocr text
-        pattern = ImageItem._pattern
-        item_pages = {}
-        for item_path in document_dir.glob("pdf-page-*text*.csv"):
-            match = pattern.match(item_path.stem)
-            if not match:
-                continue
-            item_page = int(match.group("page") or 0, 10)
-            if item_page < 1:
+        item_paths = {}
+        for item in ImageItem.load(document_dir, suffix=".csv"):
+            if item.variety != "text" or item.threshold is None or item.page < 1:
                 continue
-            item_pages[item_page] = OcrItem.load(item_path)
+            item_paths.setdefault(item.page, {})[item.threshold] = item.path
+
+        retry_path = document_dir / "ocr-retry.json"
+        retried = RetryItem.read(retry_path).pages if retry_path.exists() else {}
+        chosen_path = document_dir / "ocr-threshold.json"
+        chosen = (
+            ThresholdItem.read(chosen_path).threshold if chosen_path.exists() else None
+        )
+
+        for page_num, paths in item_paths.items():
+            preferred = [retried.get(page_num), chosen, threshold, min(paths)]
+            item_paths[page_num] = next(paths[i] for i in preferred if i in paths)
 
         # load embedded text lines
         for index, raw_lines in enumerate(Component.read(text_path)):
@@ -52,19 +68,17 @@ class Page:
             page.lines = list(lines)
 
             page_num = index + 1
-            if page_num in item_pages:
-                page.items = list(item_pages[page_num])
+            if page_num in item_paths:
+                page.items = PageItems.load(item_paths[page_num])
             yield page
 
     def items_line_count(self) -> int:
         """Get the number of lines provided by ocr items."""
-        return max([i.line_number for i in self.items if i.line_number])
+        return self.items.line_count()
 
-    def items_line(self, line_num: int) -> Iterable[OcrItem]:
+    def items_line(self, line_num: int) -> Iterable[ItemView]:
         """Get the ocr items for a line."""
-        line_items = [i for i in self.items if i.line_number == line_num]
-        sorted_items = sorted(line_items, key=lambda x: x.line_order)
-        return sorted_items
+        return self.items.line(line_num)
 
     def items_text(self, line_num: int) -> str:
         """
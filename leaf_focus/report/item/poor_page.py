@@ -0,0 +1,90 @@
+import csv
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+
+@dataclass
+class PoorPage:
+    """Details of a page where few lines were used in the report."""
+
+    pdf_hash_type: str
+    pdf_hash_value: str
+    pdf_page: int
+    """The page number, starting at 1."""
+
+    line_count: int
+    """The number of lines in the page."""
+
+    covered_count: int
+    """The number of lines that matched a parser or were used in the report."""
+
+    reason: str
+    """Why the page is poor."""
+
+    pdf_url: str
+
+    fields = [
+        "pdf_hash_value",
+        "pdf_page",
+        "line_count",
+        "covered_count",
+        "coverage",
+        "reason",
+        "pdf_hash_type",
+        "pdf_url",
+    ]
+
+    @property
+    def coverage(self) -> float:
+        """The fraction of lines that were matched or used."""
+        if self.line_count < 1:
+            return 0.0
+        return self.covered_count / self.line_count
+
+    @classmethod
+    def save(cls, path: Path, items: Iterable["PoorPage"]):
+        """Save items to a csv file."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wt", newline="", encoding="utf8") as f:
+            writer = csv.DictWriter(f, cls.fields, dialect="excel")
+            writer.writeheader()
+            for i in items:
+                writer.writerow(
+                    {
+                        "pdf_hash_value": i.pdf_hash_value,
+                        "pdf_page": i.pdf_page,
+                        "line_count": i.line_count,
+                        "covered_count": i.covered_count,
+                        "coverage": f"{i.coverage:.3f}",
+                        "reason": i.reason,
+                        "pdf_hash_type": i.pdf_hash_type,
+                        "pdf_url": i.pdf_url,
+                    }
+                )
+
+    @classmethod
+    def load(cls, path: Path) -> Iterable["PoorPage"]:
+        """Load items from a csv file."""
+        with open(path, "rt", newline="", encoding="utf8") as f:
+            reader = csv.DictReader(f, dialect="excel")
+            for row in reader:
+                yield PoorPage(
+                    pdf_hash_type=row["pdf_hash_type"],
+                    pdf_hash_value=row["pdf_hash_value"],
+                    pdf_page=int(row["pdf_page"], 10),
+                    line_count=int(row["line_count"], 10),
+                    covered_count=int(row["covered_count"], 10),
+                    reason=row["reason"],
+                    pdf_url=row["pdf_url"] or None,
+                )
+
+    def __str__(self):
+        items = [
+            ("pdf_hash_value", self.pdf_hash_value),
+            ("pdf_page", self.pdf_page),
+            ("coverage", f"{self.coverage:.3f}"),
+            ("reason", self.reason),
+            ("pdf_url", self.pdf_url),
+        ]
+        return "; ".join(f"{k}={v}" for k, v in items if v)
@@ -10,6 +10,7 @@ from leaf_focus.report.item.line_parser import LineParser
 from leaf_focus.report.item.line_type import LineTypeEnum
 from leaf_focus.report.item.match import Match
 from leaf_focus.report.item.outcome import Outcome
+from leaf_focus.report.item.poor_page import PoorPage
 from leaf_focus.report.item.report_entry import ReportEntry
 from leaf_focus.report.item.section import Section
 from leaf_focus.report.item.skipped_line import SkippedLine
@@ -33,12 +34,14 @@ class Parse:
         parsers: Iterable[LineParser],
         sections: Iterable[Section],
         normalise: Normalise,
+        min_page_coverage: float = 0.5,
     ):
         self._logger = logger
         self._config = config
         self._parsers = list(parsers)
         self._sections = list(sections)
         self._normalise = normalise
+        self._min_page_coverage = min_page_coverage
 
         self._allow_overwrite = [
             "page_number",
@@ -55,6 +58,7 @@ class Parse:
         ]
         self._skipped_lines = {}  # type: dict[str, int]
         self._skipped_pages = []  # type: list[SkippedPage]
+        self._poor_pages = []  # type: list[PoorPage]
 
     @property
     def skipped_lines(self):
@@ -68,6 +72,10 @@ class Parse:
     def skipped_pages(self):
         return sorted(self._skipped_pages, key=lambda x: (x.pdf_url, x.pdf_page))
 
+    @property
+    def poor_pages(self):
+        return sorted(self._poor_pages, key=lambda x: (x.pdf_hash_value, x.pdf_page))
+
     def documents(self, docs: Iterable[Document]) -> Iterable[ReportEntry]:
         for doc in docs:
             items = self.document(doc)
@@ -103,7 +111,7 @@ class Parse:
             for match in line_info
             if match and match.line and match.line.page
         }
-        missing_page_nums = actual_page_nums - expected_page_nums
+        missing_page_nums = expected_page_nums - actual_page_nums
         for missing_page_num in sorted(missing_page_nums):
             self._skipped_pages.append(
                 SkippedPage(
@@ -116,9 +124,52 @@ class Parse:
             )
 
         # use the line info to build the ReportEntrys
+        used_lines = set()
         for item in self.report_items(document, line_info):
+            used_lines.add((item.pdf_page, item.pdf_line))
             yield item
 
+        # record document pages where few lines were matched or used
+        self._poor_pages.extend(self.page_coverage(document, line_info, used_lines))
+
+    def page_coverage(
+        self,
+        document: Document,
+        line_info: Iterable[Match],
+        used_lines: set[tuple[int, int]],
+    ) -> Iterable[PoorPage]:
+        """
+        Find the pages that have no lines, or where the fraction of lines
+        that matched a parser or were used in the report is low.
+        These pages might be better after running the OCR again.
+        """
+        counts = {page.index: [0, 0] for page in document.pages}
+        for match in line_info:
+            page = match.line.page.index
+            line = match.line.index + 1
+            covered = match.outcome.is_match or (page, line) in used_lines
+            counts.setdefault(page, [0, 0])
+            counts[page][0] += 1
+            counts[page][1] += 1 if covered else 0
+
+        for page, (line_count, covered_count) in sorted(counts.items()):
+            if line_count < 1:
+                reason = "no lines"
+            elif covered_count / line_count < self._min_page_coverage:
+                reason = "low coverage"
+            else:
+                continue
+
+            yield PoorPage(
+                pdf_hash_type=document.pdf_hash_type,
+                pdf_hash_value=document.pdf_hash_value,
+                pdf_page=page + 1,
+                line_count=line_count,
+                covered_count=covered_count,
+                reason=reason,
+                pdf_url=document.pdf_url,
+            )
+
     def document_lines(self, document: Document) -> Iterable[Line]:
         """Select the page lines to use."""
 
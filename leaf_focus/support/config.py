@@ -1,8 +1,11 @@
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
 
 import yaml
 
+from leaf_focus.pdf.images.image_format import ImageFormat
+
 
 @dataclass
 class Config:
@@ -22,6 +25,14 @@ class Config:
 
     urls: list[dict]
 
+    models_dir: Optional[Path] = None
+
+    ocr_backend: str = "keras"
+    ocr_quantisation: str = "none"
+
+    image_format: ImageFormat = ImageFormat()
+    image_workers: Optional[int] = 1
+
     @classmethod
     def load(cls, path: Path):
         """Load config from a file."""
@@ -35,10 +46,20 @@ class Config:
                 cache_dir=Path(directories["cache"]),
                 processing_dir=Path(directories["processing"]),
                 report_dir=Path(directories["report"]),
+                models_dir=Path(directories["models"])
+                if directories.get("models")
+                else None,
                 pdf_info=Path(xpdf["info"]),
                 pdf_text=Path(xpdf["text"]),
                 pdf_image=Path(xpdf["image"]),
                 prepare_image_threshold=settings["imagethreshold"],
                 allowed_domains=data["allowed_domains"],
                 urls=data["urls"],
+                ocr_backend=settings.get("ocrbackend", "keras"),
+                ocr_quantisation=settings.get("ocrquantisation", "none"),
+                image_format=ImageFormat(
+                    settings.get("imageformat", "png"),
+                    settings.get("imagecompression", 6),
+                ),
+                image_workers=settings.get("imageworkers", 1),
             )
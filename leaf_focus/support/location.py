@@ -1,12 +1,21 @@
+import sys
 from logging import Logger
 from pathlib import Path
+from typing import Optional
 
+from leaf_focus.pdf.images.image_format import ImageFormat
 from leaf_focus.pdf.images.item import Item as ImageItem
 
 
 class Location:
-    def __init__(self, logger: Logger):
+    def __init__(self, logger: Logger, image_format: Optional[ImageFormat] = None):
+        """
+        The image format is used for the prepared images.
+        The rendered page images are found in any of the image formats.
+        """
         self._logger = logger
+        self._image_format = image_format or ImageFormat()
+        self._rendered_suffixes = {}  # type: dict[Path, str]
 
     def create_directory(self, directory: Path) -> None:
         if not directory:
@@ -31,6 +40,54 @@ class Location:
     def info_file(self, base_dir: Path, file_hash: str):
         return self.store_dir(base_dir, file_hash) / "pdf-info.json"
 
+    def ocr_result_cache_file(self, base_dir: Path, image_hash: str, hash_type: str):
+        if not base_dir:
+            raise ValueError("Must provide base directory.")
+        if not image_hash:
+            raise ValueError("Must provide image hash.")
+        if not hash_type:
+            raise ValueError("Must provide hash type.")
+        cache_dir = base_dir / "ocr-result-cache" / hash_type / image_hash[0:2]
+        return cache_dir / f"{image_hash}.csv"
+
+    def ocr_checkpoint_file(self, base_dir: Path):
+        if not base_dir:
+            raise ValueError("Must provide base directory.")
+        return base_dir / "ocr-recognise-checkpoint.jsonl"
+
+    def ocr_plan_file(self, base_dir: Path, file_hash: str):
+        return self.store_dir(base_dir, file_hash) / "ocr-plan.json"
+
+    def ocr_threshold_file(self, base_dir: Path, file_hash: str):
+        return self.store_dir(base_dir, file_hash) / "ocr-threshold.json"
+
+    def ocr_retry_file(self, base_dir: Path, file_hash: str):
+        return self.store_dir(base_dir, file_hash) / "ocr-retry.json"
+
+    def ocr_service_address(self, base_dir: Path) -> str:
+        # multiprocessing uses named pipes on Windows and unix sockets otherwise
+        if sys.platform == "win32":
+            return r"\\.\pipe\leaf-focus-ocr"
+        return str(base_dir / "ocr-service.sock")
+
+    def ocr_service_key_file(self, base_dir: Path):
+        if not base_dir:
+            raise ValueError("Must provide base directory.")
+        return base_dir / "ocr-service.key"
+
+    def ocr_detection_cache_file(self, base_dir: Path, image_hash: str):
+        if not base_dir:
+            raise ValueError("Must provide base directory.")
+        if not image_hash:
+            raise ValueError("Must provide image hash.")
+        cache_dir = base_dir / "ocr-detection-cache" / image_hash[0:2]
+        return cache_dir / f"{image_hash}.npz"
+
+    def ocr_models_dir(self, base_dir: Path):
+        if not base_dir:
+            raise ValueError("Must provide base directory.")
+        return base_dir / "ocr-models"
+
     def pdf_text_file(self, base_dir: Path, file_hash: str):
         return self.store_dir(base_dir, file_hash) / "pdf-text.txt"
 
@@ -40,13 +97,16 @@ class Location:
         return self.store_dir(base_dir, file_hash) / "pdf-page"
 
     def pdf_page_image_file(self, base_dir: Path, file_hash: str, page: int):
-        name = ImageItem.build(page=page, suffix=".png")
-        return self.store_dir(base_dir, file_hash) / name
+        store_dir = self.store_dir(base_dir, file_hash)
+        suffix = self._rendered_suffix(store_dir, page)
+        return store_dir / ImageItem.build(page, suffix)
 
     def pdf_page_prepared_file(
         self, base_dir: Path, file_hash: str, page: int, threshold: int
     ):
-        name = ImageItem.build(page, suffix=".png", variety="prep", threshold=threshold)
+        name = ImageItem.build(
+            page, suffix=self._image_format.suffix, variety="prep", threshold=threshold
+        )
         return self.store_dir(base_dir, file_hash) / name
 
     def pdf_page_ocr_file(
@@ -60,3 +120,19 @@ class Location:
     ):
         name = ImageItem.build(page, suffix=".csv", variety="text", threshold=threshold)
         return self.store_dir(base_dir, file_hash) / name
+
+    def _rendered_suffix(self, store_dir: Path, page: int) -> str:
+        """
+        Get the suffix of the rendered page images in a store directory.
+        The suffix is found once, from the first page image that exists.
+        """
+        suffix = self._rendered_suffixes.get(store_dir)
+        if suffix:
+            return suffix
+
+        # pdftopng creates png files, pdftoppm creates pgm files
+        for item in ImageFormat.all_suffixes():
+            if (store_dir / ImageItem.build(page, item)).exists():
+                self._rendered_suffixes[store_dir] = item
+                return item
+        return ".png"
@@ -103,15 +103,14 @@ class TestAllOperations(BaseTest):
                 logging.INFO,
                 f"Running OCR on '{prepare_path}'.",
             ),
-            (
-                "root",
-                logging.INFO,
-                f"Saving OCR image to '{a_path}'.",
-            ),
             (
                 "root",
                 logging.INFO,
                 f"Saving OCR predictions to '{p_path}'.",
             ),
         ]
-        assert len(caplog.record_tuples) == 8
+        assert len(caplog.record_tuples) == 7
+
+        # the annotation image is only created on request
+        assert not a_path.exists()
+        assert p_path.exists()
@@ -0,0 +1,39 @@
+import logging
+
+from PIL import Image
+
+from leaf_focus.ocr.annotate.component import Component
+from leaf_focus.ocr.recognise.item import Item as TextItem
+from tests.base_test import BaseTest
+
+
+class TestOcrAnnotateComponent(BaseTest):
+    def test_instance(self):
+        Component(logging.getLogger())
+
+    def test_annotate(self, tmp_path):
+        c = Component(logging.getLogger())
+
+        predictions_file = tmp_path / "pdf-page-000001-text-th-190.csv"
+        item = TextItem(
+            text="example",
+            top_left_x=10,
+            top_left_y=20,
+            top_right_x=60,
+            top_right_y=20,
+            bottom_right_x=60,
+            bottom_right_y=40,
+            bottom_left_x=10,
+            bottom_left_y=40,
+            line_number=1,
+            line_order=1,
+        )
+        TextItem.save(predictions_file, [item])
+
+        annotation_file = tmp_path / "pdf-page-000001-ocr-th-190.png"
+        c.annotate(self.example1_path(".png"), predictions_file, annotation_file)
+
+        assert annotation_file.exists()
+        with Image.open(annotation_file) as annotated:
+            assert annotated.mode == "RGB"
+            assert annotated.getpixel((30, 20)) == Component.box_colour
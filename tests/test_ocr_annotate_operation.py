@@ -0,0 +1,23 @@
+import logging
+
+from leaf_focus.ocr.annotate.operation import Operation
+from leaf_focus.support.location import Location
+from tests.base_test import BaseTest
+
+
+class TestOcrAnnotateOperation(BaseTest):
+    def test_instance(self, tmp_path):
+        Operation(logging.getLogger(), tmp_path)
+
+    def test_find_pages(self, tmp_path, example1_pdf_hash):
+        logger = logging.getLogger()
+        loc = Location(logger)
+        fh = example1_pdf_hash
+        loc.create_directory(loc.store_dir(tmp_path, fh))
+        for page, threshold in [(1, 190), (2, 190), (2, 150)]:
+            loc.pdf_page_text_file(tmp_path, fh, page, threshold).touch()
+
+        o = Operation(logger, tmp_path)
+        assert o.find_pages(fh) == [(fh, 1, 190), (fh, 2, 150), (fh, 2, 190)]
+        assert o.find_pages(fh, pages=[2]) == [(fh, 2, 150), (fh, 2, 190)]
+        assert o.find_pages(fh, threshold=190) == [(fh, 1, 190), (fh, 2, 190)]
@@ -0,0 +1,101 @@
+import logging
+
+import yaml
+from click.testing import CliRunner
+
+from leaf_focus.ocr.command import ocr
+from leaf_focus.ocr.recognise.bench import Bench
+from leaf_focus.ocr.recognise.operation import Operation
+from leaf_focus.ocr.recognise.service import Service
+from leaf_focus.pdf.identify.item import Item as IdentifyItem
+from leaf_focus.pdf.images.image_format import ImageFormat
+from leaf_focus.support.location import Location
+from tests.base_test import BaseTest
+
+
+class TestOcrCommand(BaseTest):
+    def create_config(self, tmp_path, image_format: str):
+        config_file = tmp_path / "config.yml"
+        data = {
+            "directories": {
+                "feed": str(tmp_path / "feed"),
+                "cache": str(tmp_path / "cache"),
+                "processing": str(tmp_path / "processing"),
+                "report": str(tmp_path / "report"),
+            },
+            "xpdf": {"info": "pdfinfo", "text": "pdftotext", "image": "pdftopng"},
+            "settings": {"imagethreshold": 190, "imageformat": image_format},
+            "allowed_domains": [],
+            "urls": [],
+        }
+        with open(config_file, "wt", encoding="utf8") as f:
+            yaml.safe_dump(data, f)
+        return config_file
+
+    def create_prepared(self, tmp_path, file_hash, image_format: ImageFormat):
+        logger = logging.getLogger()
+        loc = Location(logger, image_format)
+        bd = tmp_path / "processing"
+        loc.create_directory(loc.store_dir(bd, file_hash))
+        IdentifyItem(self.example1_path(".pdf"), "SHA256", file_hash).write(
+            loc.identify_file(bd, file_hash)
+        )
+        prepared_file = loc.pdf_page_prepared_file(bd, file_hash, 1, 190)
+        prepared_file.touch()
+        return prepared_file
+
+    def test_serve_image_format(self, tmp_path, example1_pdf_hash, monkeypatch):
+        config_file = self.create_config(tmp_path, "pgm")
+        fh = example1_pdf_hash
+        prepared_file = self.create_prepared(tmp_path, fh, ImageFormat("pgm"))
+
+        # the service finds the images prepared in the configured format
+        jobs = []
+
+        def serve(service):
+            jobs.append(service._operation.job(fh, 1, 190))
+            jobs.extend(service._operation.find_prepared())
+
+        monkeypatch.setattr(Service, "serve", serve)
+        result = CliRunner().invoke(ocr, ["serve", "-c", str(config_file)])
+        assert result.exit_code == 0, result.output
+        assert jobs[0][0] == prepared_file
+        assert jobs[1:] == [(fh, 1, 190)]
+
+    def test_bench_image_format(self, tmp_path, example1_pdf_hash, monkeypatch):
+        config_file = self.create_config(tmp_path, "tiff")
+        fh = example1_pdf_hash
+        prepared_file = self.create_prepared(tmp_path, fh, ImageFormat("tiff"))
+
+        # the benchmark uses the images prepared in the configured format
+        benched = []
+
+        def run(bench, image_files, batch_size=1):
+            benched.extend(image_files)
+            return {}
+
+        monkeypatch.setattr(Bench, "run", run)
+        monkeypatch.setattr(Bench, "table", lambda bench, report: [])
+        result = CliRunner().invoke(ocr, ["bench", "-c", str(config_file)])
+        assert result.exit_code == 0, result.output
+        assert benched == [prepared_file]
+
+    def test_recognise_many_threads(self, tmp_path, monkeypatch):
+        config_file = self.create_config(tmp_path, "png")
+
+        operations = []
+        init = Operation.__init__
+
+        def record(operation, *args, **kwargs):
+            init(operation, *args, **kwargs)
+            operations.append(operation)
+
+        # the thread options are used by the one worker
+        monkeypatch.setattr(Operation, "__init__", record)
+        args = ["--intra-op-threads", "3", "--inter-op-threads", "2"]
+        result = CliRunner().invoke(
+            ocr, ["recognise-many", "-c", str(config_file), *args]
+        )
+        assert result.exit_code == 0, result.output
+        assert operations[0]._component._intra_op_threads == 3
+        assert operations[0]._component._inter_op_threads == 2
@@ -0,0 +1,35 @@
+import logging
+
+from leaf_focus.ocr.plan.component import Component
+
+
+class TestOcrPlanComponent:
+    def test_instance(self):
+        c = Component(logging.getLogger())
+        assert "1. shareholdings" in c._headers
+
+    def test_classify(self):
+        c = Component(logging.getLogger(), headers=["1. Shareholdings"])
+
+        usable = c.classify(1, ["Lorem ipsum dolor sit amet, consectetur elit."] * 3)
+        assert usable.page == 1
+        assert not usable.needs_ocr
+        assert usable.reason == "usable text"
+        assert usable.printable_ratio == 1.0
+
+        empty = c.classify(2, [])
+        assert empty.needs_ocr
+        assert empty.reason == "no text"
+        assert empty.char_count == 0
+
+        garbled = c.classify(3, ["��\x07� abc def ghi ��"] * 5)
+        assert garbled.needs_ocr
+        assert garbled.reason == "garbled text"
+
+        little = c.classify(4, ["Page 4"])
+        assert little.needs_ocr
+        assert little.reason == "little text"
+
+        header = c.classify(5, ["1.   Shareholdings", "Nil"])
+        assert not header.needs_ocr
+        assert header.header_hits == 1
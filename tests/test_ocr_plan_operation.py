@@ -0,0 +1,46 @@
+import logging
+import shutil
+
+from leaf_focus.ocr.plan.item import Item
+from leaf_focus.ocr.plan.operation import Operation
+from leaf_focus.ocr.prepare.operation import Operation as PrepareOperation
+from leaf_focus.pdf.identify.item import Item as IdentifyItem
+from leaf_focus.support.location import Location
+from tests.base_test import BaseTest
+
+
+class TestOcrPlanOperation(BaseTest):
+    def test_instance(self, tmp_path):
+        Operation(logging.getLogger(), tmp_path)
+
+    def test_run_many(self, tmp_path, example1_pdf_hash):
+        logger = logging.getLogger()
+        loc = Location(logger)
+        fh = example1_pdf_hash
+        loc.create_directory(loc.store_dir(tmp_path, fh))
+        IdentifyItem(self.example1_path(".pdf"), "SHA256", fh).write(
+            loc.identify_file(tmp_path, fh)
+        )
+
+        o = Operation(logger, tmp_path)
+
+        # all pages need OCR when there is no plan
+        assert o.run(fh) is None
+        assert o.needs_ocr(fh, 1)
+
+        shutil.copy(self.example1_path(".txt"), loc.pdf_text_file(tmp_path, fh))
+        plans = o.run_many()
+        assert len(plans) == 1
+        assert plans[0].ocr_count == 0
+
+        plan_file = loc.ocr_plan_file(tmp_path, fh)
+        assert Item.read(plan_file) == plans[0]
+
+        # page 1 has a usable text layer, page 2 is not in the plan
+        o = Operation(logger, tmp_path)
+        assert not o.needs_ocr(fh, 1)
+        assert o.needs_ocr(fh, 2)
+
+        # the image for page 1 is not prepared
+        prepare = PrepareOperation(logger, tmp_path)
+        assert prepare.run(fh, 1, 190) is None
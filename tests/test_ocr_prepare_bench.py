@@ -0,0 +1,49 @@
+import logging
+import shutil
+
+import pytest
+
+from leaf_focus.ocr.prepare.bench import Bench
+from leaf_focus.ocr.prepare.component import Component
+from leaf_focus.pdf.images.image_format import ImageFormat
+from tests.base_test import BaseTest
+
+
+def create_bench():
+    logger = logging.getLogger()
+    return Bench(logger, Component(logger))
+
+
+class TestOcrPrepareBench(BaseTest):
+    def test_run_requires_images(self):
+        with pytest.raises(ValueError, match="Must supply image files."):
+            create_bench().run([], 190)
+
+    def test_run(self, tmp_path):
+        image_file = tmp_path / "pdf-page-000001.png"
+        shutil.copy(self.example1_path(".png"), image_file)
+        b = create_bench()
+
+        report = b.run([image_file, image_file], 190)
+        assert report["pages"] == 2
+        assert list(report["formats"]) == [str(i) for i in Bench.formats]
+        for values in report["formats"].values():
+            assert values["lossless"] is True
+            assert values["bytes"] == values["bytes_per_page"] * 2
+            assert values["encode_ms"] >= 0
+
+        # the bilevel formats are smaller than the uncompressed greyscale format
+        assert report["formats"]["pbm"]["bytes"] < report["formats"]["pgm"]["bytes"]
+
+        lines = b.table(report)
+        assert lines[0] == "2 pages prepared with threshold 190"
+        assert lines[2].split()[0] == "png-9"
+
+    def test_run_rendered(self, tmp_path):
+        formats = [ImageFormat("png", 1), ImageFormat("pgm"), ImageFormat("pbm")]
+        report = create_bench().run(
+            [self.example1_path(".png")], 190, rendered=True, formats=formats
+        )
+        assert report["threshold"] is None
+        assert list(report["formats"]) == ["png-1", "pgm"]
+        assert report["formats"]["pgm"]["lossless"] is True
@@ -1,10 +1,13 @@
 import logging
 from pathlib import Path
 
+import numpy as np
 import pytest
+from PIL import Image
 
 from leaf_focus.ocr.prepare.component import Component
 from leaf_focus.pdf.images.component import Component as ImageComponent
+from leaf_focus.pdf.images.image_format import ImageFormat
 from tests.base_test import BaseTest
 
 
@@ -30,3 +33,49 @@ class TestOcrPrepareComponent(BaseTest):
         assert threshold_path.exists()
         assert threshold_path.stat().st_size == 5517
         assert image.stat().st_size != threshold_path.stat().st_size
+
+    def test_threshold_many(self, tmp_path):
+        c = Component(logging.getLogger())
+        image = self.example1_path(".png")
+
+        output_files = {t: Path(tmp_path, f"threshold-{t}.png") for t in [100, 190]}
+        assert c.threshold_many(image, output_files) == 2
+
+        # the images match the threshold of the greyscale image
+        greyscale = Image.open(image).convert("L")
+        for threshold, output_file in output_files.items():
+            expected = greyscale.point(lambda v: 255 if v > threshold else 0, "1")
+            assert np.array_equal(np.asarray(Image.open(output_file)), expected)
+
+        # existing images are not created again
+        assert c.threshold_many(image, output_files) == 0
+
+        with pytest.raises(ValueError, match="Threshold must between 0 and 255"):
+            c.threshold_many(image, {256: Path(tmp_path, "threshold-256.png")})
+
+    def test_prepare_image(self, tmp_path):
+        c = Component(logging.getLogger())
+        image = self.example1_path(".png")
+        output_file = Path(tmp_path, "threshold.png")
+
+        # the array matches the saved image read as RGB
+        prepared = c.prepare_image(image, 190, output_file)
+        expected = np.asarray(Image.open(output_file).convert("RGB"))
+        assert prepared.dtype == np.uint8
+        assert np.array_equal(prepared, expected)
+
+        # the image file is only saved when requested
+        assert np.array_equal(c.prepare_image(image, 190), expected)
+
+    def test_threshold_format(self, tmp_path):
+        c = Component(logging.getLogger(), ImageFormat("pbm"))
+        image = self.example1_path(".png")
+
+        # the output file suffix is used when it does not match the image format
+        output_files = {
+            100: Path(tmp_path, "threshold-100.pbm"),
+            190: Path(tmp_path, "threshold-190.png"),
+        }
+        assert c.threshold_many(image, output_files) == 2
+        assert Image.open(output_files[100]).format == "PPM"
+        assert Image.open(output_files[190]).format == "PNG"
@@ -1,8 +1,29 @@
 import logging
+import shutil
 
 from leaf_focus.ocr.prepare.operation import Operation
+from leaf_focus.support.location import Location
+from tests.base_test import BaseTest
 
 
 class TestOcrPrepareOperation:
     def test_instance(self, tmp_path):
         Operation(logging.getLogger(), tmp_path)
+
+    def test_run_thresholds(self, tmp_path, example1_pdf_hash):
+        logger = logging.getLogger()
+        loc = Location(logger)
+        fh = example1_pdf_hash
+        loc.create_directory(loc.store_dir(tmp_path, fh))
+        shutil.copy(
+            BaseTest().example1_path(".png"), loc.pdf_page_image_file(tmp_path, fh, 1)
+        )
+
+        o = Operation(logger, tmp_path)
+        output_files = o.run_thresholds(fh, 1, [160, 190])
+        assert output_files == [
+            loc.pdf_page_prepared_file(tmp_path, fh, 1, 160),
+            loc.pdf_page_prepared_file(tmp_path, fh, 1, 190),
+        ]
+        assert all(f.exists() for f in output_files)
+        assert o.run(fh, 1, 190) == output_files[1]
@@ -0,0 +1,57 @@
+import logging
+
+import pytest
+
+from leaf_focus.ocr.recognise.bench import Bench, peak_rss_mb
+from leaf_focus.ocr.recognise.component import Component
+from leaf_focus.ocr.recognise.phase_timer import PhaseTimer
+
+
+def create_bench():
+    logger = logging.getLogger()
+    timer = PhaseTimer()
+    return Bench(logger, Component(logger, timer=timer), timer)
+
+
+class TestOcrRecogniseBench:
+    def test_sample(self):
+        b = create_bench()
+        pages = [("abc", page, 190) for page in range(1, 11)]
+
+        sample = b.sample(pages, 4, seed=1)
+        assert len(sample) == 4
+        assert sample == sorted(sample)
+        assert b.sample(list(reversed(pages)), 4, seed=1) == sample
+        assert b.sample(pages, 20) == pages
+
+        with pytest.raises(ValueError, match="Sample size must be 1 or more"):
+            b.sample(pages, 0)
+
+    def test_run_requires_images(self):
+        with pytest.raises(ValueError, match="Must supply image files."):
+            create_bench().run([])
+
+    def test_table(self):
+        report = {
+            "pages": 4,
+            "batch_size": 1,
+            "seconds": 8.0,
+            "pages_per_second": 0.5,
+            "warmup_seconds": 12.5,
+            "peak_rss_mb": 1024.0,
+            "phases": {
+                "read": {"count": 4, "total": 0.2, "p50": 0.05, "p95": 0.06},
+                "detect": {"count": 4, "total": 6.0, "p50": 1.5, "p95": 1.9},
+            },
+        }
+        lines = create_bench().table(report)
+        assert lines[0] == (
+            "4 pages in 8.00 s (0.5 pages/s), batch size 1, "
+            "warm up 12.50 s, peak memory 1024.0 MB"
+        )
+        assert lines[2].split() == ["read", "4", "0.200", "50.0", "60.0"]
+        assert lines[3].split() == ["detect", "4", "6.000", "1500.0", "1900.0"]
+
+    def test_peak_rss_mb(self):
+        peak = peak_rss_mb()
+        assert peak is None or peak > 0
@@ -0,0 +1,48 @@
+import logging
+
+import pytest
+
+from leaf_focus.ocr.recognise.checkpoint import Checkpoint
+
+
+class TestOcrRecogniseCheckpoint:
+    def test_instance(self, tmp_path):
+        with pytest.raises(ValueError, match="Must supply checkpoint file."):
+            Checkpoint(logging.getLogger(), None)
+        assert not Checkpoint(logging.getLogger(), tmp_path / "c.jsonl").exists()
+
+    def test_resume(self, tmp_path):
+        path = tmp_path / "checkpoint.jsonl"
+        pending = [("abc", 1, 190), ("abc", 2, 190), ("def", 1, 190)]
+
+        c = Checkpoint(logging.getLogger(), path)
+        c.start(pending, 5)
+        assert c.exists()
+        assert c.load() == (pending, 5)
+
+        c.mark_done([("abc", 2, 190)])
+        c.mark_done([])
+
+        # an interrupted write leaves an incomplete last line
+        with open(path, "at", encoding="utf8") as f:
+            f.write('["def", 1,')
+
+        resumed = Checkpoint(logging.getLogger(), path)
+        assert resumed.load() == ([("abc", 1, 190), ("def", 1, 190)], 6)
+
+        resumed.finish()
+        assert not resumed.exists()
+        resumed.finish()
+
+    def test_options(self, tmp_path):
+        path = tmp_path / "checkpoint.jsonl"
+        c = Checkpoint(logging.getLogger(), path)
+        c.start([("abc", 1, 190)], 0)
+        assert c.options() == {}
+
+        options = {"fused": True, "rendered_threshold": 190}
+        c.start([("abc", 1, 190)], 0, options)
+        assert c.options() == options
+        c.mark_done([("abc", 1, 190)])
+        assert c.options() == options
+        assert c.load() == ([], 1)
@@ -0,0 +1,75 @@
+import csv
+import logging
+
+import pytest
+
+from leaf_focus.ocr.recognise.compare import BackendComparison, BackendResult
+from leaf_focus.ocr.recognise.item import Item
+from leaf_focus.ocr.recognise.page_items import PageItems
+
+
+def page(*words):
+    items = [
+        Item(
+            text, 10 + 60 * index, 20, 60 + 60 * index, 20, 60, 40, 10, 40, 1, index + 1
+        )
+        for index, text in enumerate(words)
+    ]
+    return PageItems.from_items(items)
+
+
+class TestOcrRecogniseCompare:
+    def test_run_requires_input(self, tmp_path):
+        c = BackendComparison(logging.getLogger())
+        with pytest.raises(ValueError, match="Must supply image files."):
+            c.run([], {})
+        with pytest.raises(ValueError, match="Must supply backends."):
+            c.run([tmp_path / "image.png"], {})
+
+    def test_score(self):
+        c = BackendComparison(logging.getLogger())
+        reference = page("total", "assets", "total")
+
+        assert c.score(reference, reference) == (1.0, 1.0)
+
+        word_match, text_similarity = c.score(reference, page("total", "asset"))
+        assert word_match == pytest.approx(1 / 3)
+        assert 0 < text_similarity < 1
+
+        assert c.score(PageItems.empty(), PageItems.empty()) == (1.0, 1.0)
+        assert c.score(PageItems.empty(), page("noise"))[0] == 0.0
+
+    def test_summary_save(self, tmp_path):
+        c = BackendComparison(logging.getLogger())
+        results = [
+            BackendResult("keras", "a.png", 2.0, 10, 1.0, 1.0),
+            BackendResult("keras", "b.png", 4.0, 12, 1.0, 1.0),
+            BackendResult("tflite-int8", "a.png", 1.0, 9, 0.9, 0.95),
+            BackendResult("tflite-int8", "b.png", 1.0, 12, 0.8, 0.85),
+        ]
+        assert c.summary(results) == [
+            {
+                "backend": "keras",
+                "images": 2,
+                "seconds": 3.0,
+                "speedup": 1.0,
+                "word_match": 1.0,
+                "text_similarity": 1.0,
+            },
+            {
+                "backend": "tflite-int8",
+                "images": 2,
+                "seconds": 1.0,
+                "speedup": 3.0,
+                "word_match": 0.85,
+                "text_similarity": 0.9,
+            },
+        ]
+
+        output_file = tmp_path / "compare.csv"
+        c.save(output_file, results)
+        with open(output_file, "rt", encoding="utf8") as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 4
+        assert rows[2]["backend"] == "tflite-int8"
+        assert rows[2]["word_match"] == "0.9"
@@ -1,11 +1,121 @@
 import logging
+import shutil
 
+import numpy as np
 import pytest
 
+from leaf_focus.ocr.prepare.component import Component as PrepareComponent
 from leaf_focus.ocr.recognise.component import Component
+from leaf_focus.ocr.recognise.detection_cache import DetectionCache
+from leaf_focus.ocr.recognise.item import Item as TextItem
+from tests.base_test import BaseTest
 
 
-class TestOcrRecogniseComponent:
-    @pytest.mark.slow
+class TestOcrRecogniseComponent(BaseTest):
     def test_instance(self):
         Component(logging.getLogger())
+
+    def test_model_not_loaded(self, tmp_path):
+        c = Component(logging.getLogger())
+
+        image_file = tmp_path / "pdf-page-000001-prep-th-190.png"
+        shutil.copy(self.example1_path(".png"), image_file)
+        annotation_file = tmp_path / "pdf-page-000001-ocr-th-190.png"
+        annotation_file.touch()
+        predictions_file = tmp_path / "pdf-page-000001-text-th-190.csv"
+        predictions_file.touch()
+
+        jobs = [(image_file, annotation_file, predictions_file)]
+        finished = []
+        assert c.recognise_many(jobs, on_done=finished.extend) == 0
+        assert finished == jobs
+        c.recognise_text(image_file, annotation_file, predictions_file)
+        assert c._pipeline is None
+
+    def test_detect_cached(self, tmp_path):
+        logger = logging.getLogger()
+        cache = DetectionCache(logger, tmp_path)
+        c = Component(logger, detection_cache=cache)
+
+        image_file = tmp_path / "pdf-page-000001-prep-th-190.png"
+        shutil.copy(self.example1_path(".png"), image_file)
+        assert not c.has_detection(image_file)
+
+        boxes = np.array([[[10, 20], [60, 20], [60, 40], [10, 40]]])
+        cache.save(cache.image_hash(image_file), c.detection_settings, boxes)
+        assert c.has_detection(image_file)
+
+        image = np.zeros((10, 10, 3), dtype=np.uint8)
+        box_groups = c.detect([image_file], [(image, 2.0)])
+        assert [b.tolist() for b in box_groups] == [boxes.tolist()]
+        assert c._pipeline is None
+
+    def test_detection_resolution(self):
+        logger = logging.getLogger()
+        with pytest.raises(ValueError, match="Detection resolution must be"):
+            Component(logger, detection_resolution=0)
+
+        c = Component(logger)
+        image = np.zeros((100, 60, 3), dtype=np.uint8)
+        assert c._resize_for_detection((image, 2.0)) == (image, 2.0)
+
+        c = Component(logger, detection_resolution=0.5)
+        assert c.detection_settings == "scale=2,max_size=2048,resolution=0.5"
+        smaller, scale = c._resize_for_detection((image, 2.0))
+        assert smaller.shape == (50, 30, 3)
+        assert scale == 1.0
+        assert c._pipeline is None
+
+    def test_reorder_text_lines(self, tmp_path):
+        c = Component(logging.getLogger())
+
+        predictions_file = tmp_path / "pdf-page-000001-text-th-190.csv"
+        items = [
+            TextItem("second", 70, 20, 120, 20, 120, 40, 70, 40, 1, 1),
+            TextItem("first", 10, 22, 60, 22, 60, 42, 10, 42, 1, 2),
+        ]
+        TextItem.save(predictions_file, items)
+
+        c.reorder_text_lines(predictions_file)
+        reordered = list(TextItem.load(predictions_file))
+        assert [(i.text, i.line_number, i.line_order) for i in reordered] == [
+            ("first", 1, 1),
+            ("second", 1, 2),
+        ]
+        assert c._pipeline is None
+
+    @pytest.mark.slow
+    def test_recognise_many(self, tmp_path):
+        c = Component(logging.getLogger())
+
+        jobs = []
+        for page in [1, 2, 3]:
+            image_file = tmp_path / f"pdf-page-00000{page}-prep-th-190.png"
+            shutil.copy(self.example1_path(".png"), image_file)
+            annotation_file = tmp_path / f"pdf-page-00000{page}-ocr-th-190.png"
+            predictions_file = tmp_path / f"pdf-page-00000{page}-text-th-190.csv"
+            jobs.append((image_file, annotation_file, predictions_file))
+
+        assert c.recognise_many(jobs, batch_size=2) == 3
+        for _, annotation_file, predictions_file in jobs:
+            assert annotation_file.exists()
+            assert predictions_file.exists()
+
+        # outputs that already exist are skipped
+        assert c.recognise_many(jobs, batch_size=2) == 0
+
+    @pytest.mark.slow
+    def test_recognise_many_in_memory(self, tmp_path):
+        c = Component(logging.getLogger())
+        image = PrepareComponent(logging.getLogger()).prepare_image(
+            self.example1_path(".png"), 190
+        )
+
+        # the image file is not read, so it does not need to exist
+        image_file = tmp_path / "pdf-page-000001-prep-th-190.png"
+        predictions_file = tmp_path / "pdf-page-000001-text-th-190.csv"
+        jobs = [(image_file, None, predictions_file)]
+
+        assert c.recognise_many(jobs, read_image=lambda job: image) == 1
+        assert predictions_file.exists()
+        assert not image_file.exists()
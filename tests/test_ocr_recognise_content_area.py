@@ -0,0 +1,47 @@
+import logging
+
+import numpy as np
+import pytest
+
+from leaf_focus.ocr.recognise.content_area import ContentArea
+
+
+class TestOcrRecogniseContentArea:
+    def test_instance(self):
+        ContentArea(logging.getLogger())
+        with pytest.raises(ValueError, match="Minimum ink coverage must be"):
+            ContentArea(logging.getLogger(), min_ink_coverage=2)
+
+    def test_settings(self):
+        c = ContentArea(logging.getLogger(), min_ink_coverage=0.01)
+        assert c.settings == "min_ink_coverage=0.01,ink_level=128,crop_padding=16"
+        assert ContentArea(logging.getLogger()).settings != c.settings
+
+    def test_blank(self):
+        c = ContentArea(logging.getLogger())
+        image = np.full((200, 100, 3), 255, dtype=np.uint8)
+        assert c.find(image) is None
+
+        # a few specks are still blank
+        image[50, 50] = 0
+        assert c.find(image) is None
+
+        # unless every page with ink is kept
+        c = ContentArea(logging.getLogger(), min_ink_coverage=0)
+        assert c.find(image) == (34, 34, 67, 67)
+
+    def test_find(self):
+        c = ContentArea(logging.getLogger())
+        image = np.full((200, 100, 3), 255, dtype=np.uint8)
+        image[40:60, 30:80] = 0
+        assert c.find(image) == (14, 24, 96, 76)
+
+        # the padding stays inside the image
+        image[190:200, 0:10] = 0
+        assert c.find(image) == (0, 24, 96, 200)
+
+    def test_greyscale(self):
+        c = ContentArea(logging.getLogger())
+        image = np.full((200, 100), 255, dtype=np.uint8)
+        image[100:120, 20:40] = 0
+        assert c.find(image) == (4, 84, 56, 136)
@@ -0,0 +1,30 @@
+import logging
+
+import numpy as np
+
+from leaf_focus.ocr.recognise.detection_cache import DetectionCache
+from tests.base_test import BaseTest
+
+
+class TestOcrRecogniseDetectionCache(BaseTest):
+    def test_save_load(self, tmp_path):
+        cache = DetectionCache(logging.getLogger(), tmp_path)
+
+        image_hash = cache.image_hash(self.example1_path(".png"))
+        assert len(image_hash) == 64
+        assert cache.load(image_hash, "scale=2") is None
+
+        boxes = np.array([[[1, 2], [3, 2], [3, 4], [1, 4]]])
+        cache.save(image_hash, "scale=2", boxes)
+
+        loaded = cache.load(image_hash, "scale=2")
+        assert loaded.dtype == np.float32
+        assert loaded.tolist() == boxes.tolist()
+
+        # boxes found using other settings are not used
+        assert cache.load(image_hash, "scale=1") is None
+
+    def test_empty(self, tmp_path):
+        cache = DetectionCache(logging.getLogger(), tmp_path)
+        cache.save("abc123", "scale=2", [])
+        assert cache.load("abc123", "scale=2").shape == (0, 4, 2)
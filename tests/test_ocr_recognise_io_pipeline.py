@@ -0,0 +1,58 @@
+import logging
+import threading
+
+import pytest
+
+from leaf_focus.ocr.recognise.io_pipeline import IoPipeline
+
+
+class TestOcrRecogniseIoPipeline:
+    def test_instance(self):
+        logger = logging.getLogger()
+        IoPipeline(logger)
+        with pytest.raises(ValueError, match="Read queue must be 1 or more"):
+            IoPipeline(logger, read_queue=0)
+        with pytest.raises(ValueError, match="Write queue must be 1 or more"):
+            IoPipeline(logger, write_queue=0)
+        with pytest.raises(ValueError, match="Threads must be 1 or more"):
+            IoPipeline(logger, threads=0)
+
+    def test_run(self):
+        p = IoPipeline(logging.getLogger(), read_queue=1, write_queue=1, threads=2)
+        main_thread = threading.current_thread()
+        threads = {"read": set(), "process": set(), "write": set()}
+        written = []
+
+        def read(batch, executor):
+            threads["read"].add(threading.current_thread())
+            return list(executor.map(lambda value: value * 10, batch))
+
+        def process(batch):
+            threads["process"].add(threading.current_thread())
+            return sum(batch)
+
+        def write(total):
+            threads["write"].add(threading.current_thread())
+            written.append(total)
+
+        p.run([[1, 2], [3, 4], [5]], read, process, write)
+
+        assert sorted(written) == [30, 50, 70]
+        assert threads["process"] == {main_thread}
+        assert main_thread not in threads["read"]
+        assert main_thread not in threads["write"]
+
+    @pytest.mark.parametrize("failing", ["read", "process", "write"])
+    def test_run_error(self, failing):
+        p = IoPipeline(logging.getLogger(), read_queue=1, write_queue=1)
+
+        def step(name):
+            def run(value, *args):
+                if name == failing and value == 3:
+                    raise RuntimeError(f"{name} failed")
+                return value
+
+            return run
+
+        with pytest.raises(RuntimeError, match=f"{failing} failed"):
+            p.run(range(10), step("read"), step("process"), step("write"))
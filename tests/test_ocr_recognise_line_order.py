@@ -0,0 +1,153 @@
+import logging
+from typing import Optional
+
+import numpy as np
+import pytest
+
+from leaf_focus.ocr.recognise.item import Item
+from leaf_focus.ocr.recognise.line_order import LineOrder
+
+
+def reference_order_text_lines(items):
+    """
+    A verbatim copy of the previous linear line ordering,
+    used to check the new line ordering.
+    """
+    if not items:
+        items = []
+
+    lines = []
+    current_line = []
+    for item in items:
+        if not item.is_horizontal_level:
+            # exclude items that are too sloped
+            continue
+
+        if len(current_line) < 1:
+            current_line.append(item)
+
+        elif any([item.is_same_line(i) for i in current_line]):
+            current_line.append(item)
+
+        elif len(current_line) > 0:
+            # store current line
+            current_line = sorted(current_line, key=lambda x: x.top_left)
+            lines.append(current_line)
+
+            # create new line
+            current_line = [item]
+
+    # include last items
+    if len(current_line) > 0:
+        lines.append(current_line)
+
+    # update items to set line number and line order
+    for line_index, line in enumerate(lines):
+        for item_index, item in enumerate(line):
+            item.line_number = line_index + 1
+            item.line_order = item_index + 1
+
+    return lines
+
+
+def build_page(seed: int, rows: int, words: int) -> list[Item]:
+    """Build the text boxes for a page of rows of words."""
+    rng = np.random.RandomState(seed)
+    items = []
+    for row in range(rows):
+        row_top = 40 + row * rng.uniform(18, 40)
+        for word in range(words):
+            left = 20 + word * 120 + rng.uniform(-10, 10)
+            top = row_top + rng.uniform(-6, 6)
+            height = rng.uniform(10, 24)
+            width = rng.uniform(20, 100)
+            # some boxes are sloped
+            slope = rng.choice([0, 0, 0, 0.01, 0.5])
+            items.append(
+                Item(
+                    text=f"r{row}w{word}",
+                    top_left_x=left,
+                    top_left_y=top,
+                    top_right_x=left + width,
+                    top_right_y=top + width * slope,
+                    bottom_right_x=left + width,
+                    bottom_right_y=top + height + width * slope,
+                    bottom_left_x=left,
+                    bottom_left_y=top + height,
+                )
+            )
+    rng.shuffle(items)
+    return items
+
+
+def band_top(item: Item) -> float:
+    top, bottom = item.line_bounds
+    return top + (bottom - top) / 3
+
+
+class TestOcrRecogniseLineOrder:
+    def test_empty(self):
+        line_numbers, line_orders = LineOrder(logging.getLogger()).assemble([])
+        assert len(line_numbers) == 0
+        assert len(line_orders) == 0
+
+    def test_single_line(self):
+        boxes = [
+            [[100, 10], [150, 10], [150, 30], [100, 30]],
+            [[10, 12], [60, 12], [60, 32], [10, 32]],
+            [[10, 100], [60, 140], [60, 160], [10, 120]],
+        ]
+        line_numbers, line_orders = LineOrder(logging.getLogger()).assemble(boxes)
+        assert line_numbers.tolist() == [1, 1, 0]
+        assert line_orders.tolist() == [2, 1, 0]
+
+    @pytest.mark.parametrize("seed,rows,words", [(1, 10, 5), (2, 60, 8), (3, 5, 1)])
+    def test_same_as_reference(self, seed: int, rows: int, words: int):
+        # the reference ordering needs the items to be in vertical order
+        items = sorted(build_page(seed, rows, words), key=band_top)
+        reference_lines = reference_order_text_lines(items)
+        expected = {i.text: (i.line_number, i.line_order) for i in items}
+        actual = assemble(items)
+
+        # the reference did not sort the last line, the new ordering does
+        last_line = reference_lines[-1]
+        last_number = last_line[0].line_number
+        last_texts = {i.text for i in last_line}
+        assert [i.text for i in last_line] == [
+            i.text for i in items if i.text in last_texts
+        ]
+        last_sorted = sorted(last_line, key=lambda x: x.top_left)
+        for index, item in enumerate(last_sorted):
+            assert actual[item.text] == (last_number, index + 1)
+            expected[item.text] = (last_number, index + 1)
+
+        # every other line is the same
+        assert actual == expected
+
+    @pytest.mark.parametrize("seed,rows,words", [(1, 10, 5), (2, 60, 8)])
+    def test_unsorted_input(self, seed: int, rows: int, words: int):
+        # the OCR finds the boxes in no particular order
+        items = build_page(seed, rows, words)
+        sorted_items = sorted(build_page(seed, rows, words), key=band_top)
+
+        # the new ordering does not depend on the order of the boxes
+        actual = assemble(items)
+        assert actual == assemble(sorted_items)
+        assert actual == assemble(list(reversed(items)))
+
+        # the reference ordering split a line each time the boxes changed line
+        reference_order_text_lines(items)
+        reference_unsorted = max(i.line_number or 0 for i in items)
+        reference_sorted = len(reference_order_text_lines(sorted_items))
+        assert reference_unsorted > reference_sorted
+        assert max(n for n, _ in actual.values() if n) == reference_sorted
+
+
+def assemble(items: list[Item]) -> dict[str, tuple[Optional[int], Optional[int]]]:
+    """Get the line number and line order for each item using the new ordering."""
+    boxes = np.array([i.to_prediction[1] for i in items])
+    line_numbers, line_orders = LineOrder(logging.getLogger()).assemble(boxes)
+    return {
+        i.text: (int(n) or None, int(o) or None)
+        for i, n, o in zip(items, line_numbers, line_orders)
+    }
@@ -0,0 +1,70 @@
+import json
+import logging
+
+import pytest
+
+from leaf_focus.ocr.recognise.component import Component
+from leaf_focus.ocr.recognise.model_store import ModelStore
+
+
+def create_store(models_dir):
+    store = ModelStore(logging.getLogger(), models_dir)
+    models_dir.mkdir(parents=True)
+    store.weights_file("detector").write_bytes(b"detector weights")
+    store.weights_file("recognizer").write_bytes(b"recognizer weights")
+    store._write_manifest("0123456789abc", "0.8.8")
+    return store
+
+
+class TestOcrRecogniseModelStore:
+    def test_instance(self, tmp_path):
+        with pytest.raises(ValueError, match="Must supply models directory."):
+            ModelStore(logging.getLogger(), None)
+
+        store = ModelStore(logging.getLogger(), tmp_path)
+        assert not store.has_weights()
+        assert store.weights_file("detector") == tmp_path / "detector.h5"
+        assert store.tflite_file("recognizer", "float16") == (
+            tmp_path / "recognizer-float16.tflite"
+        )
+
+        # the pipeline is not loaded until it is needed
+        c = Component(logging.getLogger(), model_store=store)
+        assert c._pipeline is None
+
+    def test_manifest(self, tmp_path):
+        store = create_store(tmp_path / "source")
+        assert store.has_weights()
+        store.verify()
+
+        manifest = store.read_manifest()
+        assert manifest["keras_ocr"] == "0.8.8"
+        assert manifest["detector"]["file"] == "detector.h5"
+        assert manifest["recognizer"]["alphabet"] == "0123456789abc"
+
+    def test_import_models(self, tmp_path):
+        source = create_store(tmp_path / "source")
+        store = ModelStore(logging.getLogger(), tmp_path / "models")
+
+        store.import_models(source.models_dir)
+        assert store.has_weights()
+        assert store.weights_file("recognizer").read_bytes() == b"recognizer weights"
+        assert store.read_manifest() == source.read_manifest()
+
+    def test_import_models_invalid(self, tmp_path):
+        store = ModelStore(logging.getLogger(), tmp_path / "models")
+        with pytest.raises(FileNotFoundError, match="Model manifest does not exist"):
+            store.import_models(tmp_path)
+
+        source = create_store(tmp_path / "source")
+        source.weights_file("detector").write_bytes(b"changed weights")
+        with pytest.raises(ValueError, match="has hash"):
+            store.import_models(source.models_dir)
+        assert not store.has_weights()
+
+        manifest = source.read_manifest()
+        source.weights_file("detector").unlink()
+        with open(source.manifest_file, "wt", encoding="utf8") as f:
+            json.dump(manifest, f)
+        with pytest.raises(FileNotFoundError, match="weights file does not exist"):
+            store.import_models(source.models_dir)
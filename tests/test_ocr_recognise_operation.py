@@ -1,11 +1,175 @@
 import logging
+import shutil
+import sys
 
-import pytest
-
+from leaf_focus.ocr.recognise.item import Item as TextItem
 from leaf_focus.ocr.recognise.operation import Operation
+from leaf_focus.ocr.recognise.page_items import PageItems
+from leaf_focus.ocr.threshold.item import Item as ThresholdItem
+from leaf_focus.pdf.images.image_format import ImageFormat
+from leaf_focus.pdf.identify.item import Item as IdentifyItem
+from leaf_focus.support.location import Location
+from tests.base_test import BaseTest
 
 
-class TestOcrRecogniseOperation:
-    @pytest.mark.slow
+class TestOcrRecogniseOperation(BaseTest):
     def test_instance(self, tmp_path):
         Operation(logging.getLogger(), tmp_path)
+
+    def test_model_store(self, tmp_path):
+        o = Operation(logging.getLogger(), tmp_path, backend="tflite")
+        assert o.model_store.models_dir == tmp_path / "ocr-models"
+        assert o._component._model_store is o.model_store
+        assert o._component._backend.model_file("detector") == (
+            tmp_path / "ocr-models" / "detector-none.tflite"
+        )
+
+        models_dir = tmp_path / "models"
+        o = Operation(logging.getLogger(), tmp_path, models_dir=models_dir)
+        assert o.model_store.models_dir == models_dir
+
+    def test_find_pending(self, tmp_path, example1_pdf_hash):
+        logger = logging.getLogger()
+        loc = Location(logger)
+        fh = example1_pdf_hash
+        loc.create_directory(loc.store_dir(tmp_path, fh))
+        IdentifyItem(self.example1_path(".pdf"), "SHA256", fh).write(
+            loc.identify_file(tmp_path, fh)
+        )
+
+        # three prepared pages, page 2 already has OCR output
+        for page in [1, 2, 3]:
+            loc.pdf_page_prepared_file(tmp_path, fh, page, 190).touch()
+        loc.pdf_page_ocr_file(tmp_path, fh, 2, 190).touch()
+        loc.pdf_page_text_file(tmp_path, fh, 2, 190).touch()
+
+        # a page prepared in another image format is not found
+        Location(logger, ImageFormat("pbm")).pdf_page_prepared_file(
+            tmp_path, fh, 4, 190
+        ).touch()
+
+        o = Operation(logger, tmp_path)
+        pending, done_count = o.find_pending()
+        assert sorted(pending) == [(fh, 1, 190), (fh, 3, 190)]
+        assert done_count == 1
+
+        # once all pages are done, no OCR model is loaded
+        for page in [1, 3]:
+            loc.pdf_page_ocr_file(tmp_path, fh, page, 190).touch()
+            loc.pdf_page_text_file(tmp_path, fh, page, 190).touch()
+
+        assert o.find_pending() == ([], 3)
+        assert o.run_many() == 0
+        assert "tensorflow" not in sys.modules
+
+    def test_find_pending_rendered(self, tmp_path, example1_pdf_hash):
+        logger = logging.getLogger()
+        loc = Location(logger)
+        fh = example1_pdf_hash
+        loc.create_directory(loc.store_dir(tmp_path, fh))
+        IdentifyItem(self.example1_path(".pdf"), "SHA256", fh).write(
+            loc.identify_file(tmp_path, fh)
+        )
+
+        # two rendered pages without prepared images, page 2 already has output
+        for page in [1, 2]:
+            loc.pdf_page_image_file(tmp_path, fh, page).touch()
+        loc.pdf_page_text_file(tmp_path, fh, 2, 170).touch()
+
+        o = Operation(logger, tmp_path)
+        assert o.find_pending() == ([], 0)
+        assert o.find_pending(170) == ([(fh, 1, 170)], 1)
+
+        # a page rendered in another image format as well is found once
+        image_file = loc.pdf_page_image_file(tmp_path, fh, 1)
+        image_file.with_suffix(".pgm").touch()
+        assert o.find_pending(170) == ([(fh, 1, 170)], 1)
+
+    def test_run_pages_chosen_threshold(self, tmp_path, example1_pdf_hash):
+        logger = logging.getLogger()
+        loc = Location(logger)
+        fh = example1_pdf_hash
+        loc.create_directory(loc.store_dir(tmp_path, fh))
+        ThresholdItem(fh, 150).write(loc.ocr_threshold_file(tmp_path, fh))
+
+        o = Operation(logger, tmp_path)
+        recognised = []
+
+        def recognise_many(
+            jobs, batch_size, on_done=None, read_image=None, replace=False
+        ):
+            recognised.extend(jobs)
+            if on_done:
+                on_done(jobs)
+
+        o._component.recognise_many = recognise_many
+
+        # the threshold chosen for the pdf is used, the pages are given back
+        done = []
+        results = o.run_pages([(fh, 1, 190)], on_done=done.extend)
+        assert recognised == [o.job(fh, 1, 150)]
+        assert results == [o.job(fh, 1, 150)[1:]]
+        assert done == [(fh, 1, 190)]
+
+        # an exact threshold is used instead of the chosen threshold
+        recognised.clear()
+        o.run_pages([(fh, 1, 190)], use_chosen=False)
+        assert recognised == [o.job(fh, 1, 190)]
+
+        recognised.clear()
+        o.run_pages([(fh, 2, 190)], fused=True)
+        assert recognised == [o.job(fh, 2, 150)]
+
+        recognised.clear()
+        assert o.run_greyscale(fh, 3, 190, None) == o.job(fh, 3, 150)[1:]
+        assert recognised == [o.job(fh, 3, 150)]
+
+    def test_retry_pages(self, tmp_path, example1_pdf_hash):
+        logger = logging.getLogger()
+        loc = Location(logger)
+        fh = example1_pdf_hash
+        loc.create_directory(loc.store_dir(tmp_path, fh))
+        shutil.copy(
+            self.example1_path(".png"), loc.pdf_page_image_file(tmp_path, fh, 1)
+        )
+
+        # page 1 already has output for the retry threshold, page 2 has no image
+        loc.pdf_page_text_file(tmp_path, fh, 1, 160).touch()
+
+        o = Operation(logger, tmp_path)
+        calls = []
+
+        def recognise_many(
+            jobs, batch_size, on_done=None, read_image=None, replace=False
+        ):
+            calls.append((jobs, replace))
+
+        o._component.recognise_many = recognise_many
+
+        # the existing output is recognised again and replaced
+        assert o.retry_pages([(fh, 1), (fh, 2)], 160) == [o.job(fh, 1, 160)[1:]]
+        assert calls == [([o.job(fh, 1, 160)], True)]
+        assert loc.pdf_page_prepared_file(tmp_path, fh, 1, 160).exists()
+        assert o._thresholds.read_retry(fh).pages == {1: 160}
+
+    def test_convert_predictions(self, tmp_path, example1_pdf_hash):
+        logger = logging.getLogger()
+        loc = Location(logger)
+        fh = example1_pdf_hash
+        loc.create_directory(loc.store_dir(tmp_path, fh))
+        IdentifyItem(self.example1_path(".pdf"), "SHA256", fh).write(
+            loc.identify_file(tmp_path, fh)
+        )
+
+        item = TextItem("example", 10, 20, 60, 20, 60, 40, 10, 40, 1, 1)
+        for page in [1, 2]:
+            TextItem.save(loc.pdf_page_text_file(tmp_path, fh, page, 190), [item])
+
+        o = Operation(logger, tmp_path)
+        assert o.convert_predictions() == (2, 0)
+        assert o.convert_predictions() == (0, 2)
+        assert o.convert_predictions(force=True) == (2, 0)
+
+        predictions_file = loc.pdf_page_text_file(tmp_path, fh, 1, 190)
+        assert PageItems.binary_path(predictions_file).exists()
+        assert list(TextItem.load(predictions_file)) == [item]
@@ -0,0 +1,77 @@
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import numpy as np
+import pytest
+
+from leaf_focus.ocr.recognise.page_buffer import PageBuffer, PageSlot
+
+_buffer = None  # type: Optional[PageBuffer]
+
+
+def _attach(name: str, slots: int, height: int, width: int) -> None:
+    global _buffer
+    _buffer = PageBuffer.attach(name, slots, height, width)
+
+
+def _total(page_slot: PageSlot) -> int:
+    return int(_buffer.read(page_slot).sum())
+
+
+class TestOcrRecognisePageBuffer:
+    def test_write_read(self):
+        b = PageBuffer.create(logging.getLogger(), 2, 4, 5)
+        try:
+            assert b.shape == (4, 5)
+
+            image = np.arange(12, dtype=np.uint8).reshape(3, 4)
+            slot = b.acquire()
+            page_slot = b.write(slot, image)
+            assert page_slot == PageSlot(slot=slot, height=3, width=4)
+            assert np.array_equal(b.read(page_slot), image)
+
+            with pytest.raises(ValueError, match="larger than the slot size 4x5"):
+                b.write(slot, np.zeros((5, 5), dtype=np.uint8))
+            with pytest.raises(ValueError, match="Must supply a greyscale image"):
+                b.write(slot, np.zeros((3, 3, 3), dtype=np.uint8))
+        finally:
+            b.close()
+
+    def test_back_pressure(self):
+        b = PageBuffer.create(logging.getLogger(), 1, 2, 2)
+        try:
+            slot = b.acquire()
+
+            # all the slots are in use
+            with pytest.raises(TimeoutError, match="No page buffer slot was free"):
+                b.acquire(timeout=0.01)
+
+            b.release(slot)
+            assert b.acquire(timeout=0.01) == slot
+
+            with pytest.raises(ValueError, match="Slot must be between 0 and 0"):
+                b.release(1)
+        finally:
+            b.close()
+
+    def test_other_process(self):
+        b = PageBuffer.create(logging.getLogger(), 2, 10, 10)
+        try:
+            page_slots = []
+            for value in [1, 2]:
+                page_slots.append(
+                    b.write(b.acquire(), np.full((10, 10), value, dtype=np.uint8))
+                )
+
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=context,
+                initializer=_attach,
+                initargs=(b.name, b.slots, *b.shape),
+            ) as executor:
+                assert list(executor.map(_total, page_slots)) == [100, 200]
+        finally:
+            b.close()
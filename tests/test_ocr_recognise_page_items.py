@@ -0,0 +1,147 @@
+import os
+
+import numpy as np
+
+from leaf_focus.ocr.recognise.item import Item
+from leaf_focus.ocr.recognise.page_items import PageItems
+
+
+def build_items() -> list[Item]:
+    return [
+        Item(
+            text="second",
+            top_left_x=200,
+            top_left_y=131,
+            top_right_x=300,
+            top_right_y=131,
+            bottom_right_x=300,
+            bottom_right_y=153,
+            bottom_left_x=200,
+            bottom_left_y=153,
+            line_number=1,
+            line_order=2,
+        ),
+        Item(
+            text="first, with comma",
+            top_left_x=879,
+            top_left_y=131,
+            top_right_x=1016,
+            top_right_y=131,
+            bottom_right_x=1016,
+            bottom_right_y=153,
+            bottom_left_x=879,
+            bottom_left_y=153,
+            line_number=1,
+            line_order=1,
+        ),
+        Item(
+            text="sloped",
+            top_left_x=10.5,
+            top_left_y=300.25,
+            top_right_x=60,
+            top_right_y=340,
+            bottom_right_x=50,
+            bottom_right_y=360,
+            bottom_left_x=0,
+            bottom_left_y=320,
+        ),
+    ]
+
+
+class TestOcrRecognisePageItems:
+    def test_properties(self):
+        items = build_items()
+        page_items = PageItems.from_items(items)
+
+        assert len(page_items) == 3
+        assert page_items.line_count() == 1
+
+        names = [
+            "top_length",
+            "left_length",
+            "slope_top_left_right",
+            "slope_top_right_left",
+            "slope_left_top_bottom",
+            "slope_left_bottom_top",
+            "slope_bottom_left_right",
+            "slope_bottom_right_left",
+            "slope_right_top_bottom",
+            "slope_right_bottom_top",
+            "is_horizontal_level",
+            "is_vertical_level",
+        ]
+        for name in names:
+            expected = [getattr(i, name) for i in items]
+            actual = getattr(page_items, name)
+            np.testing.assert_allclose(actual, expected, err_msg=name)
+
+        tops, bottoms = page_items.line_bounds
+        assert list(zip(tops, bottoms)) == [i.line_bounds for i in items]
+
+    def test_views(self):
+        items = build_items()
+        page_items = PageItems.from_items(items)
+
+        assert [i.to_item() for i in page_items] == items
+        assert page_items[-1].line_number is None
+        assert page_items[1].top_left == (879, 131)
+        assert [i.text for i in page_items.line(1)] == ["first, with comma", "second"]
+        assert page_items.line(2) == []
+
+    def test_save_load(self, tmp_path):
+        expected_path = tmp_path / "expected.csv"
+        Item.save(expected_path, build_items())
+
+        # loaded items have float coordinates, as the saved predictions do
+        items = list(Item.load(expected_path))
+        Item.save(expected_path, items)
+
+        actual_path = tmp_path / "actual.csv"
+        PageItems.from_items(items).save(actual_path)
+
+        assert actual_path.read_text() == expected_path.read_text()
+
+        loaded = PageItems.load(actual_path)
+        assert [i.to_item() for i in loaded] == list(Item.load(expected_path))
+
+    def test_empty(self, tmp_path):
+        page_items = PageItems.from_predictions([])
+        assert len(page_items) == 0
+        assert page_items.line_count() == 0
+        assert not page_items
+
+        path = tmp_path / "empty.csv"
+        page_items.save(path)
+        assert len(PageItems.load(path)) == 0
+
+    def test_binary(self, tmp_path):
+        items = build_items()
+        items[0].text = "unicode – text"
+        page_items = PageItems.from_items(items)
+
+        csv_path = tmp_path / "pdf-page-000001-text-th-190.csv"
+        page_items.save(csv_path)
+        binary_path = PageItems.binary_path(csv_path)
+        assert binary_path.name == "pdf-page-000001-text-th-190.npz"
+        assert PageItems.current_binary(csv_path) is None
+
+        page_items.save_binary(binary_path)
+        assert PageItems.current_binary(csv_path) == binary_path
+
+        # the binary file has the items in the same order as the csv file
+        expected = PageItems.load_csv(csv_path)
+        loaded = PageItems.load(csv_path)
+        assert loaded.boxes.dtype == np.float32
+        assert loaded.text == expected.text
+        assert loaded.line_number.tolist() == expected.line_number.tolist()
+        assert loaded.line_order.tolist() == expected.line_order.tolist()
+        np.testing.assert_allclose(loaded.boxes, expected.boxes)
+        assert list(Item.load(csv_path)) == [i.to_item() for i in expected]
+
+        # an older binary file is not used
+        os.utime(binary_path, (1, 1))
+        assert PageItems.current_binary(csv_path) is None
+
+        empty_path = tmp_path / "empty.npz"
+        PageItems.empty().save_binary(empty_path)
+        assert len(PageItems.load(empty_path)) == 0
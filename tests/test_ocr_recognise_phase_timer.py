@@ -0,0 +1,41 @@
+import logging
+
+import pytest
+
+from leaf_focus.ocr.recognise.component import Component
+from leaf_focus.ocr.recognise.item import Item
+from leaf_focus.ocr.recognise.page_items import PageItems
+from leaf_focus.ocr.recognise.phase_timer import PhaseTimer
+
+
+class TestOcrRecognisePhaseTimer:
+    def test_phase(self):
+        timer = PhaseTimer()
+        for _ in range(3):
+            with timer.phase("detect"):
+                pass
+        with pytest.raises(RuntimeError):
+            with timer.phase("save"):
+                raise RuntimeError()
+
+        assert len(timer.durations("detect")) == 3
+        assert len(timer.durations("save")) == 1
+        assert timer.durations("read") == []
+
+        summary = timer.summary()
+        assert sorted(summary.keys()) == ["detect", "save"]
+        assert summary["detect"]["count"] == 3
+        assert 0 <= summary["detect"]["p50"] <= summary["detect"]["p95"]
+
+        timer.reset()
+        assert timer.summary() == {}
+
+    def test_component_phases(self, tmp_path):
+        timer = PhaseTimer()
+        c = Component(logging.getLogger(), timer=timer)
+
+        items = PageItems.from_items(
+            [Item("text", 10, 20, 60, 20, 60, 40, 10, 40, None, None)]
+        )
+        c.save_items(tmp_path / "pdf-page-000001-text-th-190.csv", items)
+        assert sorted(timer.summary().keys()) == ["order", "save"]
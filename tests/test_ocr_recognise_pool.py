@@ -0,0 +1,81 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from leaf_focus.ocr.recognise import pool
+from leaf_focus.ocr.recognise.page_buffer import PageBuffer
+from leaf_focus.ocr.recognise.pool import Pool
+from leaf_focus.support.location import Location
+
+
+class TestOcrRecognisePool:
+    def test_invalid_workers(self, tmp_path):
+        with pytest.raises(ValueError, match="Workers must be 1 or more, not -1."):
+            Pool(logging.getLogger(), tmp_path, workers=-1)
+
+    def test_no_cpu_affinity(self, tmp_path):
+        p = Pool(logging.getLogger(), tmp_path, workers=2)
+        assert p.cpu_cores() is None
+
+    def test_cpu_affinity(self, tmp_path):
+        p = Pool(logging.getLogger(), tmp_path, workers=2, cpu_affinity=True)
+        cores = p.cpu_cores()
+        assert len(cores) == 2
+
+        if hasattr(os, "sched_getaffinity"):
+            available = len(os.sched_getaffinity(0))
+        else:
+            available = os.cpu_count()
+        if available >= 2:
+            # each worker has its own cores
+            assert set(cores[0]).isdisjoint(cores[1])
+        for worker_cores in cores:
+            assert len(worker_cores) == max(1, available // 2)
+
+    def test_page_shape(self, tmp_path):
+        logger = logging.getLogger()
+        loc = Location(logger)
+        loc.create_directory(loc.store_dir(tmp_path, "abc"))
+        for page, size in [(1, (30, 20)), (2, (10, 40))]:
+            image_file = loc.pdf_page_image_file(tmp_path, "abc", page)
+            Image.new("L", size).save(image_file)
+
+        p = Pool(logger, tmp_path, workers=2, fused=True)
+        assert p.page_shape([("abc", 1, 190), ("abc", 2, 190)]) == (40, 30)
+
+        with pytest.raises(ValueError, match="Page slots must be 1 or more, not 0."):
+            Pool(logger, tmp_path, workers=2, page_slots=0)
+
+    def test_run_buffered(self, tmp_path, monkeypatch):
+        logger = logging.getLogger()
+        loc = Location(logger)
+        loc.create_directory(loc.store_dir(tmp_path, "abc"))
+        pages = []
+        for page in [1, 2, 3]:
+            image_file = loc.pdf_page_image_file(tmp_path, "abc", page)
+            Image.new("L", (4, 3), color=page).save(image_file)
+            pages.append(("abc", page, 190))
+
+        class Recognise:
+            def run_greyscale(self, file_hash, page, threshold, greyscale, keep):
+                # the worker sees the page image written to the slot
+                assert np.all(greyscale == page)
+                return tmp_path / f"{page}.png", tmp_path / f"{page}.csv"
+
+        # run the workers in threads, so they share the buffer and operation
+        p = Pool(logger, tmp_path, workers=1, fused=True, page_slots=1)
+        b = PageBuffer.create(logger, 1, *p.page_shape(pages))
+        monkeypatch.setattr(pool, "_worker_buffer", b)
+        monkeypatch.setattr(pool, "_worker_operation", Recognise())
+        try:
+            with ThreadPoolExecutor(1) as executor:
+                results = list(p._run_buffered(executor, b, pages))
+        finally:
+            b.close()
+
+        assert sorted(r[1] for r in results) == [1, 2, 3]
+        assert results[0][3:] == (tmp_path / "1.png", tmp_path / "1.csv")
@@ -0,0 +1,32 @@
+from leaf_focus.ocr.recognise.progress import Progress
+
+
+class TestOcrRecogniseProgress:
+    def test_update(self):
+        messages = []
+        pages = [("abc" * 10, 1, 190), ("abc" * 10, 2, 190), ("def" * 10, 1, 190)]
+        p = Progress(pages, 4, messages.append)
+
+        p.update([pages[0]])
+        p.update(pages[1:])
+
+        assert p.count == 3
+        assert len(messages) == 3
+        assert messages[0].startswith(
+            "Pdf 'abcabcabcabcabc' in progress, 1 of 2 pages. Overall 1 of 3 pages"
+        )
+        assert messages[1].startswith(
+            "Pdf 'abcabcabcabcabc' finished, 2 of 2 pages. Overall 2 of 3 pages"
+        )
+        assert messages[2].startswith("Pdf 'defdefdefdefdef' finished, 1 of 1 pages.")
+
+        summary = p.summary()
+        assert summary.startswith("Finished 3 of 3 pending pages from 2 pdfs in")
+        assert summary.endswith("pages/hour). 4 pages were already done.")
+
+        # the pages that used the result cache are described separately
+        summary = p.summary(cached=1)
+        assert summary.endswith(
+            "Recognised 2 pages and used the result cache for 1 pages. "
+            "4 pages were already done."
+        )
@@ -0,0 +1,162 @@
+import logging
+import shutil
+
+from PIL import Image
+
+from leaf_focus.ocr.recognise.component import Component
+from leaf_focus.ocr.recognise.content_area import ContentArea
+from leaf_focus.ocr.recognise.item import Item as TextItem
+from leaf_focus.ocr.recognise.page_items import PageItems
+from leaf_focus.ocr.recognise.result_cache import ResultCache
+from tests.base_test import BaseTest
+
+
+class TestOcrRecogniseResultCache(BaseTest):
+    def test_store_restore(self, tmp_path):
+        cache = ResultCache(logging.getLogger(), tmp_path)
+        image_hash = cache.image_hash(self.example1_path(".png"))
+        assert image_hash == self.example1_hash(".png")
+
+        doc1_file = tmp_path / "doc1" / "pdf-page-000001-text-th-190.csv"
+        doc1_file.parent.mkdir()
+        items = PageItems.from_items(
+            [TextItem("example", 10, 20, 60, 20, 60, 40, 10, 40, 1, 1)]
+        )
+        items.save(doc1_file)
+        items.save_binary(PageItems.binary_path(doc1_file))
+
+        doc2_file = tmp_path / "doc2" / "pdf-page-000003-text-th-190.csv"
+        assert not cache.restore(image_hash, doc2_file)
+        assert not doc2_file.exists()
+
+        cache.store(image_hash, doc1_file)
+        assert cache.restore(image_hash, doc2_file)
+        assert doc2_file.read_text() == doc1_file.read_text()
+        assert PageItems.binary_path(doc2_file).exists()
+
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert "1 hits and 1 misses" in cache.summary()
+
+    def test_perceptual_hash(self, tmp_path):
+        cache = ResultCache(logging.getLogger(), tmp_path, perceptual=True)
+        assert cache.hash_type == "dhash"
+
+        # a render with slightly different pixels has the same perceptual hash
+        image_file = self.example1_path(".png")
+        with Image.open(image_file) as image:
+            changed = image.convert("L")
+        changed.putpixel((0, 0), 255 - changed.getpixel((0, 0)))
+        changed_file = tmp_path / "changed.png"
+        changed.save(changed_file)
+
+        image_hash = cache.image_hash(image_file)
+        assert len(image_hash) == 64
+        assert cache.image_hash(changed_file) == image_hash
+
+    def test_component_restore(self, tmp_path):
+        logger = logging.getLogger()
+        cache = ResultCache(logger, tmp_path)
+        c = Component(logger, result_cache=cache)
+
+        image_file = tmp_path / "pdf-page-000001-prep-th-190.png"
+        shutil.copy(self.example1_path(".png"), image_file)
+        cached_file = tmp_path / "cached.csv"
+        TextItem.save(cached_file, [TextItem("a", 1, 2, 3, 2, 3, 4, 1, 4, 1, 1)])
+        cache.store(
+            cache.image_hash(image_file), cached_file, settings=c.detection_settings
+        )
+
+        # the page is not recognised, so the OCR model is not loaded
+        predictions_file = tmp_path / "pdf-page-000001-text-th-190.csv"
+        jobs = [(image_file, None, predictions_file)]
+        assert c.recognise_many(jobs) == 0
+        assert predictions_file.exists()
+        assert c._pipeline is None
+        assert cache.hits == 1
+
+    def test_settings(self, tmp_path):
+        cache = ResultCache(logging.getLogger(), tmp_path)
+        image_hash = cache.image_hash(self.example1_path(".png"))
+        cached_file = tmp_path / "cached.csv"
+        TextItem.save(cached_file, [TextItem("a", 1, 2, 3, 2, 3, 4, 1, 4, 1, 1)])
+        cache.store(image_hash, cached_file, settings="backend=tflite-none")
+
+        # predictions made using other settings are not used
+        predictions_file = tmp_path / "predictions.csv"
+        assert not cache.restore(image_hash, predictions_file, "scale=2")
+        assert not cache.restore(image_hash, predictions_file)
+        assert cache.restore(image_hash, predictions_file, "backend=tflite-none")
+        assert cache.cache_key(image_hash, "") == image_hash
+
+    def test_component_settings(self, tmp_path):
+        logger = logging.getLogger()
+        cache = ResultCache(logger, tmp_path)
+        image_file = tmp_path / "pdf-page-000001-prep-th-190.png"
+        shutil.copy(self.example1_path(".png"), image_file)
+        cached_file = tmp_path / "cached.csv"
+        TextItem.save(cached_file, [TextItem("a", 1, 2, 3, 2, 3, 4, 1, 4, 1, 1)])
+        c = Component(logger, result_cache=cache)
+        cache.store(
+            cache.image_hash(image_file), cached_file, settings=c.detection_settings
+        )
+
+        # a component with another detection resolution does not use the cache
+        predictions_file = tmp_path / "pdf-page-000001-text-th-190.csv"
+        jobs = [(image_file, None, predictions_file)]
+        other = Component(logger, result_cache=cache, detection_resolution=0.5)
+        assert other.detection_settings != c.detection_settings
+        assert other.restore_results(jobs) == jobs
+        assert c.restore_results(jobs) == []
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_component_min_ink_coverage(self, tmp_path):
+        logger = logging.getLogger()
+        cache = ResultCache(logger, tmp_path)
+        image_file = tmp_path / "pdf-page-000001-prep-th-190.png"
+        shutil.copy(self.example1_path(".png"), image_file)
+
+        # a page found blank is cached with empty predictions
+        blank_file = tmp_path / "blank.csv"
+        TextItem.save(blank_file, [])
+        c = Component(logger, result_cache=cache, content_area=ContentArea(logger, 0.5))
+        cache.store(
+            cache.image_hash(image_file), blank_file, settings=c.detection_settings
+        )
+
+        # a lower minimum ink coverage does not restore the blank page
+        predictions_file = tmp_path / "pdf-page-000001-text-th-190.csv"
+        jobs = [(image_file, None, predictions_file)]
+        other = Component(
+            logger, result_cache=cache, content_area=ContentArea(logger, 0.001)
+        )
+        assert other.detection_settings != c.detection_settings
+        assert other.restore_results(jobs) == jobs
+        assert not predictions_file.exists()
+        assert c.restore_results(jobs) == []
+        assert list(TextItem.load(predictions_file)) == []
+
+    def test_component_replace(self, tmp_path):
+        logger = logging.getLogger()
+        cache = ResultCache(logger, tmp_path)
+        image_file = tmp_path / "pdf-page-000001-prep-th-190.png"
+        shutil.copy(self.example1_path(".png"), image_file)
+        cached_file = tmp_path / "cached.csv"
+        item = TextItem("a", 1, 2, 3, 2, 3, 4, 1, 4, 1, 1)
+        TextItem.save(cached_file, [item])
+        c = Component(logger, result_cache=cache)
+        cache.store(
+            cache.image_hash(image_file), cached_file, settings=c.detection_settings
+        )
+
+        # existing output is kept, unless it is replaced
+        predictions_file = tmp_path / "pdf-page-000001-text-th-190.csv"
+        TextItem.save(predictions_file, [])
+        jobs = [(image_file, None, predictions_file)]
+        c.recognise_many(jobs)
+        assert list(TextItem.load(predictions_file)) == []
+
+        # the restored page is finished, but it is not counted as recognised
+        finished = []
+        assert c.recognise_many(jobs, replace=True, on_done=finished.extend) == 0
+        assert finished == jobs
+        assert list(TextItem.load(predictions_file)) == [item]
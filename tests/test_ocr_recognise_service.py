@@ -0,0 +1,120 @@
+import logging
+import stat
+import sys
+import threading
+
+import pytest
+
+from leaf_focus.ocr.recognise.service import Client, Job, Service
+
+
+class FakeOperation:
+    def __init__(self, base_path, chosen=None):
+        self.base_path = base_path
+        self.chosen = chosen or {}
+        self.calls = []
+
+    def chosen_threshold(self, file_hash, threshold):
+        return self.chosen.get(file_hash, threshold)
+
+    def run_pages(self, pages, batch_size, use_chosen=True):
+        assert not use_chosen
+        self.calls.append(list(pages))
+        result = []
+        for file_hash, page, threshold in pages:
+            if page < 1:
+                raise ValueError(f"Invalid page {page}.")
+            name = f"{file_hash}-{page:06}-th-{threshold:03}"
+            result.append(
+                (self.base_path / f"{name}.png", self.base_path / f"{name}.csv")
+            )
+        return result
+
+
+class TestOcrRecogniseService:
+    def test_recognise_stop(self, tmp_path):
+        address = str(tmp_path / "ocr.sock")
+        key_file = tmp_path / "ocr.key"
+        operation = FakeOperation(tmp_path)
+        service = Service(
+            logging.getLogger(), operation, address, key_file, batch_wait=0.1
+        )
+
+        thread = threading.Thread(target=service.serve, daemon=True)
+        thread.start()
+
+        client = Client(address, key_file)
+        for _ in range(50):
+            try:
+                annotation_file, predictions_file = client.recognise("abc", 2, 190)
+                break
+            except ValueError:
+                thread.join(0.1)
+
+        assert annotation_file == tmp_path / "abc-000002-th-190.png"
+        assert predictions_file == tmp_path / "abc-000002-th-190.csv"
+
+        with pytest.raises(ValueError, match="Invalid page 0."):
+            client.recognise("abc", 0, 190)
+
+        # a client without the key can't connect
+        wrong_key_file = tmp_path / "wrong.key"
+        wrong_key_file.write_bytes(b"not-the-key")
+        with pytest.raises(ValueError, match="Could not connect to OCR service"):
+            Client(address, wrong_key_file).recognise("abc", 3, 190)
+
+        client.stop()
+        thread.join(5)
+        assert not thread.is_alive()
+        assert operation.calls == [[("abc", 2, 190)], [("abc", 0, 190)]]
+        assert not key_file.exists()
+
+    def test_batch_error(self, tmp_path):
+        operation = FakeOperation(tmp_path)
+        service = Service(
+            logging.getLogger(), operation, str(tmp_path / "ocr.sock"), tmp_path
+        )
+
+        # only the bad page in the batch is given the error
+        good = Job(file_hash="abc", page=2, threshold=190)
+        bad = Job(file_hash="abc", page=0, threshold=190)
+        service._run_batch([good, bad])
+
+        assert good.error is None
+        assert good.predictions_file == tmp_path / "abc-000002-th-190.csv"
+        assert bad.error == "ValueError: Invalid page 0."
+        assert bad.predictions_file is None
+        assert operation.calls == [
+            [("abc", 2, 190), ("abc", 0, 190)],
+            [("abc", 2, 190)],
+            [("abc", 0, 190)],
+        ]
+
+    def test_exact_threshold(self, tmp_path):
+        operation = FakeOperation(tmp_path, {"abc": 170})
+        service = Service(
+            logging.getLogger(), operation, str(tmp_path / "ocr.sock"), tmp_path
+        )
+
+        # the chosen threshold is used, unless the threshold is exact
+        chosen = Job(file_hash="abc", page=1, threshold=190)
+        exact = Job(file_hash="abc", page=2, threshold=150, exact=True)
+        other = Job(file_hash="def", page=3, threshold=190)
+        service._run_batch([chosen, exact, other])
+
+        assert operation.calls == [[("abc", 1, 170), ("abc", 2, 150), ("def", 3, 190)]]
+        assert exact.predictions_file == tmp_path / "abc-000002-th-150.csv"
+
+    def test_not_running(self, tmp_path):
+        client = Client(str(tmp_path / "missing.sock"), tmp_path / "missing.key")
+        with pytest.raises(ValueError, match="Could not connect to OCR service"):
+            client.recognise("abc", 1, 190)
+
+    def test_create_key(self, tmp_path):
+        key_file = tmp_path / "ocr.key"
+        key = Service.create_key(key_file)
+        assert len(key) == 64
+        assert Service.read_key(key_file) == key
+        assert Service.create_key(key_file) != key
+        if sys.platform != "win32":
+            assert stat.S_IMODE(key_file.stat().st_mode) == 0o600
@@ -0,0 +1,36 @@
+import logging
+
+import numpy as np
+import pytest
+
+from leaf_focus.ocr.recognise.component import Component
+from leaf_focus.ocr.recognise.model_store import ModelStore
+from leaf_focus.ocr.recognise.tflite_backend import TflitePipeline, ctc_greedy_decode
+
+
+class TestOcrRecogniseTfliteBackend:
+    def test_instance(self, tmp_path):
+        logger = logging.getLogger()
+        store = ModelStore(logger, tmp_path)
+        with pytest.raises(ValueError, match="Quantisation must be one of"):
+            TflitePipeline(logger, store, "int4")
+
+        backend = TflitePipeline(logger, store, "int8")
+        assert backend.name == "tflite-int8"
+        assert backend.model_file("detector") == tmp_path / "detector-int8.tflite"
+
+        c = Component(logger, backend=backend)
+        assert c.detection_settings == "scale=2,max_size=2048,backend=tflite-int8"
+        assert c._pipeline is None
+
+    def test_ctc_greedy_decode(self):
+        alphabet = "abc"
+        blank = len(alphabet)
+        steps = [
+            [0, 0, blank, 0, 1, 1, blank, 2],
+            [blank, blank, blank, blank, blank, blank, blank, blank],
+            [2, blank, 2, 2, 1, 0, 0, blank],
+        ]
+        probabilities = np.eye(len(alphabet) + 1)[np.array(steps)]
+        assert probabilities.shape == (3, 8, 4)
+        assert ctc_greedy_decode(probabilities, alphabet) == ["aabc", "", "ccba"]
@@ -0,0 +1,55 @@
+import logging
+
+import numpy as np
+import pytest
+
+from leaf_focus.ocr.threshold.component import Component
+from leaf_focus.ocr.threshold.item import ThresholdScore
+from tests.base_test import BaseTest
+
+
+class TestOcrThresholdComponent(BaseTest):
+    def test_instance(self):
+        Component(logging.getLogger())
+
+    def test_otsu_histogram(self):
+        # dark text around 40 and a light background around 220
+        histogram = np.zeros(256)
+        histogram[30:50] = 10
+        histogram[210:230] = 100
+        threshold = Component.otsu_histogram(histogram)
+        assert 49 <= threshold < 210
+
+        with pytest.raises(ValueError, match="at least one pixel"):
+            Component.otsu_histogram(np.zeros(256))
+
+    def test_otsu(self):
+        c = Component(logging.getLogger())
+        threshold = c.otsu(self.example1_path(".png"))
+        assert 0 <= threshold <= 255
+
+    def test_sample(self):
+        c = Component(logging.getLogger())
+        assert c.sample([3, 1, 2], 5) == [1, 2, 3]
+        assert c.sample(list(range(1, 11)), 3) == [2, 6, 9]
+        with pytest.raises(ValueError, match="Sample size must be 1 or more"):
+            c.sample([1], 0)
+
+    def test_candidates(self):
+        c = Component(logging.getLogger())
+        assert c.candidates([190, 150, 190], 170) == [150, 170, 190]
+        with pytest.raises(ValueError, match="Threshold must between 0 and 255"):
+            c.candidates([300], 170)
+
+    def test_score_choose(self):
+        c = Component(logging.getLogger())
+        score = c.score(190, [["hello", "a", "world", "-"], ["page2", ""]])
+        assert score == ThresholdScore(threshold=190, word_count=3, char_count=15)
+
+        scores = [
+            ThresholdScore(threshold=150, word_count=10, char_count=50),
+            ThresholdScore(threshold=170, word_count=12, char_count=60),
+            ThresholdScore(threshold=210, word_count=12, char_count=60),
+        ]
+        assert c.choose(scores, 200) == 210
+        assert c.choose(scores, 160) == 170
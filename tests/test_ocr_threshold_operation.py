@@ -0,0 +1,94 @@
+import logging
+import shutil
+
+from leaf_focus.ocr.prepare.operation import Operation as PrepareOperation
+from leaf_focus.ocr.recognise.operation import Operation as RecogniseOperation
+from leaf_focus.ocr.recognise.page_items import PageItems
+from leaf_focus.ocr.threshold.item import Item
+from leaf_focus.ocr.threshold.operation import Operation
+from leaf_focus.pdf.identify.item import Item as IdentifyItem
+from leaf_focus.support.location import Location
+from tests.base_test import BaseTest
+
+
+class _Recognise:
+    """Recognise more words in images prepared using a threshold of 200."""
+
+    def predict(self, image_files):
+        result = []
+        for image_file in image_files:
+            words = ["word"] * (5 if image_file.stem.endswith("-th-200") else 2)
+            result.append(PageItems(words, [[[0, 0]] * 4] * len(words)))
+        return result
+
+
+class TestOcrThresholdOperation(BaseTest):
+    def test_instance(self, tmp_path):
+        Operation(logging.getLogger(), tmp_path)
+
+    def test_run_many(self, tmp_path, example1_pdf_hash):
+        logger = logging.getLogger()
+        loc = Location(logger)
+        fh = example1_pdf_hash
+        loc.create_directory(loc.store_dir(tmp_path, fh))
+        IdentifyItem(self.example1_path(".pdf"), "SHA256", fh).write(
+            loc.identify_file(tmp_path, fh)
+        )
+
+        o = Operation(logger, tmp_path)
+
+        # the configured threshold is used when there is no page image
+        assert o.run(fh, 190) is None
+        assert o.threshold(fh, 190) == 190
+
+        image_file = loc.pdf_page_image_file(tmp_path, fh, 1)
+        shutil.copy(self.example1_path(".png"), image_file)
+
+        # without OCR, the Otsu estimate is chosen
+        items = o.run_many(190)
+        assert len(items) == 1
+        assert items[0].threshold == items[0].otsu
+        assert items[0].pages == [1]
+        assert items[0].scores == []
+        assert Item.read(loc.ocr_threshold_file(tmp_path, fh)) == items[0]
+
+        # the candidate that recognises the most words is chosen
+        o = Operation(logger, tmp_path, _Recognise())
+        assert o.run_many(190, [200]) == items
+        items = o.run_many(190, [200], rescan=True)
+        assert items[0].threshold == 200
+        assert len(items[0].scores) >= 2
+
+        # the pages are prepared and recognised using the chosen threshold
+        prepared_file = PrepareOperation(logger, tmp_path).run(fh, 1, 190)
+        assert prepared_file == loc.pdf_page_prepared_file(tmp_path, fh, 1, 200)
+
+        shutil.copy(prepared_file, loc.pdf_page_prepared_file(tmp_path, fh, 1, 190))
+        found = list(RecogniseOperation(logger, tmp_path).find_prepared())
+        assert found == [(fh, 1, 200)]
+
+    def test_write_retry(self, tmp_path, example1_pdf_hash):
+        logger = logging.getLogger()
+        loc = Location(logger)
+        fh = example1_pdf_hash
+        loc.create_directory(loc.store_dir(tmp_path, fh))
+
+        o = Operation(logger, tmp_path)
+        assert o.read_retry(fh) is None
+
+        o.write_retry(fh, [3, 1], 150)
+        o.write_retry(fh, [1], 170)
+        assert o.read_retry(fh).pages == {1: 170, 3: 150}
+
+    def test_find_pages(self, tmp_path, example1_pdf_hash):
+        logger = logging.getLogger()
+        loc = Location(logger)
+        fh = example1_pdf_hash
+        loc.create_directory(loc.store_dir(tmp_path, fh))
+
+        # a page rendered in two image formats is found once
+        image_file = loc.pdf_page_image_file(tmp_path, fh, 2)
+        image_file.touch()
+        image_file.with_suffix(".pgm").touch()
+        loc.pdf_page_image_file(tmp_path, fh, 1).touch()
+        assert Operation(logger, tmp_path).find_pages(fh) == [1, 2]
@@ -1,4 +1,6 @@
 import logging
+import sys
+
 import pytest
 from pathlib import Path
 from leaf_focus.pdf.images.component import Component
@@ -35,3 +37,65 @@ class TestPdfImagesComponent(BaseTest):
         assert expected.stat().st_size == 21703
         assert Path(str(image_prefix_path) + "-000001.png").exists()
         assert not Path(str(image_prefix_path) + "-000002.png").exists()
+
+    @pytest.mark.parametrize(
+        "page_count,workers,expected",
+        [
+            (1, 4, [(1, 1)]),
+            (39, 4, [(1, 39)]),
+            (40, 4, [(1, 20), (21, 40)]),
+            (400, 1, [(1, 400)]),
+            (401, 4, [(1, 101), (102, 201), (202, 301), (302, 401)]),
+        ],
+    )
+    def test_page_ranges(
+        self, page_count: int, workers: int, expected: list[tuple[int, int]]
+    ):
+        assert Component.page_ranges(page_count, workers) == expected
+
+    def test_page_ranges_invalid(self):
+        with pytest.raises(ValueError, match="Page count must be 1 or more"):
+            Component.page_ranges(0, 4)
+        with pytest.raises(ValueError, match="Workers must be 1 or more"):
+            Component.page_ranges(10, 0)
+
+    def test_create_ranges(self, tmp_path):
+        # a stand-in for pdftopng that records the page range it was given
+        exe_file = tmp_path / "pdftopng"
+        exe_file.write_text(
+            f"#!{sys.executable}\n"
+            "import sys\n"
+            "args = sys.argv[1:]\n"
+            "first = int(args[args.index('-f') + 1]) if '-f' in args else 1\n"
+            "last = int(args[args.index('-l') + 1]) if '-l' in args else 60\n"
+            "with open(args[-1] + '-calls.txt', 'at') as f:\n"
+            "    f.write(f'{first} {last}\\n')\n"
+            "for page in range(first, last + 1):\n"
+            "    open(f'{args[-1]}-{page:06}.png', 'wb').close()\n"
+        )
+        exe_file.chmod(0o755)
+        pdf_file = tmp_path / "example.pdf"
+        pdf_file.touch()
+        prefix = tmp_path / "images" / "pdf-page"
+        calls_file = Path(str(prefix) + "-calls.txt")
+        c = Component(logging.getLogger(), exe_file)
+
+        result = c.create(pdf_file, prefix, page_count=60, workers=3)
+        assert [i.name for i in result] == [
+            f"pdf-page-{page:06}.png" for page in range(1, 61)
+        ]
+        calls = sorted(calls_file.read_text().splitlines())
+        assert calls == ["1 20", "21 40", "41 60"]
+
+        # each range continues from the last page it created
+        Path(str(prefix) + "-000040.png").unlink()
+        Path(str(prefix) + "-000039.png").unlink()
+        calls_file.unlink()
+        c.create(pdf_file, prefix, page_count=60, workers=3)
+        calls = sorted(calls_file.read_text().splitlines())
+        assert calls == ["20 20", "38 40", "60 60"]
+
+        # without the page count, the whole pdf is one range
+        calls_file.unlink()
+        c.create(pdf_file, prefix)
+        assert calls_file.read_text().splitlines() == ["60 60"]
@@ -0,0 +1,69 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from leaf_focus.pdf.images.image_format import ImageFormat
+from tests.base_test import BaseTest
+
+
+class TestPdfImagesImageFormat(BaseTest):
+    def test_invalid(self):
+        with pytest.raises(ValueError, match="Image format must be one of"):
+            ImageFormat("jpeg")
+        with pytest.raises(ValueError, match="Compression level must be between"):
+            ImageFormat("png", 10)
+
+    @pytest.mark.parametrize(
+        "suffix,expected",
+        [
+            (".png", ImageFormat("png")),
+            (".PGM", ImageFormat("pgm")),
+            (".pbm", ImageFormat("pbm")),
+            (".tif", ImageFormat("tiff")),
+        ],
+    )
+    def test_from_suffix(self, suffix: str, expected: ImageFormat):
+        assert ImageFormat.from_suffix(suffix) == expected
+
+    def test_for_file(self):
+        image_format = ImageFormat("png", 1)
+        assert image_format.for_file(Path("page.png")) == image_format
+        assert image_format.for_file(Path("page.pbm")) == ImageFormat("pbm")
+        with pytest.raises(ValueError, match="Image suffix is not recognised"):
+            image_format.for_file(Path("page.jpg"))
+
+    @pytest.mark.parametrize(
+        "image_format,mode",
+        [
+            (ImageFormat("png", 0), "1"),
+            (ImageFormat("png", 9), "1"),
+            (ImageFormat("pgm"), "L"),
+            (ImageFormat("pbm"), "1"),
+            (ImageFormat("tiff"), "1"),
+        ],
+    )
+    def test_save(self, tmp_path, image_format: ImageFormat, mode: str):
+        with Image.open(self.example1_path(".png")) as img:
+            binary = np.asarray(img.convert("L")) > 190
+        path = tmp_path / f"page{image_format.suffix}"
+        image_format.save(Image.fromarray(binary), path)
+
+        # every format keeps the threshold image pixels
+        with Image.open(path) as img:
+            assert img.mode == mode
+            actual = np.asarray(img.convert("L"))
+        assert np.array_equal(actual, np.where(binary, 255, 0))
+
+    def test_save_bilevel_from_greyscale(self, tmp_path):
+        greyscale = np.array([[0, 127, 128, 255]], dtype=np.uint8)
+        path = tmp_path / "page.pbm"
+        ImageFormat("pbm").save(Image.fromarray(greyscale), path)
+        with Image.open(path) as img:
+            actual = np.asarray(img.convert("L"))
+        assert actual.tolist() == [[0, 0, 255, 255]]
+
+    def test_str(self):
+        assert str(ImageFormat()) == "png-6"
+        assert str(ImageFormat("tiff")) == "tiff"
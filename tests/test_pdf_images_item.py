@@ -57,3 +57,26 @@ class TestPdfImagesItem(BaseTest):
     def test_read(self, expected: Item, path: Path):
         actual = Item.read(path)
         assert actual == expected
+
+    def test_load(self, tmp_path):
+        names = [
+            "pdf-page-000001.png",
+            "pdf-page-000002.pgm",
+            "pdf-page-000002-prep-th-190.tif",
+            "pdf-page-000002-prep-th-190.pbm",
+            "pdf-page-000002-text-th-190.csv",
+            "other.png",
+        ]
+        for name in names:
+            (tmp_path / name).touch()
+
+        actual = [i.path.name for i in Item.load(tmp_path)]
+        assert actual == [
+            "pdf-page-000001.png",
+            "pdf-page-000002-prep-th-190.pbm",
+            "pdf-page-000002-prep-th-190.tif",
+            "pdf-page-000002.pgm",
+        ]
+
+        actual = [i.path.name for i in Item.load(tmp_path, suffix=".csv")]
+        assert actual == ["pdf-page-000002-text-th-190.csv"]
@@ -1,6 +1,8 @@
 import logging
 
 from leaf_focus.pdf.images.operation import Operation
+from leaf_focus.pdf.info.item import Item as PdfInfoItem
+from leaf_focus.support.location import Location
 from tests.base_test import BaseTest
 
 
@@ -9,3 +11,15 @@ class TestPdfImagesOperation(BaseTest):
         tmp_file = tmp_path / "example"
         tmp_file.touch()
         Operation(logging.getLogger(), tmp_path, tmp_file)
+
+    def test_page_count(self, tmp_path):
+        tmp_file = tmp_path / "example"
+        tmp_file.touch()
+        o = Operation(logging.getLogger(), tmp_path, tmp_file)
+        file_hash = "abcdef0123456789"
+        assert o.page_count(file_hash) is None
+
+        info_file = Location(logging.getLogger()).info_file(tmp_path, file_hash)
+        info_file.parent.mkdir(parents=True)
+        PdfInfoItem(tmp_file, {"Pages": "400"}).save_json(info_file)
+        assert o.page_count(file_hash) == 400
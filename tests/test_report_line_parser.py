@@ -0,0 +1,16 @@
+from leaf_focus.report.item.line_parser import LineParser
+
+
+class TestReportLineParser:
+    def test_match_text(self):
+        parser = LineParser("Member for Higgins", False, "metadata", "line")
+        assert parser.match("Member  for   Higgins ") == (True, {})
+        assert parser.match("Member for Griffith") == (False, {})
+
+    def test_match_regex(self):
+        parser = LineParser(r"^Page (?P<page>\d+)$", True, "metadata", "line")
+        is_match, extracted = parser.match("Page 12")
+        assert is_match
+        assert extracted == {"page": {"value": "12", "span": (5, 7)}}
+        assert parser.match("Pages 12") == (False, {})
+        assert str(parser) == r"line:metadata '^Page (?P<page>\d+)$'"
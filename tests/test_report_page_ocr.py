@@ -0,0 +1,46 @@
+import logging
+import os
+
+from leaf_focus.ocr.recognise.item import Item as TextItem
+from leaf_focus.ocr.threshold.item import Item as ThresholdItem
+from leaf_focus.ocr.threshold.operation import Operation as ThresholdOperation
+from leaf_focus.report.item.page import Page
+from leaf_focus.support.location import Location
+
+
+class TestReportPageOcr:
+    def save_text(self, loc, bd, file_hash, page, threshold, mtime):
+        path = loc.pdf_page_text_file(bd, file_hash, page, threshold)
+        item = TextItem(f"th{threshold}", 10, 20, 60, 20, 60, 40, 10, 40, 1, 1)
+        TextItem.save(path, [item])
+        os.utime(path, (mtime, mtime))
+
+    def test_load_threshold(self, tmp_path):
+        logger = logging.getLogger()
+        loc = Location(logger)
+        bd = tmp_path
+        fh = "abcdef1234567890"
+        store_dir = loc.store_dir(bd, fh)
+        loc.create_directory(store_dir)
+        loc.pdf_text_file(bd, fh).write_text("one\ftwo\fthree\ffour\f")
+
+        # page 1 was recognised again at 150, using an older cached file
+        self.save_text(loc, bd, fh, 1, 190, 2000)
+        self.save_text(loc, bd, fh, 1, 150, 1000)
+        ThresholdOperation(logger, bd).write_retry(fh, [1], 150)
+
+        # page 2 uses the threshold chosen for the pdf
+        self.save_text(loc, bd, fh, 2, 190, 2000)
+        self.save_text(loc, bd, fh, 2, 170, 1000)
+        ThresholdItem(fh, 170).write(loc.ocr_threshold_file(bd, fh))
+
+        # page 3 uses the given threshold, or else the lowest threshold
+        self.save_text(loc, bd, fh, 3, 160, 2000)
+        self.save_text(loc, bd, fh, 3, 200, 1000)
+
+        def texts(threshold):
+            pages = Page.load(store_dir, None, threshold)
+            return [list(p.items.text) for p in pages]
+
+        assert texts(None) == [["th150"], ["th170"], ["th160"], []]
+        assert texts(200) == [["th150"], ["th170"], ["th200"], []]
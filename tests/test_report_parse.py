@@ -0,0 +1,36 @@
+import logging
+
+from leaf_focus.report.item.document import Document
+from leaf_focus.report.item.line import Line
+from leaf_focus.report.item.line_parser import LineParser
+from leaf_focus.report.item.page import Page
+from leaf_focus.report.processing.normalise import Normalise
+from leaf_focus.report.processing.parse import Parse
+
+
+class TestReportParse:
+    def test_skipped_pages(self):
+        doc = Document(
+            pdf_path=None,
+            pdf_hash_type="SHA256",
+            pdf_hash_value="abc",
+            pdf_created_date=None,
+            pdf_modified_date=None,
+            pdf_downloaded_date=None,
+            website_modified_date=None,
+            pdf_url=None,
+            referrer_url=None,
+            assembly=None,
+        )
+        texts = [["heading"], [], ["heading"], []]
+        for index, lines in enumerate(texts):
+            page = Page(index=index, document=doc)
+            page.lines = list(Line.load(lines, page))
+            doc.pages.append(page)
+
+        parsers = [LineParser("heading", False, "metadata", "line")]
+        parse = Parse(logging.getLogger(), None, parsers, [], Normalise([], []))
+        assert list(parse.document(doc)) == []
+
+        # the pages in the document that have no lines are skipped
+        assert [p.pdf_page for p in parse.skipped_pages] == [1, 3]
@@ -0,0 +1,52 @@
+import logging
+
+from leaf_focus.report.item.document import Document
+from leaf_focus.report.item.line import Line
+from leaf_focus.report.item.line_parser import LineParser
+from leaf_focus.report.item.page import Page
+from leaf_focus.report.item.poor_page import PoorPage
+from leaf_focus.report.processing.normalise import Normalise
+from leaf_focus.report.processing.parse import Parse
+
+
+class TestReportPoorPage:
+    def test_save_load(self, tmp_path):
+        items = [
+            PoorPage("SHA256", "abc", 2, 10, 3, "low coverage", "https://a/b.pdf"),
+            PoorPage("SHA256", "abc", 3, 0, 0, "no lines", None),
+        ]
+        path = tmp_path / "poor-pages.csv"
+        PoorPage.save(path, items)
+        assert list(PoorPage.load(path)) == items
+        assert items[0].coverage == 0.3
+        assert items[1].coverage == 0.0
+
+    def test_parse(self):
+        doc = Document(
+            pdf_path=None,
+            pdf_hash_type="SHA256",
+            pdf_hash_value="abc",
+            pdf_created_date=None,
+            pdf_modified_date=None,
+            pdf_downloaded_date=None,
+            website_modified_date=None,
+            pdf_url=None,
+            referrer_url=None,
+            assembly=None,
+        )
+        texts = [["heading", "unknown line"], [], ["heading", "heading"]]
+        for index, lines in enumerate(texts):
+            page = Page(index=index, document=doc)
+            page.lines = list(Line.load(lines, page))
+            doc.pages.append(page)
+
+        parsers = [LineParser("heading", False, "metadata", "line")]
+        parse = Parse(logging.getLogger(), None, parsers, [], Normalise([], []), 0.6)
+        assert list(parse.document(doc)) == []
+
+        # the page without lines is skipped, and the first page is poor
+        assert [p.pdf_page for p in parse.skipped_pages] == [1]
+        assert parse.poor_pages == [
+            PoorPage("SHA256", "abc", 1, 2, 1, "low coverage", None),
+            PoorPage("SHA256", "abc", 2, 0, 0, "no lines", None),
+        ]
@@ -1,5 +1,6 @@
 import logging
 
+from leaf_focus.pdf.images.image_format import ImageFormat
 from leaf_focus.support.location import Location
 from tests.base_test import BaseTest
 
@@ -111,3 +112,66 @@ class TestSupportLocation(BaseTest):
         dh = example1_pdf_hash_dir
         store_dir = loc.pdf_page_text_file(base_dir, fh, page, threshold)
         assert store_dir == base_dir / dh / name
+
+    def test_ocr_detection_cache_file(self, tmp_path):
+        location = Location(logging.getLogger())
+        image_hash = "abcdef0123456789"
+        cache_file = location.ocr_detection_cache_file(tmp_path, image_hash)
+        assert cache_file == tmp_path / "ocr-detection-cache" / "ab" / (
+            image_hash + ".npz"
+        )
+
+    def test_ocr_result_cache_file(self, tmp_path):
+        location = Location(logging.getLogger())
+        image_hash = "abcdef0123456789"
+        cache_file = location.ocr_result_cache_file(tmp_path, image_hash, "sha256")
+        assert cache_file == tmp_path / "ocr-result-cache" / "sha256" / "ab" / (
+            image_hash + ".csv"
+        )
+
+    def test_ocr_models_dir(self, tmp_path):
+        location = Location(logging.getLogger())
+        assert location.ocr_models_dir(tmp_path) == tmp_path / "ocr-models"
+
+    def test_ocr_checkpoint_file(self, tmp_path):
+        location = Location(logging.getLogger())
+        assert location.ocr_checkpoint_file(tmp_path) == (
+            tmp_path / "ocr-recognise-checkpoint.jsonl"
+        )
+
+    def test_pdf_page_prepared_file_format(
+        self, tmp_path, example1_pdf_hash, example1_pdf_hash_dir
+    ):
+        loc = Location(logging.getLogger(), ImageFormat("tiff"))
+        bd = tmp_path
+        fh = example1_pdf_hash
+        dh = example1_pdf_hash_dir
+        expected = bd / dh / "pdf-page-000002-prep-th-190.tif"
+        assert loc.pdf_page_prepared_file(bd, fh, 2, 190) == expected
+
+        # a prepared image in another format is not used
+        other = bd / dh / "pdf-page-000002-prep-th-190.pbm"
+        other.parent.mkdir(parents=True)
+        other.touch()
+        assert loc.pdf_page_prepared_file(bd, fh, 2, 190) == expected
+
+    def test_pdf_page_image_file_pgm(
+        self, tmp_path, example1_pdf_hash, example1_pdf_hash_dir
+    ):
+        loc = Location(logging.getLogger())
+        bd = tmp_path
+        fh = example1_pdf_hash
+        dh = example1_pdf_hash_dir
+        existing = bd / dh / "pdf-page-000002.pgm"
+        existing.parent.mkdir(parents=True)
+        existing.touch()
+        assert loc.pdf_page_image_file(bd, fh, 2) == existing
+
+        # the suffix is found once for the store directory
+        existing.unlink()
+        assert loc.pdf_page_image_file(bd, fh, 2) == existing
+        assert loc.pdf_page_image_file(bd, fh, 3) == bd / dh / "pdf-page-000003.pgm"
+
+        # the png suffix is used until a page image exists
+        loc = Location(logging.getLogger())
+        assert loc.pdf_page_image_file(bd, fh, 2) == bd / dh / "pdf-page-000002.png"